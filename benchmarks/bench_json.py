@@ -0,0 +1,78 @@
+"""
+Measure the JSON list endpoints with the orjson and stdlib encoders, and
+the bytes each sends uncompressed, gzipped and (if installed) brotli'd.
+
+Runs in-process against the configured database; seed it first:
+
+    python manage.py seed_scale --members 2000 --events 500 --reviews 1500
+    python benchmarks/bench_json.py --requests 200
+
+Timings are whole requests through the middleware stack, so the encoder's
+share shows up as the difference between the two columns.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from core import middleware, responses  # noqa: E402
+from pages.api import EVENT_AVAILABILITY, EVENT_COLUMNS  # noqa: E402
+
+ALL_EVENT_FIELDS = ','.join(EVENT_COLUMNS + EVENT_AVAILABILITY)
+PATHS = [
+    f'/api/events/?per_page=100&fields={ALL_EVENT_FIELDS}',
+    '/api/reviews/?per_page=100',
+    '/api/events/search/?per_page=100',
+]
+
+
+def stdlib_dumps(data):
+    return responses.json.dumps(data, cls=responses.DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def timed(client, path, requests, **headers):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    client = Client()
+    fast_dumps = responses.dumps
+    encodings = ['gzip'] + (['br'] if middleware.brotli else [])
+
+    print(f"{'endpoint':<22}{'orjson ms':>10}{'stdlib ms':>10}{'plain B':>10}" + ''.join(f'{e + " B":>10}' for e in encodings))
+    for path in PATHS:
+        responses.dumps = fast_dumps
+        fast_ms, response = timed(client, path, args.requests)
+        plain = len(response.content)
+        responses.dumps = stdlib_dumps
+        slow_ms, _ = timed(client, path, args.requests)
+        responses.dumps = fast_dumps
+
+        sizes = [len(client.get(path, headers={'Accept-Encoding': e}).content) for e in encodings]
+        print(f'{path.split("?")[0]:<22}{fast_ms:>10.2f}{slow_ms:>10.2f}{plain:>10}' + ''.join(f'{s:>10}' for s in sizes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Time sending the day-before reminders for one large event.
+
+Creates a throwaway event with ``--attendees`` confirmed bookings, runs
+pages.reminders.send_due() with the in-memory mail backend, so the figure
+is the database and message-building work, and deletes everything again:
+
+    python benchmarks/bench_reminders.py --attendees 5000
+
+Also times the rerun, which finds nothing left to send.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ['EMAIL_BACKEND'] = 'django.core.mail.backends.locmem.EmailBackend'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core import mail  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from pages import reminders  # noqa: E402
+from pages.models import CustomUser, Event, EventBooking  # noqa: E402
+
+PREFIX = 'bench-reminder-'
+
+
+def create(attendees):
+    event = Event.objects.create(
+        title='Benchmark conference', description='', location='Dar es Salaam',
+        date_time=timezone.now() + timedelta(hours=12),
+    )
+    users = User.objects.bulk_create([
+        User(username=f'{PREFIX}{i}', first_name=f'Guest{i}', email=f'{PREFIX}{i}@example.com') for i in range(attendees)
+    ])
+    members = CustomUser.objects.bulk_create([CustomUser(user=user, is_community_member=True) for user in users])
+    EventBooking.objects.bulk_create([EventBooking(event=event, user=member) for member in members])
+    return event
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--attendees', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=reminders.BATCH_SIZE)
+    args = parser.parse_args()
+
+    event = create(args.attendees)
+    try:
+        start = time.perf_counter()
+        sent = reminders.send_due(batch_size=args.batch_size)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        reminders.send_due(batch_size=args.batch_size)
+        rerun = time.perf_counter() - start
+        print(f'{sent} in {first:.2f} s ({len(mail.outbox)} messages); rerun {rerun * 1000:.1f} ms')
+    finally:
+        event.delete()
+        User.objects.filter(username__startswith=PREFIX).delete()
+
+
+if __name__ == '__main__':
+    main()
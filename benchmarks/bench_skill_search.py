@@ -0,0 +1,81 @@
+"""
+Time the volunteer-staffing query ("approved applicants in a region who
+speak a language and know a skill") by decoding the JSON lists of every
+candidate row, as before, and through the ApplicationTag lookup table.
+
+Runs in-process against the configured database; seed it first:
+
+    python manage.py seed_scale --members 100 --events 10 --bookings 100 --reviews 10 --applications 500000
+    python manage.py dbshell <<< 'ANALYZE;'
+    python benchmarks/bench_skill_search.py --repeat 5
+
+Without fresh statistics the planner may not pick the (status, region)
+index. Also reports the top-skill facet query the staff search endpoint runs.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from pages import skills  # noqa: E402
+from pages.models import ApplicationTag, MembershipApplication  # noqa: E402
+
+
+def json_scan(region, skill, language):
+    rows = MembershipApplication.objects.filter(status='approved', region=region).values_list('pk', 'skills', 'languages')
+    return [
+        pk for pk, skill_list, language_list in rows
+        if skill in map(skills.normalize, skill_list) and language in map(skills.normalize, language_list)
+    ]
+
+
+def indexed(region, skill, language):
+    queryset = MembershipApplication.objects.filter(status='approved', region=region)
+    return list(skills.with_tags(queryset, skills=[skill], languages=[language]).values_list('pk', flat=True))
+
+
+def facets(region, skill, language):
+    queryset = skills.with_tags(MembershipApplication.objects.filter(status='approved', region=region), skills=[skill])
+    return skills.top_values(ApplicationTag.SKILL, queryset)
+
+
+def timed(function, repeat, *args):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--region', default='mwanza')
+    parser.add_argument('--skill', default='python')
+    parser.add_argument('--language', default='swahili')
+    args = parser.parse_args()
+    query = (args.region, args.skill, args.language)
+
+    print(f'{MembershipApplication.objects.count()} applications, {ApplicationTag.objects.count()} tag rows')
+    scan_ms, expected = timed(json_scan, args.repeat, *query)
+    index_ms, found = timed(indexed, args.repeat, *query)
+    facet_ms, _ = timed(facets, args.repeat, *query)
+    assert sorted(found) == sorted(expected), 'lookup table out of sync; run rebuild_application_tags'
+    print(f'{len(found)} matches')
+    print(f"{'JSON scan':<18}{scan_ms:>10.1f} ms")
+    print(f"{'ApplicationTag':<18}{index_ms:>10.1f} ms")
+    print(f"{'top-skill facets':<18}{facet_ms:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
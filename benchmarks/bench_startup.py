@@ -0,0 +1,47 @@
+"""
+Cold-start cost of a worker: ``manage.py check``, loading the WSGI app, and
+which modules the load spends its time importing.
+
+    python benchmarks/bench_startup.py --repeat 5 --top 25
+
+Every measurement runs in a fresh interpreter. pages/tests.py
+(StartupTests) runs the same measurements against fixed budgets.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import startup  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=25, help='Modules to list, by time spent in the module itself')
+    parser.add_argument('--warmup', action='store_true', help='Also run the WARMUP_ON_READY warm-up, as gunicorn does')
+    args = parser.parse_args()
+    env = {'WARMUP_ON_READY': '1' if args.warmup else ''}
+
+    print(f'manage.py check   {startup.check_seconds(args.repeat, env) * 1000:8.0f} ms')
+    print(f'WSGI app load     {startup.wsgi_load_seconds(args.repeat, env) * 1000:8.0f} ms')
+
+    times = startup.import_times(env=env)
+    total = sum(row.self_us for row in times)
+    print(f'\n{len(times)} modules imported in {total / 1000:.0f} ms\n')
+    print(f"{'module':<50}{'self ms':>10}{'cumulative ms':>15}")
+    for row in sorted(times, key=lambda row: row.self_us, reverse=True)[:args.top]:
+        print(f'{row.module:<50}{row.self_us / 1000:>10.1f}{row.cumulative_us / 1000:>15.1f}')
+
+    print('\nby top-level package')
+    packages = {}
+    for row in times:
+        package = row.module.split('.')[0]
+        packages[package] = packages.get(package, 0) + row.self_us
+    for package, spent in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f'{package:<50}{spent / 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c core/gunicorn_conf.py
+
+Environment:
+    WEB_WORKER_CLASS  sync, gthread (default) or asgi (uvicorn worker)
+    WEB_CONCURRENCY   worker processes (default sized from the CPU count)
+    WEB_THREADS       threads per gthread worker (default 4)
+    PORT              port to bind (default 8000)
+    METRICS_DIR       where workers share metrics (default /dev/shm/visionhub-metrics)
+"""
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+
+cpu_count = multiprocessing.cpu_count()
+worker_mode = os.environ.get('WEB_WORKER_CLASS', 'gthread')
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'asgi': 'uvicorn.workers.UvicornWorker',
+}
+if worker_mode not in WORKER_CLASSES:
+    raise ValueError(f"WEB_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, not {worker_mode!r}")
+
+# Sync workers block on every query, so they need the classic 2n+1. Threaded
+# and async workers overlap I/O themselves and only need about one per core.
+if worker_mode == 'sync':
+    default_workers = cpu_count * 2 + 1
+else:
+    default_workers = cpu_count + 1
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = WORKER_CLASSES[worker_mode]
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+threads = int(os.environ.get('WEB_THREADS', 4)) if worker_mode == 'gthread' else 1
+wsgi_app = 'core.asgi:application' if worker_mode == 'asgi' else 'core.wsgi:application'
+
+# Load Django once in the master so workers share its memory copy-on-write,
+# and let PagesConfig.ready() warm the caches before any worker is forked.
+preload_app = True
+os.environ.setdefault('WARMUP_ON_READY', '1')
+
+# Recycle workers to bound memory growth; jitter keeps them from restarting together.
+max_requests = 1000
+max_requests_jitter = 100
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Heartbeat files on tmpfs so a slow container disk can't make workers look hung
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Workers write their metrics here and /metrics sums them (core/metrics.py).
+# Start each run from zero, as Prometheus expects of a restarted server.
+os.environ.setdefault('METRICS_DIR', os.path.join(worker_tmp_dir or tempfile.gettempdir(), 'visionhub-metrics'))
+
+
+def on_starting(server):
+    for path in Path(os.environ['METRICS_DIR']).glob('*.json'):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,127 @@
+"""
+Per-request SQL recording.
+
+Every database connection gets one execute wrapper that reports to the
+``QueryCounter`` active in the current context, if any; a counter started
+inside another passes each query on to it, so the metrics middleware's
+per-request totals include sampled requests. Context variables follow
+``sync_to_async`` into worker threads, so queries the async views run
+concurrently are counted against the request that started them. When no
+counter is active the wrapper costs one context-variable lookup.
+"""
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_recorder = ContextVar('query_recorder', default=None)
+
+_SITE_PACKAGES = ('site-packages', 'dist-packages')
+_THIS_FILE = Path(__file__).resolve()
+
+
+class QueryCounter:
+    """Count queries and DB time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.parent = None
+        self._lock = threading.Lock()
+
+    def record(self, sql, duration):
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+        if self.parent is not None:
+            self.parent.record(sql, duration)
+
+
+class QueryRecorder(QueryCounter):
+    """Also spot SQL shapes repeated within one request"""
+
+    def __init__(self, repeat_threshold):
+        super().__init__()
+        self.repeat_threshold = repeat_threshold
+        self.shapes = {}
+        self.repeated = {}
+
+    def record(self, sql, duration):
+        super().record(sql, duration)
+        # Parameters are passed separately, so the SQL text is already the query's shape
+        with self._lock:
+            seen = self.shapes.get(sql, 0) + 1
+            self.shapes[sql] = seen
+        if seen == self.repeat_threshold:
+            self.repeated[sql] = find_origin()
+
+    def likely_n_plus_one(self):
+        """(sql, times executed, origin) for each shape past the repeat threshold"""
+        return [(sql, self.shapes[sql], origin) for sql, origin in self.repeated.items()]
+
+
+def _wrapper(execute, sql, params, many, context):
+    counter = _recorder.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        counter.record(sql, time.perf_counter() - start)
+
+
+def _install(connection, **kwargs):
+    if _wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_wrapper)
+
+
+def install_on_open_connections():
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+
+
+connection_created.connect(_install, dispatch_uid='core.instrumentation.install')
+
+
+def _start(counter):
+    counter.parent = _recorder.get()
+    return counter, _recorder.set(counter)
+
+
+def start_counting():
+    return _start(QueryCounter())
+
+
+def start_recording(repeat_threshold):
+    return _start(QueryRecorder(repeat_threshold))
+
+
+def stop_recording(token):
+    _recorder.reset(token)
+
+
+def find_origin():
+    """Describe where the current query came from: the template node and the project frame"""
+    template = view = None
+    frame = sys._getframe(1)
+    while frame is not None and (template is None or view is None):
+        code = frame.f_code
+        if template is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None:
+                name = origin.template_name or origin.name
+                template = f'{name}:{getattr(token, "lineno", "?")}'
+        if view is None and not any(part in code.co_filename for part in _SITE_PACKAGES):
+            path = Path(code.co_filename)
+            if path.is_relative_to(settings.BASE_DIR) and path.resolve() != _THIS_FILE:
+                view = f'{path.relative_to(settings.BASE_DIR)}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return ', '.join(filter(None, [template and f'template {template}', view])) or 'unknown'
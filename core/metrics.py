@@ -0,0 +1,297 @@
+"""
+Prometheus metrics shared between gunicorn workers.
+
+Counters and histograms live in a dict in each process. When ``METRICS_DIR``
+is set (core/gunicorn_conf.py points it at /dev/shm), a background thread
+writes that dict to ``<METRICS_DIR>/<pid>.json`` every
+``METRICS_FLUSH_SECONDS`` and once more at exit, and ``render()`` sums every
+worker's file, so whichever worker answers the scrape reports the whole
+server. Files of workers that have exited are folded into ``retired.json``
+on the next scrape, so recycling a worker never makes a counter go down.
+
+Without ``METRICS_DIR`` a process reports only its own counts.
+"""
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+RETIRED = 'retired.json'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+_lock = threading.Lock()
+# (name, label values) -> a number for counters; per-bucket counts followed by the sum for histograms
+_values = {}
+_metrics = {}
+_flusher = None
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = f'visionhub_{name}'
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        _metrics[self.name] = self
+
+    def _start_flusher(self):
+        global _flusher
+        if _flusher is None and settings.METRICS_DIR:
+            with _lock:
+                if _flusher is None:
+                    _flusher = threading.Thread(target=_flush_periodically, name='metrics-flush', daemon=True)
+                    _flusher.start()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        key = (self.name, labels)
+        with _lock:
+            _values[key] = _values.get(key, 0) + amount
+        self._start_flusher()
+
+    def lines(self, labels, value):
+        yield f'{self.name}{_format_labels(self.labels, labels)} {_number(value)}'
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        key = (self.name, labels)
+        with _lock:
+            counts = _values.get(key)
+            if counts is None:
+                # one slot per bucket, one for +Inf, then the sum
+                counts = _values[key] = [0] * (len(self.buckets) + 2)
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+        self._start_flusher()
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def lines(self, labels, counts):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, '+Inf'), counts):
+            cumulative += count
+            bucket_labels = _format_labels((*self.labels, 'le'), (*labels, _number(bound)))
+            yield f'{self.name}_bucket{bucket_labels} {_number(cumulative)}'
+        yield f'{self.name}_sum{_format_labels(self.labels, labels)} {_number(counts[-1])}'
+        yield f'{self.name}_count{_format_labels(self.labels, labels)} {_number(cumulative)}'
+
+
+# Requests (core.middleware.MetricsMiddleware)
+REQUEST_SECONDS = Histogram('http_request_duration_seconds', 'Time to produce a response, by view', ['view'])
+RESPONSES = Counter('http_responses_total', 'Responses by view, method and status code', ['view', 'method', 'status'])
+DB_QUERIES = Counter('db_queries_total', 'Database queries run while serving requests', ['view'])
+DB_SECONDS = Counter('db_query_seconds_total', 'Database time spent while serving requests', ['view'])
+DB_QUERIES_PER_REQUEST = Histogram(
+    'db_queries_per_request', 'Database queries per request, by view', ['view'], buckets=QUERY_COUNT_BUCKETS,
+)
+
+# Caches the views read through; hit ratio is hits / (hits + misses)
+CACHE_LOOKUPS = Counter('cache_lookups_total', 'Cache reads by cache and result (hit or miss)', ['cache', 'result'])
+
+# Member activity
+BOOKINGS = Counter('event_bookings_total', 'Event bookings made')
+APPLICATIONS = Counter('membership_applications_total', 'Membership applications submitted')
+CHAT_MESSAGES = Counter('chat_messages_total', 'Chat messages answered')
+STATS_REFRESH_SECONDS = Histogram(
+    'community_stats_refresh_seconds', 'Time spent recomputing CommunityStats; _count is the number of refreshes',
+)
+
+
+def count_cache(cache, hit):
+    CACHE_LOOKUPS.inc(cache, 'hit' if hit else 'miss')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def snapshot():
+    """This process's values, safe to read while requests keep counting"""
+    with _lock:
+        return {key: list(value) if isinstance(value, list) else value for key, value in _values.items()}
+
+
+def _add(totals, values):
+    for key, value in values.items():
+        current = totals.get(key)
+        if current is None:
+            totals[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            if len(value) == len(current):  # skip files written with different buckets
+                totals[key] = [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = current + value
+    return totals
+
+
+def _dump(values, path):
+    rows = [[name, list(labels), value] for (name, labels), value in values.items()]
+    temporary = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    temporary.write_text(json.dumps(rows))
+    os.replace(temporary, path)
+
+
+def _load(path):
+    try:
+        rows = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return {(name, tuple(labels)): value for name, labels, value in rows}
+
+
+def flush():
+    """Write this process's values to its file in ``METRICS_DIR``"""
+    if not settings.METRICS_DIR:
+        return
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    _dump(snapshot(), directory / f'{os.getpid()}.json')
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _worker_files(directory):
+    """{pid: path} of live processes; files of exited ones are folded into retired.json first"""
+    files = {}
+    with open(directory / '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        retired = None
+        for path in directory.glob('*.json'):
+            if path.name == RETIRED or not path.stem.isdigit():
+                continue
+            pid = int(path.stem)
+            if _alive(pid):
+                files[pid] = path
+                continue
+            if retired is None:
+                retired = _load(directory / RETIRED)
+            _add(retired, _load(path))
+            _dump(retired, directory / RETIRED)
+            path.unlink()
+    return files
+
+
+def collect():
+    """(values summed over every worker, number of live processes reporting)"""
+    totals = snapshot()
+    if not settings.METRICS_DIR:
+        return totals, 1
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = _worker_files(directory)
+    # This process's own file is stale by up to a flush interval; use the live values instead
+    files.pop(os.getpid(), None)
+    for path in [directory / RETIRED, *files.values()]:
+        _add(totals, _load(path))
+    return totals, len(files) + 1
+
+
+def render(gauges=()):
+    """
+    Every metric in the Prometheus text format. ``gauges`` adds values read
+    at scrape time, as ``(name, documentation, value)``.
+    """
+    totals, processes = collect()
+    by_metric = {}
+    for (name, labels), value in sorted(totals.items()):
+        by_metric.setdefault(name, []).append((labels, value))
+
+    hits = {}
+    for (cache, result), value in by_metric.get(CACHE_LOOKUPS.name, []):
+        hits.setdefault(cache, {'hit': 0, 'miss': 0})[result] += value
+
+    lines = []
+    for name, metric in _metrics.items():
+        lines += [f'# HELP {name} {metric.documentation}', f'# TYPE {name} {metric.kind}']
+        for labels, value in by_metric.get(name, []):
+            lines += metric.lines(labels, value)
+
+    lines += ['# HELP visionhub_cache_hit_ratio Share of cache reads that were hits', '# TYPE visionhub_cache_hit_ratio gauge']
+    for cache, counts in sorted(hits.items()):
+        ratio = counts['hit'] / (counts['hit'] + counts['miss'])
+        lines.append(f'visionhub_cache_hit_ratio{_format_labels(["cache"], [cache])} {ratio:.4f}')
+
+    for name, documentation, value in [('metrics_processes', 'Processes whose counts are included', processes), *gauges]:
+        lines += [f'# HELP visionhub_{name} {documentation}', f'# TYPE visionhub_{name} gauge']
+        if value is not None:
+            lines.append(f'visionhub_{name} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def clear_directory(directory):
+    """Remove every worker's file, for a server (re)start"""
+    for path in Path(directory).glob('*.json'):
+        path.unlink(missing_ok=True)
+
+
+def _forked():
+    # A forked worker starts from zero: its parent's counts are reported by the parent
+    global _lock, _values, _flusher
+    _lock, _values, _flusher = threading.Lock(), {}, None
+
+
+os.register_at_fork(after_in_child=_forked)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        pass
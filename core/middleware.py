@@ -0,0 +1,270 @@
+"""
+Project-wide middleware.
+"""
+import logging
+import random
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from . import instrumentation, metrics, routers
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+COMPRESSIBLE_TYPES = ('text/html', 'application/json', 'text/plain', 'text/csv', 'text/calendar')
+ACCEPT_ENCODING = re.compile(r'([a-z*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+class ReplicaPinMiddleware:
+    """
+    Keep a client's reads on the primary for ``REPLICA_PIN_SECONDS`` after
+    they submit a write (join, booking, review), using a short-lived cookie.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routers.pin_to_primary(self._has_pin(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.reset_pin(token)
+        return self._process_response(request, response)
+
+    async def __acall__(self, request):
+        token = routers.pin_to_primary(self._has_pin(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.reset_pin(token)
+        return self._process_response(request, response)
+
+    def _has_pin(self, request):
+        return settings.REPLICA_PIN_COOKIE in request.COOKIES
+
+    def _process_response(self, request, response):
+        if request.method not in SAFE_METHODS and settings.REPLICA_DATABASES:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Time every request and count its queries into core.metrics, labelled by
+    the URL name of the view that served it. Goes first in MIDDLEWARE so the
+    time includes the rest of the stack.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.stop_recording(token)
+        return self._finish(request, response, counter, start)
+
+    async def __acall__(self, request):
+        counter, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.stop_recording(token)
+        return self._finish(request, response, counter, start)
+
+    def _start(self):
+        instrumentation.install_on_open_connections()
+        counter, token = instrumentation.start_counting()
+        return counter, token, time.perf_counter()
+
+    def _view(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            return match.view_name or match.route
+        # Unresolved paths are unbounded, so they share one label
+        return 'static' if request.path.startswith(settings.STATIC_URL) else 'unmatched'
+
+    def _finish(self, request, response, counter, start):
+        view = self._view(request)
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, view)
+        metrics.RESPONSES.inc(view, request.method, str(response.status_code))
+        metrics.DB_QUERIES_PER_REQUEST.observe(counter.count, view)
+        if counter.count:
+            metrics.DB_QUERIES.inc(view, amount=counter.count)
+            metrics.DB_SECONDS.inc(view, amount=counter.duration)
+        return response
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count queries and database time for a sample of requests.
+
+    Sampled responses get a ``Server-Timing`` header. Requests over
+    ``SQL_QUERY_BUDGET`` queries or ``SQL_TIME_BUDGET_MS`` are logged, as is
+    any SQL shape run ``SQL_REPEAT_THRESHOLD`` times or more (a likely N+1),
+    together with the template node and code that issued it.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        recorder, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.stop_recording(token)
+        return self._finish(request, response, recorder, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        recorder, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.stop_recording(token)
+        return self._finish(request, response, recorder, start)
+
+    def _sampled(self):
+        return random.random() < settings.SQL_SAMPLE_RATE
+
+    def _start(self):
+        instrumentation.install_on_open_connections()
+        recorder, token = instrumentation.start_recording(settings.SQL_REPEAT_THRESHOLD)
+        return recorder, token, time.perf_counter()
+
+    def _finish(self, request, response, recorder, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+        response['Server-Timing'] = (
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries", app;dur={total_ms:.1f}'
+        )
+
+        if recorder.count > settings.SQL_QUERY_BUDGET or db_ms > settings.SQL_TIME_BUDGET_MS:
+            logger.warning(
+                'Query budget exceeded on %s %s: %d queries, %.1f ms in the database',
+                request.method, request.path, recorder.count, db_ms,
+            )
+        for sql, times, origin in recorder.likely_n_plus_one():
+            logger.warning(
+                'Likely N+1 on %s %s: query ran %d times from %s: %s',
+                request.method, request.path, times, origin, sql,
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Brotli (when the ``brotli`` package is installed) or gzip for dynamic
+    HTML and JSON responses of at least ``COMPRESS_MIN_SIZE`` bytes, chosen
+    from the client's ``Accept-Encoding``. Static files are left to
+    WhiteNoise, which serves them precompressed.
+
+    Like Django's GZipMiddleware, gzip output is padded with random bytes
+    against BREACH, and strong ETags are weakened since the bytes change.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._process_response(request, await self.get_response(request))
+
+    def _encoding(self, request):
+        accepted = {}
+        for name, quality in ACCEPT_ENCODING.findall(request.headers.get('Accept-Encoding', '').lower()):
+            try:
+                accepted[name] = float(quality) if quality else 1.0
+            except ValueError:
+                continue
+        for encoding in ('br', 'gzip') if brotli else ('gzip',):
+            if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return None
+
+    def _process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if (
+            response.streaming
+            or response.status_code != 200
+            or response.has_header('Content-Encoding')
+            or content_type not in COMPRESSIBLE_TYPES
+            or len(response.content) < settings.COMPRESS_MIN_SIZE
+        ):
+            return response
+
+        # Caches must key on Accept-Encoding even when this client gets plain bytes
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self._encoding(request)
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=settings.COMPRESS_BROTLI_QUALITY)
+        else:
+            compressed = compress_string(response.content, max_random_bytes=GZipMiddleware.max_random_bytes)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,77 @@
+"""
+Database routing for a primary with optional read replicas.
+
+Writes always go to ``default``. Reads go to a random alias from
+``settings.REPLICA_DATABASES`` unless the current request is pinned to the
+primary, which happens when the client wrote recently (see
+``core.middleware.ReplicaPinMiddleware``) or once anything in the request
+has been routed for writing. Reads of an object's relations follow the
+object to the database it came from.
+
+Pinning only lasts for a scope that is always closed again: the request
+(opened by the middleware) or a ``primary_pin_scope`` block. Writes made
+outside any scope, from management commands, cron jobs or threads of their
+own, pin nothing, so they can't leave a process reading the primary for
+good; such code wraps itself in ``primary_pin_scope`` to read its writes.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# [pinned] for the current scope, or None outside one. A list rather than a bool
+# so a write in a thread the request hands work to pins the request itself.
+_scope = ContextVar('primary_pin_scope', default=None)
+
+
+def pin_to_primary(pinned=True):
+    """Open a scope whose reads go to the primary if ``pinned`` or once it writes; returns a reset token"""
+    return _scope.set([pinned])
+
+
+def reset_pin(token):
+    _scope.reset(token)
+
+
+def is_pinned():
+    scope = _scope.get()
+    return bool(scope and scope[0])
+
+
+@contextmanager
+def primary_pin_scope(pinned=False):
+    """``pin_to_primary`` for the duration of a ``with`` block"""
+    token = pin_to_primary(pinned)
+    try:
+        yield
+    finally:
+        reset_pin(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        replicas = settings.REPLICA_DATABASES
+        if not replicas or is_pinned():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes inside the same request
+        scope = _scope.get()
+        if scope is not None:
+            scope[0] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any alias may relate
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
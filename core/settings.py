@@ -42,12 +42,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'pages.profiling.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -73,6 +78,12 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# Serve the async variants of the read-heavy views; core/asgi.py turns this on.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS') == '1'
+
+# Prime URL resolution, templates and caches in AppConfig.ready(); set by core/gunicorn_conf.py.
+WARMUP_ON_READY = os.environ.get('WARMUP_ON_READY') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -88,6 +99,146 @@ DATABASES = {
     }
 }
 
+# Override the primary with DATABASE_URL, e.g. sqlite:///db.sqlite3 for local work.
+if os.environ.get('DATABASE_URL'):
+    DATABASES['default'] = dj_database_url.config(conn_max_age=600)
+
+# Postgres connections come from a psycopg pool in each process, so the threads
+# the async views run their queries on (pages/views/concurrency.py) borrow an
+# open connection instead of connecting for every query. A pool replaces
+# persistent connections; DB_POOL_MAX_SIZE=0 goes back to them.
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 20))
+
+
+def _pooled(database):
+    if database['ENGINE'] == 'django.db.backends.postgresql' and DB_POOL_MAX_SIZE:
+        database['CONN_MAX_AGE'] = 0
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': 10,
+        }
+    return database
+
+
+_pooled(DATABASES['default'])
+
+# Read replicas: comma-separated database URLs, registered as replica_1, replica_2, ...
+# Locally: REPLICA_DATABASE_URLS=sqlite:///db.sqlite3 gives a second alias on the same file.
+REPLICA_DATABASES = []
+for index, url in enumerate(filter(None, os.environ.get('REPLICA_DATABASE_URLS', '').split(',')), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = _pooled(dj_database_url.parse(url.strip(), conn_max_age=600))
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# After a write, the client's reads stick to the primary for this many seconds
+# so replication lag never hides what they just saved.
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 15))
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+# Per-request SQL instrumentation (core.middleware.QueryInstrumentationMiddleware).
+# A sampled request gets a Server-Timing header and is logged when it runs
+# more queries or spends more database time than the budget, or when it
+# repeats one query shape SQL_REPEAT_THRESHOLD times.
+SQL_SAMPLE_RATE = float(os.environ.get('SQL_SAMPLE_RATE', 0.05))
+SQL_QUERY_BUDGET = int(os.environ.get('SQL_QUERY_BUDGET', 25))
+SQL_TIME_BUDGET_MS = float(os.environ.get('SQL_TIME_BUDGET_MS', 200))
+SQL_REPEAT_THRESHOLD = int(os.environ.get('SQL_REPEAT_THRESHOLD', 5))
+
+# Prometheus metrics (core/metrics.py), scraped from /metrics with
+# "Authorization: Bearer <METRICS_TOKEN>" or by a logged-in site admin.
+# Each worker writes its counts to METRICS_DIR every METRICS_FLUSH_SECONDS,
+# and a scrape sums them; core/gunicorn_conf.py sets it to a /dev/shm
+# directory. Left empty, each process reports only itself.
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 5))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Per-request profiling for site admins (pages/profiling.py): a request with a
+# token from the Request profiles admin page is stack-sampled every
+# PROFILE_SAMPLE_INTERVAL_MS. Samples need the GIL, so a CPU-bound request is
+# sampled about every 5 ms whatever the interval. Tokens last
+# PROFILE_TOKEN_MAX_AGE seconds; the newest PROFILE_RETENTION_COUNT profiles
+# from the last PROFILE_RETENTION_DAYS are kept.
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 2))
+PROFILE_TOKEN_MAX_AGE = int(os.environ.get('PROFILE_TOKEN_MAX_AGE', 3600))
+PROFILE_RETENTION_COUNT = int(os.environ.get('PROFILE_RETENTION_COUNT', 200))
+PROFILE_RETENTION_DAYS = int(os.environ.get('PROFILE_RETENTION_DAYS', 14))
+
+# core.middleware.CompressionMiddleware: HTML/JSON bodies at least this big are
+# sent brotli- (if the brotli package is installed) or gzip-compressed.
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 5))
+
+
+# Load the user's CustomUser in the same query as the User (pages/auth.py).
+# ModelBackend stays listed so sessions created before the switch remain valid.
+AUTHENTICATION_BACKENDS = [
+    'pages.auth.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# @login_required sends visitors to django.contrib.auth's login view
+# (templates/registration/login.html); without a ?next= they land on the home page.
+LOGIN_URL = 'login'
+LOGIN_REDIRECT_URL = 'index'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Per-process memory by default; point CACHE_BACKEND/CACHE_LOCATION at Redis or
+# Memcached to share entries between gunicorn workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'visionhub'),
+    }
+}
+
+# Sessions are read from the cache and only fall back to the database on a miss.
+# Set SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies to skip storage entirely.
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+
+# Browsers and CDNs may reuse /api/events/ and /api/reviews/ responses this long;
+# after that they revalidate with the ETag and usually get a 304.
+API_CACHE_SECONDS = int(os.environ.get('API_CACHE_SECONDS', 60))
+
+# Facet counts for each event search filter combination are cached this long.
+# Their key includes a version read from the events table (pages/search.py), so
+# an event saved or deleted in any worker is seen at once; the timeout bounds
+# how long an event passing its registration deadline stays counted.
+EVENT_FACET_CACHE_SECONDS = int(os.environ.get('EVENT_FACET_CACHE_SECONDS', 300))
+
+# How long calendar apps may reuse an .ics feed before revalidating (ETag/304).
+CALENDAR_CACHE_SECONDS = int(os.environ.get('CALENDAR_CACHE_SECONDS', 300))
+
+# Staff review queue (pages/review_queue.py): claimed applications stay with
+# their reviewer this long after the last claim or refresh, then go back.
+REVIEW_LEASE_SECONDS = int(os.environ.get('REVIEW_LEASE_SECONDS', 600))
+
+# Door devices authenticate to the check-in API with "Authorization: Bearer <key>".
+CHECKIN_DEVICE_KEYS = [key for key in os.environ.get('CHECKIN_DEVICE_KEYS', '').split(',') if key]
+
+# Outgoing mail, e.g. event reminders (pages/reminders.py)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS') == '1'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Vision Hub Tanzania <noreply@visionhub.or.tz>')
+
+# Retention of the hot tables (pages/archive.py, `manage.py archive_cold_rows`):
+# processed applications idle this many days, and bookings for events held
+# this many days ago, move to compressed archive tables.
+ARCHIVE_APPLICATION_DAYS = int(os.environ.get('ARCHIVE_APPLICATION_DAYS', 365))
+ARCHIVE_BOOKING_DAYS = int(os.environ.get('ARCHIVE_BOOKING_DAYS', 180))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
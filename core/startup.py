@@ -0,0 +1,88 @@
+"""
+Measure how long a fresh process takes to get ready to serve.
+
+Each measurement starts a new interpreter in the project directory, since
+within a running process everything is imported already. Used by
+benchmarks/bench_startup.py and the startup regression tests in
+pages/tests.py.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# What a WSGI worker does before it can take a request
+WSGI_LOAD = 'from core.wsgi import application'
+
+
+# Run in the child: time every module import, including those made with
+# importlib.import_module() (settings, app modules, admin autodiscovery),
+# which ``python -X importtime`` doesn't see
+_PROFILE_IMPORTS = """
+import importlib._bootstrap as bootstrap, json, sys, time
+rows, children = [], []
+find_and_load = bootstrap._find_and_load
+def timed(name, import_):
+    if name in sys.modules:
+        return find_and_load(name, import_)
+    children.append(0)
+    start = time.perf_counter_ns()
+    try:
+        return find_and_load(name, import_)
+    finally:
+        total = time.perf_counter_ns() - start
+        nested = children.pop()
+        if children:
+            children[-1] += total
+        rows.append((name, (total - nested) // 1000, total // 1000, len(children)))
+bootstrap._find_and_load = timed
+exec(sys.argv[2])
+with open(sys.argv[1], 'w') as out:
+    json.dump(rows, out)
+"""
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def run_python(*args, env=None):
+    """Run the interpreter with ``args``; returns (seconds, CompletedProcess)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=BASE_DIR, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, check=True,
+    )
+    return time.perf_counter() - start, result
+
+
+def median_seconds(*args, repeat=3, env=None):
+    return statistics.median(run_python(*args, env=env)[0] for _ in range(repeat))
+
+
+def check_seconds(repeat=3, env=None):
+    """Wall time of ``manage.py check``: settings, app registry, URLconf and system checks"""
+    return median_seconds('manage.py', 'check', repeat=repeat, env=env)
+
+
+def wsgi_load_seconds(repeat=3, env=None):
+    return median_seconds('-c', WSGI_LOAD, repeat=repeat, env=env)
+
+
+def import_times(statement=WSGI_LOAD, env=None):
+    """Every module that running ``statement`` in a fresh interpreter imports, in completion order"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / 'imports.json'
+        run_python('-c', _PROFILE_IMPORTS, str(output), statement, env=env)
+        return [ImportTime(*row) for row in json.loads(output.read_text())]
@@ -1,18 +1,67 @@
 # admin.py
-from django.contrib import admin
+import zlib
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.db import IntegrityError
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+
+from . import archive, profiling, skills
+from .auth import is_site_admin
 from .models import (
-    MembershipApplication,
+    ApplicationTag,
+    ArchivedApplication,
+    ArchivedBooking,
+    CustomUser,
+    DuplicateCandidate,
     Event,
+    EventBooking,
+    MembershipApplication,
+    RequestProfile,
 )
+from .paginators import EstimatedCountPaginator
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    """Changelists that stay fast on large tables: estimated counts, no second full-table COUNT"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class ApplicationTagFilter(admin.SimpleListFilter):
+    """Filter applications by one skill or language, via the ApplicationTag index"""
+    kind = None
+
+    def lookups(self, request, model_admin):
+        return [(value, value.title()) for value, _ in skills.choices(self.kind)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(pk__in=skills.applications_with(self.kind, self.value()))
+        return queryset
+
+
+class SkillFilter(ApplicationTagFilter):
+    title = 'skill'
+    parameter_name = 'skill'
+    kind = ApplicationTag.SKILL
+
+
+class LanguageFilter(ApplicationTagFilter):
+    title = 'language'
+    parameter_name = 'language'
+    kind = ApplicationTag.LANGUAGE
 
-# admin.py (Optional: for managing applications in Django admin)
-from django.contrib import admin
-from .models import MembershipApplication
 
 @admin.register(MembershipApplication)
-class MembershipApplicationAdmin(admin.ModelAdmin):
+class MembershipApplicationAdmin(ScalableModelAdmin):
     list_display = ['full_name', 'email', 'region', 'status', 'created_at']
-    list_filter = ['status', 'region', 'education', 'gender', 'created_at']
+    list_filter = ['status', 'region', SkillFilter, LanguageFilter, 'education', 'gender', 'created_at']
     search_fields = ['first_name', 'last_name', 'email', 'phone']
     readonly_fields = ['created_at', 'updated_at']
     
@@ -45,12 +94,243 @@ class MembershipApplicationAdmin(admin.ModelAdmin):
         return readonly_fields
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
-    list_display = ('id', 'description', 'created_at') # Use the correct field name here
-    ordering = ('created_at',)
+class EventAdmin(ScalableModelAdmin):
+    list_display = ('title', 'event_type', 'date_time', 'status', 'max_participants',
+                    'confirmed_count', 'pending_count', 'attended_count', 'created_at')
     list_filter = ('event_type', 'status', 'is_online')
     search_fields = ('title', 'description', 'location')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-date',)
 
+    def get_queryset(self, request):
+        # Correlated subqueries run only for the rows on the current page,
+        # each an index lookup on (event, status), instead of aggregating
+        # every booking before the LIMIT
+        return super().get_queryset(request).annotate(
+            confirmed_count=self._booking_count('confirmed'),
+            pending_count=self._booking_count('pending'),
+            attended_count=self._booking_count('attended'),
+        )
+
+    @staticmethod
+    def _booking_count(status):
+        bookings = EventBooking.objects.filter(event=OuterRef('pk'), status=status)
+        return Coalesce(Subquery(
+            bookings.order_by().values('event').annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    @admin.display(description='Confirmed', ordering='confirmed_count')
+    def confirmed_count(self, obj):
+        # The booking changelist filtered on the event's index, rather than a title search
+        url = reverse('admin:pages_eventbooking_changelist')
+        return format_html('<a href="{}?event={}">{}</a>', url, obj.pk, obj.confirmed_count)
+
+    @admin.display(description='Pending', ordering='pending_count')
+    def pending_count(self, obj):
+        return obj.pending_count
+
+    @admin.display(description='Attended', ordering='attended_count')
+    def attended_count(self, obj):
+        return obj.attended_count
+
+@admin.register(EventBooking)
+class EventBookingAdmin(ScalableModelAdmin):
+    list_display = ('event', 'member', 'status', 'booked_at')
+    list_select_related = ('event', 'user__user')
+    list_filter = ('status',)
+    # Only an exact e-mail, which auth_user_email_upper_idx (migration 0015) finds;
+    # a substring search over titles and usernames scans every booking. For one
+    # event's bookings, follow the link from the event changelist.
+    search_fields = ('=user__user__email',)
+    search_help_text = "Search by the member's exact e-mail address."
+    autocomplete_fields = ('event', 'user')
+    readonly_fields = ('booked_at',)
+    ordering = ('-booked_at',)
+
+    @admin.display(description='Member', ordering='user__user__last_name')
+    def member(self, obj):
+        return obj.user.full_name
+
+@admin.register(CustomUser)
+class CustomUserAdmin(ScalableModelAdmin):
+    list_display = ('full_name', 'username', 'phone', 'is_community_member', 'is_admin', 'date_joined_community')
+    list_select_related = ('user',)
+    list_filter = ('is_community_member', 'is_admin')
+    search_fields = ('user__username', 'user__first_name', 'user__last_name', '=user__email', 'phone')
+    autocomplete_fields = ('user',)
+    readonly_fields = ('date_joined_community',)
+
+    @admin.display(description='Username', ordering='user__username')
+    def username(self, obj):
+        return obj.user.username
+
+
+class ArchivedRecordAdmin(ScalableModelAdmin):
+    """Read-only view of an archive table; rows can only be restored"""
+    actions = ['restore']
+    restore_function = None
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description='Restore selected rows to the live table', permissions=['delete'])
+    def restore(self, request, queryset):
+        restored = 0
+        for pk in queryset.values_list('pk', flat=True):
+            try:
+                self.restore_function(pk)
+                restored += 1
+            except IntegrityError as exc:
+                self.message_user(request, f'Could not restore {pk}: {exc}', messages.ERROR)
+        self.message_user(request, f'Restored {restored} row(s).')
+
+@admin.register(ArchivedApplication)
+class ArchivedApplicationAdmin(ArchivedRecordAdmin):
+    list_display = ('id', 'email', 'status', 'created_at', 'archived_at')
+    list_filter = ('status',)
+    search_fields = ('=id', '=email')
+    exclude = ('payload',)
+    restore_function = staticmethod(archive.restore_application)
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(ArchivedRecordAdmin):
+    list_display = ('id', 'event_id', 'user_id', 'status', 'booked_at', 'archived_at')
+    list_filter = ('status',)
+    search_fields = ('=id', '=event_id', '=user_id')
+    exclude = ('payload',)
+    restore_function = staticmethod(archive.restore_booking)
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(ScalableModelAdmin):
+    """Review queue for pages/dedup.py: pending pairs, strongest match first"""
+    COMPARED_FIELDS = ('full_name', 'email', 'phone', 'date_of_birth', 'id_number', 'status', 'created_at')
+
+    list_display = ('first', 'second', 'reasons', 'score', 'status', 'created_at')
+    list_select_related = ('first', 'second')
+    list_filter = ('status',)
+    search_fields = ('=first__email', '=second__email', '=first__id_number', '=second__id_number')
+    readonly_fields = ('comparison', 'reasons', 'score', 'created_at', 'reviewed_at')
+    fields = ('comparison', 'reasons', 'score', 'status', 'created_at', 'reviewed_at')
+    actions = ['mark_duplicate', 'mark_distinct']
+
+    def has_add_permission(self, request):
+        return False
+
+    def save_model(self, request, obj, form, change):
+        if 'status' in form.changed_data:
+            obj.reviewed_at = timezone.now()
+        super().save_model(request, obj, form, change)
+
+    @admin.display(description='Applications')
+    def comparison(self, obj):
+        rows = (
+            (field.replace('_', ' ').capitalize(), getattr(obj.first, field), getattr(obj.second, field))
+            for field in self.COMPARED_FIELDS
+        )
+        return format_html('<table>{}</table>', format_html_join('', '<tr><th>{}</th><td>{}</td><td>{}</td></tr>', rows))
+
+    def _review(self, request, queryset, status):
+        updated = queryset.update(status=status, reviewed_at=timezone.now())
+        self.message_user(request, f'Marked {updated} pair(s) as {status}.')
+
+    @admin.action(description='Mark as duplicates', permissions=['change'])
+    def mark_duplicate(self, request, queryset):
+        self._review(request, queryset, 'duplicate')
+
+    @admin.action(description='Mark as different people', permissions=['change'])
+    def mark_distinct(self, request, queryset):
+        self._review(request, queryset, 'distinct')
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(ScalableModelAdmin):
+    """Profiles recorded by pages/profiling.py, shown as a flame graph and a table of hot frames"""
+    # Frames under this share of the samples are left out of the flame graph
+    FLAME_MIN_SHARE = 0.005
+
+    list_display = ('path', 'method', 'status_code', 'duration_ms', 'query_count', 'sample_count', 'user', 'created_at')
+    list_select_related = ('user',)
+    list_filter = ('view',)
+    search_fields = ('path',)
+    readonly_fields = (
+        'path', 'method', 'view', 'status_code', 'user', 'created_at', 'duration_ms', 'query_count', 'db_ms',
+        'interval_ms', 'sample_count', 'download', 'flame_graph', 'hot_functions',
+    )
+    fields = readonly_fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        if is_site_admin(request):
+            self.message_user(request, format_html(
+                'To profile a request, add <code>?{}={}</code> to its URL (valid for {} minutes).',
+                profiling.QUERY_PARAMETER, profiling.profile_token(request.user), settings.PROFILE_TOKEN_MAX_AGE // 60,
+            ))
+        return super().changelist_view(request, extra_context)
+
+    def get_urls(self):
+        return [
+            path('<path:object_id>/folded/', self.admin_site.admin_view(self.folded_view), name='pages_requestprofile_folded'),
+            *super().get_urls(),
+        ]
+
+    def folded_view(self, request, object_id):
+        profile = self.get_object(request, object_id)
+        if profile is None or not self.has_view_permission(request, profile):
+            raise Http404
+        response = HttpResponse(zlib.decompress(bytes(profile.stacks)), content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile.pk}.folded"'
+        return response
+
+    @admin.display(description='Folded stacks')
+    def download(self, obj):
+        return format_html(
+            '<a href="{}">profile-{}.folded</a> (for flamegraph.pl or speedscope.app)',
+            reverse('admin:pages_requestprofile_folded', args=[obj.pk]), obj.pk,
+        )
+
+    def _flame_level(self, level, parent_samples, total):
+        nodes = []
+        for frame, (samples, children) in sorted(level.items(), key=lambda item: -item[1][0]):
+            if samples < total * self.FLAME_MIN_SHARE:
+                continue
+            nodes.append(format_html(
+                '<div style="flex:0 0 {}%;min-width:0">'
+                '<div title="{} ({} samples, {}%)" style="background:hsl({},80%,70%);border:1px solid #fff;'
+                'padding:1px 3px;overflow:hidden;white-space:nowrap;font:11px monospace">{}</div>'
+                '<div style="display:flex">{}</div></div>',
+                f'{samples / parent_samples * 100:.3f}', frame, samples, f'{samples / total * 100:.1f}',
+                zlib.crc32(frame.encode()) % 50, frame.split(' (')[0],
+                self._flame_level(children, samples, total),
+            ))
+        return format_html_join('', '{}', ((node,) for node in nodes))
+
+    @admin.display(description='Flame graph')
+    def flame_graph(self, obj):
+        stacks = profiling.load_stacks(obj)
+        total = sum(stacks.values())
+        if not total:
+            return 'No samples: the request finished within one sampling interval.'
+        return format_html(
+            '<div style="display:flex;width:100%">{}</div>',
+            self._flame_level(profiling.call_tree(stacks), total, total),
+        )
 
+    @admin.display(description='Hot frames')
+    def hot_functions(self, obj):
+        stacks = profiling.load_stacks(obj)
+        total = sum(stacks.values()) or 1
+        rows = (
+            (frame, f'{own / total * 100:.1f}%', f'{inclusive / total * 100:.1f}%')
+            for frame, own, inclusive in profiling.hot_functions(stacks)
+        )
+        return format_html(
+            '<table><tr><th>Frame</th><th>Self</th><th>Total</th></tr>{}</table>',
+            format_html_join('', '<tr><td><code>{}</code></td><td>{}</td><td>{}</td></tr>', rows),
+        )
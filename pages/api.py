@@ -0,0 +1,206 @@
+"""
+Read-only JSON API for events and reviews, plus faceted event search and,
+for staff, applicant search by skill and language.
+
+Both endpoints page newest-first with opaque cursors (see pages/paginators.py)
+and take ``?fields=a,b,c`` so clients only pay for the columns they use: the
+query selects just those columns with ``.values()``, and the booking count
+behind ``spots_remaining``/``is_full`` is only annotated when asked for.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import conditional_page, require_GET
+
+from core.responses import FastJsonResponse
+
+from . import search, skills
+from .auth import admin_required
+from .models import ApplicationTag, CommunityReview, Event, EventBooking, MembershipApplication
+from .paginators import keyset_page
+
+EVENT_COLUMNS = (
+    'id', 'title', 'description', 'event_type', 'date_time', 'deadline', 'location',
+    'is_online', 'price', 'max_participants', 'status', 'created_at',
+)
+EVENT_AVAILABILITY = ('spots_remaining', 'is_full')
+DEFAULT_EVENT_FIELDS = ('id', 'title', 'event_type', 'date_time', 'location', 'is_online', 'price', 'spots_remaining')
+
+REVIEW_COLUMNS = ('id', 'rating', 'comment', 'created_at')
+DEFAULT_REVIEW_FIELDS = ('id', 'rating', 'comment', 'author', 'created_at')
+
+APPLICANT_FIELDS = (
+    'id', 'first_name', 'last_name', 'email', 'phone', 'region', 'status', 'skills', 'languages', 'created_at',
+)
+
+MAX_PER_PAGE = 100
+
+
+def _json_errors(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except BadRequest as exc:
+            return FastJsonResponse({'error': str(exc)}, status=400)
+    return wrapper
+
+
+def api_view(view_func):
+    """GET only, ETag/304 handling, shared caching headers and JSON errors"""
+    wrapper = cache_control(public=True, max_age=settings.API_CACHE_SECONDS)(_json_errors(view_func))
+    return require_GET(conditional_page(wrapper))
+
+
+def staff_api_view(view_func):
+    """GET only and JSON errors, for site admins; responses hold personal data, so never cached"""
+    return admin_required(require_GET(never_cache(_json_errors(view_func))))
+
+
+def requested_fields(request, allowed, default):
+    if not request.GET.get('fields'):
+        return list(default)
+    fields = list(dict.fromkeys(f.strip() for f in request.GET['fields'].split(',') if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return fields
+
+
+def per_page(request, default=25):
+    try:
+        return max(1, min(int(request.GET.get('per_page', default)), MAX_PER_PAGE))
+    except ValueError:
+        raise BadRequest('per_page must be an integer')
+
+
+def confirmed_bookings():
+    # A correlated count keeps GROUP BY (and every selected column in it) off the outer query
+    bookings = EventBooking.objects.filter(event=OuterRef('pk'), status='confirmed')
+    return Coalesce(Subquery(
+        bookings.order_by().values('event').annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def page_response(page, rows):
+    return FastJsonResponse({'results': rows, 'next_cursor': page.next_cursor})
+
+
+def event_page(request, queryset, **keyset):
+    """One keyset page of ``queryset`` as rows holding just the ``?fields=`` asked for"""
+    fields = requested_fields(request, EVENT_COLUMNS + EVENT_AVAILABILITY, DEFAULT_EVENT_FIELDS)
+    columns = [f for f in fields if f in EVENT_COLUMNS]
+    availability = any(f in EVENT_AVAILABILITY for f in fields)
+    if availability:
+        queryset = queryset.annotate(confirmed_count=confirmed_bookings())
+        columns += ['max_participants', 'confirmed_count']
+
+    field = keyset.get('field', 'created_at')
+    page = keyset_page(queryset.values(*columns, field, 'pk'), request.GET.get('cursor'), per_page(request), **keyset)
+
+    rows = []
+    for values in page.items:
+        row = {f: values[f] for f in fields if f in EVENT_COLUMNS}
+        if availability:
+            limit = values['max_participants']
+            remaining = None if limit is None else max(0, limit - values['confirmed_count'])
+            if 'spots_remaining' in fields:
+                row['spots_remaining'] = remaining
+            if 'is_full' in fields:
+                row['is_full'] = remaining == 0
+        rows.append(row)
+    return page, rows
+
+
+@api_view
+def events(request):
+    """Events newest first; ``?status=`` defaults to upcoming"""
+    queryset = Event.objects.filter(status=request.GET.get('status', 'upcoming'))
+    if request.GET.get('event_type'):
+        queryset = queryset.filter(event_type=request.GET['event_type'])
+    return page_response(*event_page(request, queryset))
+
+
+@api_view
+def event_search(request):
+    """Upcoming events matching the search filters, soonest first, with facet counts"""
+    filters = search.EventFilters.from_query(request.GET)
+    page, rows = event_page(request, search.search_events(filters), field='date_time', descending=False)
+    payload = {'results': rows, 'next_cursor': page.next_cursor}
+    if not request.GET.get('cursor'):
+        # Facets describe the whole result set, so only the first page carries them
+        payload['facets'] = search.facet_counts(filters)
+    return FastJsonResponse(payload)
+
+
+@api_view
+def reviews(request):
+    """Public reviews newest first; ``?rating=`` narrows to one star rating"""
+    fields = requested_fields(request, REVIEW_COLUMNS + ('author',), DEFAULT_REVIEW_FIELDS)
+    columns = [f for f in fields if f in REVIEW_COLUMNS]
+    if 'author' in fields:
+        columns += ['user__user__first_name', 'user__user__last_name']
+
+    queryset = CommunityReview.objects.filter(is_public=True)
+    if request.GET.get('rating'):
+        if not request.GET['rating'].isdigit():
+            raise BadRequest('rating must be an integer')
+        queryset = queryset.filter(rating=request.GET['rating'])
+
+    page = keyset_page(queryset.values(*columns, 'created_at', 'pk'), request.GET.get('cursor'), per_page(request))
+
+    rows = []
+    for values in page.items:
+        row = {f: values[f] for f in fields if f in REVIEW_COLUMNS}
+        if 'author' in fields:
+            row['author'] = f"{values['user__user__first_name']} {values['user__user__last_name']}"
+        rows.append(row)
+    return page_response(page, rows)
+
+
+def _listed(request, name):
+    """``?skill=python&skill=sql`` and ``?skill=python,sql`` alike"""
+    return [value for raw in request.GET.getlist(name) for value in raw.split(',') if value.strip()]
+
+
+def _choice(request, name, choices):
+    value = request.GET.get(name)
+    if value and value not in dict(choices):
+        raise BadRequest(f"Unknown {name}: {value}")
+    return value
+
+
+def _facet(kind, queryset):
+    return [{'value': value, 'count': total} for value, total in skills.top_values(kind, queryset)]
+
+
+@staff_api_view
+def applicant_search(request):
+    """
+    Applications newest first, narrowed by ``?status=``, ``?region=`` and any
+    number of ``?skill=``/``?language=`` (all must match). The first page
+    also counts the top skills and languages among every match.
+    """
+    queryset = MembershipApplication.objects.all()
+    for name, choices in (('status', MembershipApplication.STATUS_CHOICES),
+                          ('region', MembershipApplication.REGION_CHOICES)):
+        value = _choice(request, name, choices)
+        if value:
+            queryset = queryset.filter(**{name: value})
+    queryset = skills.with_tags(queryset, skills=_listed(request, 'skill'), languages=_listed(request, 'language'))
+
+    page = keyset_page(queryset.values(*APPLICANT_FIELDS, 'pk'), request.GET.get('cursor'), per_page(request))
+    payload = {
+        'results': [{f: values[f] for f in APPLICANT_FIELDS} for values in page.items],
+        'next_cursor': page.next_cursor,
+    }
+    if not request.GET.get('cursor'):
+        payload['facets'] = {
+            'skills': _facet(ApplicationTag.SKILL, queryset),
+            'languages': _facet(ApplicationTag.LANGUAGE, queryset),
+        }
+    return FastJsonResponse(payload)
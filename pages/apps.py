@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PagesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pages'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.WARMUP_ON_READY:
+            from .warmup import warm_up
+            warm_up()
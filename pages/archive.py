@@ -0,0 +1,175 @@
+"""
+Move cold rows out of the hot tables, and bring them back on request.
+
+Processed (approved or rejected) membership applications untouched for
+``ARCHIVE_APPLICATION_DAYS`` and bookings for events that took place more
+than ``ARCHIVE_BOOKING_DAYS`` ago are copied into ``ArchivedApplication`` /
+``ArchivedBooking`` and deleted from their hot table, one batch per
+transaction. Each archive row keeps a few lookup columns plus the complete
+row as compressed JSON, which is what ``restore_*`` loads back.
+
+Rows that would otherwise go with them by cascade are packed alongside:
+an application's duplicate candidates, with the staff's decisions on them,
+and a booking's sent reminders. A restore brings them back, except for
+candidates whose other application is still archived; that application's
+own payload restores them later. A restored application is keyed for
+duplicate detection again straight away (``dedup.rekey``).
+
+Run it from cron with ``python manage.py archive_cold_rows``.
+"""
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (
+    ArchivedApplication,
+    ArchivedBooking,
+    DuplicateCandidate,
+    Event,
+    EventBooking,
+    EventReminder,
+    MembershipApplication,
+)
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder rounds datetimes to milliseconds; a restore must be exact"""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def pack(instance, related=()):
+    data = serializers.serialize('python', [instance, *related])
+    return zlib.compress(json.dumps(data, cls=ArchiveEncoder).encode(), 9)
+
+
+def unpack(payload):
+    """The deserialized row, then the related rows packed with it"""
+    return list(serializers.deserialize('python', json.loads(zlib.decompress(bytes(payload)))))
+
+
+def cold_applications(days=None):
+    cutoff = timezone.now() - timedelta(days=settings.ARCHIVE_APPLICATION_DAYS if days is None else days)
+    return MembershipApplication.objects.exclude(status='pending').filter(updated_at__lt=cutoff)
+
+
+def cold_bookings(days=None):
+    cutoff = timezone.now() - timedelta(days=settings.ARCHIVE_BOOKING_DAYS if days is None else days)
+    return EventBooking.objects.filter(event__in=Event.objects.filter(date_time__lt=cutoff).values('pk'))
+
+
+def _candidates_of(applications):
+    """{application id: its duplicate candidates}, from one query"""
+    ids = [application.pk for application in applications]
+    related = defaultdict(list)
+    for candidate in DuplicateCandidate.objects.filter(Q(first__in=ids) | Q(second__in=ids)):
+        related[candidate.first_id].append(candidate)
+        related[candidate.second_id].append(candidate)
+    return related
+
+
+def _reminders_of(bookings):
+    """{booking id: its sent reminders}, from one query"""
+    related = defaultdict(list)
+    for reminder in EventReminder.objects.filter(booking__in=[booking.pk for booking in bookings]):
+        related[reminder.booking_id].append(reminder)
+    return related
+
+
+def _archive_batches(queryset, archive_model, to_archive, related_of, batch_size):
+    moved = 0
+    while True:
+        with transaction.atomic():
+            # select_for_update reads from the primary and keeps the batch from
+            # being edited between the copy and the delete
+            batch = list(queryset.order_by('pk').select_for_update()[:batch_size])
+            if not batch:
+                return moved
+            related = related_of(batch)
+            archive_model.objects.bulk_create([to_archive(row, related[row.pk]) for row in batch])
+            queryset.model.objects.filter(pk__in=[row.pk for row in batch]).delete()
+        moved += len(batch)
+
+
+def _archived_application(application, candidates):
+    return ArchivedApplication(
+        id=application.pk,
+        email=application.email,
+        status=application.status,
+        created_at=application.created_at,
+        payload=pack(application, candidates),
+    )
+
+
+def _archived_booking(booking, reminders):
+    return ArchivedBooking(
+        id=booking.pk,
+        event_id=booking.event_id,
+        user_id=booking.user_id,
+        status=booking.status,
+        booked_at=booking.booked_at,
+        payload=pack(booking, reminders),
+    )
+
+
+def archive_applications(days=None, batch_size=500):
+    """Archive processed applications past retention; returns how many moved"""
+    return _archive_batches(cold_applications(days), ArchivedApplication, _archived_application, _candidates_of, batch_size)
+
+
+def archive_bookings(days=None, batch_size=1000):
+    """Archive bookings of long-past events; returns how many moved"""
+    return _archive_batches(cold_bookings(days), ArchivedBooking, _archived_booking, _reminders_of, batch_size)
+
+
+def _restore(archive_model, pk, restorable=lambda related: related):
+    with transaction.atomic():
+        archived = archive_model.objects.select_for_update().get(pk=pk)
+        deserialized, *related = unpack(archived.payload)
+        deserialized.save()
+        for row in restorable(related):
+            row.save()
+        archived.delete()
+    return deserialized.object
+
+
+def _restorable_candidates(candidates):
+    """The candidates whose applications are both in the hot table (again)"""
+    ids = {pk for row in candidates for pk in (row.object.first_id, row.object.second_id)}
+    present = set(MembershipApplication.objects.filter(pk__in=ids).values_list('pk', flat=True))
+    return [row for row in candidates if {row.object.first_id, row.object.second_id} <= present]
+
+
+def restore_application(pk):
+    """
+    Move an archived application back into the hot table, with its duplicate
+    candidates, and key it for duplicate detection. Raises
+    ArchivedApplication.DoesNotExist, or IntegrityError if its e-mail or ID
+    number has been used by a newer application since.
+    """
+    from . import dedup  # archive loads with the admin at boot, dedup stays off it
+
+    with transaction.atomic():
+        application = _restore(ArchivedApplication, pk, _restorable_candidates)
+        dedup.rekey(application.pk)
+    return application
+
+
+def restore_booking(pk):
+    """
+    Move an archived booking back, with its sent reminders. Raises
+    ArchivedBooking.DoesNotExist, or IntegrityError if its event or member
+    no longer exists.
+    """
+    return _restore(ArchivedBooking, pk)
@@ -0,0 +1,68 @@
+"""
+Request-user loading and access checks.
+
+``ProfileModelBackend`` fetches the session's ``User`` together with its
+``CustomUser`` in one joined query, so ``request.user.customuser`` (in views
+and in templates) never costs a second query. ``get_profile`` and
+``admin_required`` build on that.
+"""
+from functools import wraps
+
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect
+
+from .models import CustomUser
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    def _user_queryset(self):
+        return UserModel._default_manager.select_related('customuser')
+
+    def get_user(self, user_id):
+        try:
+            user = self._user_queryset().get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        try:
+            user = await self._user_queryset().aget(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def get_profile(request):
+    """The request user's CustomUser, or None; memoized on the request"""
+    if not hasattr(request, '_profile'):
+        profile = None
+        if request.user.is_authenticated:
+            try:
+                profile = request.user.customuser
+            except CustomUser.DoesNotExist:
+                pass
+        request._profile = profile
+    return request._profile
+
+
+def is_site_admin(request):
+    profile = get_profile(request)
+    return request.user.is_superuser or (profile is not None and profile.is_admin)
+
+
+def admin_required(view_func):
+    """Allow superusers and CustomUser admins; send everyone else home"""
+    @login_required
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not is_site_admin(request):
+            messages.error(request, 'Access denied. Admin privileges required.')
+            return redirect('index')
+        return view_func(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,192 @@
+"""
+Event check-in for door devices.
+
+A ticket is a signed booking id (``checkin_token``), returned when the
+booking is made, printed in every reminder e-mail and issued again to the
+member from ``ticket`` whenever they ask for it. Checking in is one conditional UPDATE on the primary key,
+``confirmed -> attended``, so simultaneous scans of the same ticket cannot
+both win and nothing is read first on the common path.
+
+Devices that lose connectivity queue scans and upload them to the batch
+endpoint, which applies them in one transaction and reports per scan.
+Scanning a ticket that is already checked in is reported as such rather than
+as an error, so a device can safely resend a batch whose response it never
+received.
+"""
+import json
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core import signing
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from core.responses import FastJsonResponse
+
+from .models import EventBooking
+
+TOKEN_SALT = 'pages.checkin'
+MAX_BATCH = 500
+
+CHECKED_IN = 'checked_in'
+ALREADY_CHECKED_IN = 'already_checked_in'
+INVALID_TOKEN = 'invalid_token'
+NOT_FOUND = 'not_found'
+NOT_CONFIRMED = 'not_confirmed'
+WRONG_EVENT = 'wrong_event'
+
+
+def checkin_token(booking):
+    return signing.Signer(salt=TOKEN_SALT).sign(str(booking.pk))
+
+
+def booking_id(token):
+    """The booking id a token was issued for, or None if it is forged or garbled"""
+    try:
+        return signing.Signer(salt=TOKEN_SALT).unsign(token)
+    except (signing.BadSignature, TypeError):
+        return None
+
+
+def _device_authorized(request):
+    scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+    return scheme == 'Bearer' and any(constant_time_compare(key, known) for known in settings.CHECKIN_DEVICE_KEYS)
+
+
+def device_api(view_func):
+    """POST-only JSON endpoint for door devices, authenticated by device key instead of session"""
+    def wrapper(request, *args, **kwargs):
+        if not _device_authorized(request):
+            return FastJsonResponse({'error': 'Unknown device key'}, status=401)
+        try:
+            data = json.loads(request.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return FastJsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(data, dict):
+            return FastJsonResponse({'error': 'Expected a JSON object'}, status=400)
+        return view_func(request, data, *args, **kwargs)
+    return csrf_exempt(require_POST(wrapper))
+
+
+def _event_id(data):
+    """The optional ``event_id`` as a UUID; raises ValueError when it isn't one"""
+    value = data.get('event_id')
+    if not value:
+        return None
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid event_id: {value!r}')
+
+
+def _outcome(booking, event_id):
+    if booking is None:
+        return NOT_FOUND
+    if event_id and booking.event_id != event_id:
+        return WRONG_EVENT
+    if booking.status == 'attended':
+        return ALREADY_CHECKED_IN
+    if booking.status == 'confirmed':
+        return CHECKED_IN
+    return NOT_CONFIRMED
+
+
+def _scan_time(value, now):
+    """The device's clock, when it sent one, is when the person actually arrived"""
+    try:
+        scanned = parse_datetime(value) if isinstance(value, str) else None
+    except ValueError:
+        scanned = None
+    if scanned is None or timezone.is_naive(scanned):
+        return now
+    return min(scanned, now)
+
+
+@login_required
+@require_GET
+def ticket(request, event_id):
+    """The member's own ticket for their confirmed booking of ``event_id``, to show at the door"""
+    booking = EventBooking.objects.filter(event_id=event_id, user__user=request.user, status='confirmed').only('pk').first()
+    if booking is None:
+        return FastJsonResponse({'error': 'You have no confirmed booking for this event'}, status=404)
+    return FastJsonResponse({'booking_id': str(booking.pk), 'checkin_token': checkin_token(booking)})
+
+
+@device_api
+def check_in(request, data):
+    """Check in one ticket: ``{"token": ..., "event_id": optional}``"""
+    pk = booking_id(data.get('token'))
+    if pk is None:
+        return FastJsonResponse({'result': INVALID_TOKEN}, status=400)
+
+    try:
+        event_id = _event_id(data)
+    except ValueError as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
+    bookings = EventBooking.objects.filter(pk=pk, status='confirmed')
+    if event_id:
+        bookings = bookings.filter(event_id=event_id)
+    if bookings.update(status='attended', checked_in_at=timezone.now()):
+        return FastJsonResponse({'result': CHECKED_IN, 'booking_id': pk})
+
+    # Only scans that didn't check anyone in pay for a second query, to say why
+    result = _outcome(EventBooking.objects.filter(pk=pk).only('status', 'event_id').first(), event_id)
+    return FastJsonResponse({'result': result, 'booking_id': pk}, status=200 if result == ALREADY_CHECKED_IN else 409)
+
+
+@device_api
+def check_in_batch(request, data):
+    """
+    Apply queued scans: ``{"event_id": optional, "scans": [{"token": ...,
+    "scanned_at": ISO 8601, optional}, ...]}``. Returns one result per scan,
+    in order.
+    """
+    scans = data.get('scans')
+    if not isinstance(scans, list) or not scans:
+        return FastJsonResponse({'error': 'scans must be a non-empty list'}, status=400)
+    if len(scans) > MAX_BATCH:
+        return FastJsonResponse({'error': f'At most {MAX_BATCH} scans per batch'}, status=400)
+
+    try:
+        event_id = _event_id(data)
+    except ValueError as e:
+        return FastJsonResponse({'error': str(e)}, status=400)
+
+    now = timezone.now()
+    ids, scanned_at = [], {}
+    for scan in scans:
+        pk = booking_id(scan.get('token')) if isinstance(scan, dict) else None
+        ids.append(pk)
+        if pk is not None and pk not in scanned_at:
+            scanned_at[pk] = _scan_time(scan.get('scanned_at'), now)
+
+    with transaction.atomic():
+        bookings = EventBooking.objects.select_for_update().filter(pk__in=scanned_at).only('status', 'event_id')
+        by_id = {str(booking.pk): booking for booking in bookings}
+        outcomes = {pk: _outcome(by_id.get(pk), event_id) for pk in scanned_at}
+        due = [pk for pk, outcome in outcomes.items() if outcome == CHECKED_IN]
+        if due:
+            EventBooking.objects.filter(pk__in=due, status='confirmed').update(
+                status='attended',
+                checked_in_at=Case(*(When(pk=pk, then=Value(scanned_at[pk])) for pk in due),
+                                   output_field=DateTimeField()),
+            )
+
+    results, seen = [], set()
+    for pk in ids:
+        if pk is None:
+            results.append({'result': INVALID_TOKEN})
+            continue
+        result = outcomes[pk]
+        if result == CHECKED_IN and pk in seen:
+            result = ALREADY_CHECKED_IN  # the same ticket scanned twice in one batch
+        seen.add(pk)
+        results.append({'result': result, 'booking_id': pk})
+
+    return FastJsonResponse({'checked_in': len(due), 'results': results})
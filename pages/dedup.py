@@ -0,0 +1,223 @@
+"""
+Find applications that are probably the same person.
+
+The unique e-mail and ID number constraints miss people who reapply with a
+new address or mistype their ID, and comparing every pair of applications
+is quadratic. Instead each application gets a few blocking keys, stored in
+``ApplicationBlockingKey``:
+
+* its phone number, normalized to international form;
+* its name tokens, sorted, with the date of birth;
+* its normalized ID number, and every variant of it with one character
+  deleted combined with the date of birth, so the same person's IDs one
+  typo apart (substitution, insertion, deletion or swapped neighbours)
+  share a key. Without the birth date a dense numeric ID space would put
+  most IDs in a block with dozens of unrelated neighbours.
+
+Only applications sharing a key are compared; ID matches are then checked
+with an actual edit distance. Pairs are written to ``DuplicateCandidate``
+for review in the admin.
+
+``find_duplicates()`` is incremental: it processes applications newer than
+the last one keyed, in batches, each batch reading the members of the
+blocks it touches in one query. Run ``manage.py find_duplicate_applications``
+from cron, after the nightly archival. Applications that come back from the
+archive sit below that point, so ``rekey()`` keys them on the spot; it
+also re-keys an application whose phone, name, birth date or ID number is
+edited (pages/signals.py).
+"""
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Max, Q
+
+from .models import ApplicationBlockingKey, DuplicateCandidate, MembershipApplication
+
+BATCH_SIZE = 1000
+# Blocks bigger than this (a shared office phone, a placeholder ID) say
+# little about identity and would produce pairs quadratically; skip them
+MAX_BLOCK_SIZE = 50
+# IDs shorter than this only block on the exact value
+MIN_FUZZY_ID_LENGTH = 8
+
+WEIGHTS = {
+    ApplicationBlockingKey.ID_NUMBER: 50,
+    ApplicationBlockingKey.NAME_DOB: 30,
+    ApplicationBlockingKey.PHONE: 20,
+}
+
+FIELDS = ('pk', *ApplicationBlockingKey.SOURCE_FIELDS)
+
+
+def normalize_phone(phone):
+    """Digits in 255XXXXXXXXX form, or '' if it's too short to mean anything"""
+    digits = re.sub(r'\D', '', phone or '')
+    if digits.startswith('00'):
+        digits = digits[2:]
+    if len(digits) == 10 and digits.startswith('0'):
+        digits = '255' + digits[1:]
+    elif len(digits) == 9:
+        digits = '255' + digits
+    return digits if len(digits) >= 9 else ''
+
+
+def normalize_name(*parts):
+    """Lowercase ASCII name tokens in sorted order, so swapped names still match"""
+    text = unicodedata.normalize('NFKD', ' '.join(parts)).encode('ascii', 'ignore').decode().lower()
+    return ' '.join(sorted(re.findall(r'[a-z]+', text)))
+
+
+def normalize_id(id_number):
+    return re.sub(r'[^0-9A-Z]', '', (id_number or '').upper())
+
+
+def id_variants(normalized):
+    """``normalized`` and each string with one of its characters deleted"""
+    if len(normalized) < MIN_FUZZY_ID_LENGTH:
+        return set()
+    # Deleting from the longer of two IDs an insertion apart gives the shorter one itself
+    return {normalized} | {normalized[:i] + normalized[i + 1:] for i in range(len(normalized))}
+
+
+def within_one_edit(a, b):
+    """True if ``a`` and ``b`` differ by at most one edit or one swap of neighbours"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    start = 0
+    while start < len(a) and a[start] == b[start]:
+        start += 1
+    if len(a) < len(b):
+        return a[start:] == b[start + 1:]
+    return a[start + 1:] == b[start + 1:] or (
+        a[start:start + 2] == b[start:start + 2][::-1] and a[start + 2:] == b[start + 2:]
+    )
+
+
+def _hash(kind, value):
+    digest = hashlib.blake2b(f'{kind}:{value}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def blocking_keys(application):
+    """(kind, key) pairs of an application's values() row"""
+    keys = set()
+    phone = normalize_phone(application['phone'])
+    if phone:
+        keys.add((ApplicationBlockingKey.PHONE, _hash('phone', phone)))
+    name = normalize_name(application['first_name'], application['last_name'])
+    if name and application['date_of_birth']:
+        keys.add((ApplicationBlockingKey.NAME_DOB, _hash('name_dob', f"{name}|{application['date_of_birth']}")))
+    id_number = normalize_id(application['id_number'])
+    if id_number:
+        keys.add((ApplicationBlockingKey.ID_NUMBER, _hash('id', id_number)))
+    for variant in id_variants(id_number):
+        keys.add((ApplicationBlockingKey.ID_NUMBER, _hash('id~', f"{variant}|{application['date_of_birth']}")))
+    return keys
+
+
+def _candidate_pairs(batch_ids, lo, hi):
+    """{(older, newer): {kinds}} for the blocks touched by applications lo..hi"""
+    touched = ApplicationBlockingKey.objects.filter(application__gte=lo, application__lte=hi).values('key')
+    blocks = defaultdict(list)
+    for key, kind, application_id in ApplicationBlockingKey.objects.filter(
+        key__in=touched
+    ).values_list('key', 'kind', 'application_id'):
+        blocks[(kind, key)].append(application_id)
+
+    pairs = defaultdict(set)
+    for (kind, _), members in blocks.items():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for pair in combinations(sorted(set(members)), 2):
+            # Pairs outside the batch were found when the later-keyed of them was keyed
+            if pair[0] in batch_ids or pair[1] in batch_ids:
+                pairs[pair].add(kind)
+    return pairs
+
+
+def _confirm_ids(pairs):
+    """Drop ID-number block matches more than one typo apart (variants of different IDs can collide)"""
+    fuzzy = [pair for pair, kinds in pairs.items() if ApplicationBlockingKey.ID_NUMBER in kinds]
+    if not fuzzy:
+        return pairs
+    ids = dict(MembershipApplication.objects.filter(
+        pk__in={pk for pair in fuzzy for pk in pair}
+    ).values_list('pk', 'id_number'))
+    for first, second in fuzzy:
+        if not within_one_edit(normalize_id(ids[first]), normalize_id(ids[second])):
+            pairs[(first, second)].discard(ApplicationBlockingKey.ID_NUMBER)
+    return {pair: kinds for pair, kinds in pairs.items() if kinds}
+
+
+def _process(batch):
+    lo, hi = batch[0]['pk'], batch[-1]['pk']
+    with transaction.atomic():
+        ApplicationBlockingKey.objects.bulk_create([
+            ApplicationBlockingKey(application_id=application['pk'], kind=kind, key=key)
+            for application in batch
+            for kind, key in blocking_keys(application)
+        ], ignore_conflicts=True)
+        pairs = _confirm_ids(_candidate_pairs({application['pk'] for application in batch}, lo, hi))
+        DuplicateCandidate.objects.bulk_create([
+            DuplicateCandidate(
+                first_id=first, second_id=second,
+                reasons=','.join(sorted(kinds)), score=sum(WEIGHTS[kind] for kind in kinds),
+            )
+            for (first, second), kinds in pairs.items()
+        ], update_conflicts=True, unique_fields=['first', 'second'], update_fields=['reasons', 'score'])
+    return len(pairs)
+
+
+def _last_keyed():
+    return ApplicationBlockingKey.objects.aggregate(last=Max('application_id'))['last'] or 0
+
+
+def rekey(pk):
+    """
+    Replace the blocking keys of an application ``find_duplicates`` has
+    already passed, and record its pairs with older and newer applications
+    alike; returns the pairs written. Pending pairs the new keys no longer
+    support are dropped, reviewed ones are kept, and nothing is written when
+    the keys haven't changed. Later applications are left for
+    ``find_duplicates``, which keys them in order.
+    """
+    if pk > _last_keyed():
+        return 0
+    batch = list(MembershipApplication.objects.filter(pk=pk).values(*FIELDS))
+    if not batch:
+        return 0
+    keys = ApplicationBlockingKey.objects.filter(application_id=pk)
+    if set(keys.values_list('kind', 'key')) == blocking_keys(batch[0]):
+        return 0
+    with transaction.atomic():
+        keys.delete()
+        DuplicateCandidate.objects.filter(Q(first=pk) | Q(second=pk), status='pending').delete()
+        return _process(batch)
+
+
+def find_duplicates(batch_size=BATCH_SIZE, rebuild=False):
+    """
+    Key the applications not keyed yet and record candidate pairs among them
+    and the older ones. Returns (applications processed, pairs written).
+    ``rebuild`` re-keys everything; review decisions on existing pairs are kept.
+    """
+    if rebuild:
+        ApplicationBlockingKey.objects.all().delete()
+    last = _last_keyed()
+
+    processed = found = 0
+    while True:
+        batch = list(MembershipApplication.objects.filter(pk__gt=last).order_by('pk').values(*FIELDS)[:batch_size])
+        if not batch:
+            return processed, found
+        found += _process(batch)
+        processed += len(batch)
+        last = batch[-1]['pk']
@@ -0,0 +1,164 @@
+"""
+iCalendar (RFC 5545) feeds calendar apps can subscribe to.
+
+The site-wide feed is built once and kept in the cache together with its
+ETag, under a key derived from the events table (``feed_version``), so the
+frequent polls from calendar clients are one aggregate query and a cache
+read, and usually a 304. Any change to an event, made by any worker, moves
+the key on.
+Member feeds list the member's confirmed bookings from a single query and
+are addressed by a signed token, since calendar apps can't log in.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, conditional_page, require_GET
+
+from core import metrics
+
+from .models import Event
+
+SITE_FEED_KEY = 'ical:site-feed'
+MEMBER_TOKEN_SALT = 'pages.feeds.member'
+CONTENT_TYPE = 'text/calendar; charset=utf-8'
+
+# Events have no end time; calendars get this duration
+EVENT_DURATION = timedelta(hours=2)
+# How far back the site feed keeps past events
+SITE_FEED_HISTORY = timedelta(days=30)
+
+FEED_FIELDS = ('id', 'title', 'description', 'location', 'date', 'date_time', 'status', 'is_online', 'updated_at')
+
+
+def _escape(text):
+    return (
+        text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Split content lines longer than 75 octets, as RFC 5545 requires"""
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line
+    parts, limit = [], 75
+    while raw:
+        cut = min(limit, len(raw))
+        # Never split inside a multi-byte UTF-8 sequence
+        while cut < len(raw) and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode())
+        raw, limit = raw[cut:], 74
+    return '\r\n '.join(parts)
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _vevent(event, site_url):
+    if event.date_time:
+        when = [f'DTSTART:{_utc(event.date_time)}', f'DTEND:{_utc(event.date_time + EVENT_DURATION)}']
+    else:
+        when = [f"DTSTART;VALUE=DATE:{event.date.strftime('%Y%m%d')}"]
+    return [
+        'BEGIN:VEVENT',
+        f'UID:{event.id}@visionhub',
+        f'DTSTAMP:{_utc(event.updated_at)}',
+        f'LAST-MODIFIED:{_utc(event.updated_at)}',
+        *when,
+        f'SUMMARY:{_escape(event.title)}',
+        f"LOCATION:{_escape('Online' if event.is_online else event.location)}",
+        f'DESCRIPTION:{_escape(event.description)}',
+        f'URL:{site_url}',
+        f"STATUS:{'CANCELLED' if event.status == 'cancelled' else 'CONFIRMED'}",
+        'END:VEVENT',
+    ]
+
+
+def render_calendar(events, name, site_url):
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Vision Hub Tanzania//Events//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape(name)}',
+    ]
+    for event in events:
+        lines += _vevent(event, site_url)
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(_fold(line) for line in lines) + '\r\n').encode()
+
+
+def _dated(queryset):
+    return queryset.exclude(date_time__isnull=True, date__isnull=True).only(*FEED_FIELDS).order_by('date_time', 'date')
+
+
+def feed_version():
+    """
+    Changes whenever an event is saved, created or deleted, in any worker:
+    each cache then sees a new key, so nothing has to be told to drop the
+    old feed. The date is part of it because the history window moves daily.
+    Bulk ``update()`` calls on events must set ``updated_at`` to be noticed.
+    """
+    latest = Event.objects.aggregate(changed=Max('updated_at'), count=Count('pk'))
+    changed = latest['changed'].timestamp() if latest['changed'] else 0
+    return f"{latest['count']}:{changed}:{timezone.localdate().isoformat()}"
+
+
+def _build_site_feed(request):
+    key = f'{SITE_FEED_KEY}:{feed_version()}'
+    feed = cache.get(key)
+    metrics.count_cache('ical_feed', feed is not None)
+    if feed is None:
+        since = timezone.now() - SITE_FEED_HISTORY
+        events = _dated(Event.objects.exclude(date_time__lt=since).exclude(date__lt=since.date()))
+        body = render_calendar(events, 'Vision Hub Tanzania events', request.build_absolute_uri(reverse('community')))
+        feed = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        # Superseded versions are never read again and expire on their own
+        cache.set(key, feed, 86400)
+    return feed
+
+
+def site_feed(request):
+    """(etag, body) of the site-wide feed, built on the first poll after a change; memoized on the request"""
+    if not hasattr(request, '_site_feed'):
+        request._site_feed = _build_site_feed(request)
+    return request._site_feed
+
+
+def member_token(profile):
+    return signing.Signer(salt=MEMBER_TOKEN_SALT).sign(str(profile.pk))
+
+
+def member_feed_url(request, profile):
+    return request.build_absolute_uri(reverse('member_calendar', args=[member_token(profile)]))
+
+
+@require_GET
+@cache_control(public=True, max_age=settings.CALENDAR_CACHE_SECONDS)
+@condition(etag_func=lambda request: site_feed(request)[0])
+def events_calendar(request):
+    return HttpResponse(site_feed(request)[1], content_type=CONTENT_TYPE)
+
+
+@require_GET
+@cache_control(private=True, max_age=settings.CALENDAR_CACHE_SECONDS)
+@conditional_page
+def member_calendar(request, token):
+    try:
+        profile_id = signing.Signer(salt=MEMBER_TOKEN_SALT).unsign(token)
+    except signing.BadSignature:
+        raise Http404('Unknown calendar')
+    events = _dated(Event.objects.filter(bookings__user_id=profile_id, bookings__status='confirmed'))
+    body = render_calendar(events, 'My Vision Hub events', request.build_absolute_uri(reverse('community')))
+    return HttpResponse(body, content_type=CONTENT_TYPE)
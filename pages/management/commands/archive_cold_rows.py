@@ -0,0 +1,36 @@
+"""
+Move old processed applications and past-event bookings to the archive tables.
+
+    python manage.py archive_cold_rows                  # defaults from settings
+    python manage.py archive_cold_rows --dry-run
+    python manage.py archive_cold_rows --application-days 730 --booking-days 90
+
+Safe to run repeatedly (e.g. nightly from cron); each batch is its own
+transaction, so an interrupted run just leaves less to do next time.
+"""
+from django.core.management.base import BaseCommand
+
+from pages import archive
+
+
+class Command(BaseCommand):
+    help = 'Archive processed applications and bookings of past events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--application-days', type=int, help='Default: ARCHIVE_APPLICATION_DAYS')
+        parser.add_argument('--booking-days', type=int, help='Default: ARCHIVE_BOOKING_DAYS')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would move')
+
+    def handle(self, *args, **options):
+        applications_days, bookings_days = options['application_days'], options['booking_days']
+        if options['dry_run']:
+            self.stdout.write(f'applications: {archive.cold_applications(applications_days).count()} would be archived')
+            self.stdout.write(f'bookings: {archive.cold_bookings(bookings_days).count()} would be archived')
+            return
+
+        moved = archive.archive_applications(applications_days, options['batch_size'])
+        self.stdout.write(f'applications: {moved} archived')
+        moved = archive.archive_bookings(bookings_days, options['batch_size'])
+        self.stdout.write(f'bookings: {moved} archived')
+        self.stdout.write(self.style.SUCCESS('Archiving complete'))
@@ -0,0 +1,22 @@
+"""
+Record possible duplicate applicants for review in the admin.
+
+    python manage.py find_duplicate_applications             # applications not checked yet
+    python manage.py find_duplicate_applications --rebuild   # re-key and recheck everything
+"""
+from django.core.management.base import BaseCommand
+
+from pages import dedup
+
+
+class Command(BaseCommand):
+    help = 'Find membership applications that are probably the same person'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=dedup.BATCH_SIZE)
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute blocking keys for every application (after changing the rules)')
+
+    def handle(self, *args, **options):
+        processed, found = dedup.find_duplicates(options['batch_size'], options['rebuild'])
+        self.stdout.write(f'{processed} application(s) checked, {found} candidate pair(s) recorded')
@@ -0,0 +1,180 @@
+"""
+Drive the site's URL set with concurrent clients and report latency per endpoint.
+
+    python manage.py runserver --noreload &     # or gunicorn -c core/gunicorn_conf.py
+    python manage.py loadtest --base-url http://127.0.0.1:8000 --requests 500 --concurrency 16 \
+        --save baseline.json
+    # ...make a change, restart the server...
+    python manage.py loadtest --base-url http://127.0.0.1:8000 --compare baseline.json
+
+Every parameterless route in ``pages.urls`` is exercised. Booking and review
+submission need a logged-in member, so they are skipped unless ``--session``
+supplies that member's session cookie; a matching CSRF cookie and header are
+generated automatically. Only 2xx and 3xx responses are timed; every other
+status counts as an error, kept per status code in the ``--save`` output.
+"""
+import http.client
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from pages import urls as page_urls
+from pages.models import Event
+
+# Writes that need an authenticated member and a valid CSRF token
+MEMBER_ONLY = {'book_event', 'submit_review'}
+
+
+def post_body(name):
+    """(content type, body) for endpoints that only accept POST, else None"""
+    if name == 'api_chat_message':
+        return 'application/json', json.dumps({'message': 'When is the next event?'}).encode()
+    if name == 'book_event':
+        event = Event.objects.filter(deadline__gte=timezone.now(), status='upcoming').order_by('date_time').first()
+        return 'application/json', json.dumps({'event_id': str(event.id) if event else ''}).encode()
+    if name == 'submit_review':
+        return 'application/x-www-form-urlencoded', urlencode({'rating': 5, 'comment': 'Load test review'}).encode()
+    return None
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(samples, errors, elapsed):
+    ordered = sorted(samples)
+    if not ordered:
+        return {'requests': 0, 'errors': errors}
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': len(ordered) / elapsed,
+        'p50': percentile(ordered, 50),
+        'p90': percentile(ordered, 90),
+        'p99': percentile(ordered, 99),
+        'mean': statistics.mean(ordered),
+        'max': ordered[-1],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Run a concurrent load test against the URLs in pages/urls.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--only', nargs='*', help='URL names to include')
+        parser.add_argument('--session', help='sessionid cookie of a member, enables member-only writes')
+        parser.add_argument('--save', help='Write the results to this JSON file')
+        parser.add_argument('--compare', help='Baseline JSON file from an earlier --save')
+
+    def handle(self, *args, **options):
+        base = urlsplit(options['base_url'])
+        self.host, self.port = base.hostname, base.port or 80
+        self.session = options['session']
+        self.csrf_token = get_random_string(32)
+
+        endpoints = self.endpoints(options['only'])
+        if not endpoints:
+            raise CommandError('No endpoints selected')
+
+        results = {}
+        for name, path, body in endpoints:
+            results[name] = self.run(path, body, options['requests'], options['concurrency'])
+
+        baseline = {}
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+        self.print_table(results, baseline)
+
+        if options['save']:
+            with open(options['save'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(f"Saved results to {options['save']}")
+
+    def endpoints(self, only):
+        selected = []
+        for pattern in page_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name or pattern.pattern.converters:
+                continue
+            name = pattern.name
+            if only and name not in only:
+                continue
+            if name in MEMBER_ONLY and not self.session:
+                continue
+            selected.append((name, reverse(name), post_body(name)))
+        return selected
+
+    def run(self, path, body, requests, concurrency):
+        method, payload, headers = 'GET', None, {}
+        if body:
+            method, payload = 'POST', body[1]
+            headers['Content-Type'] = body[0]
+        if self.session:
+            headers['Cookie'] = f'sessionid={self.session}; csrftoken={self.csrf_token}'
+            headers['X-CSRFToken'] = self.csrf_token
+
+        samples, errors = [], defaultdict(int)
+        lock = threading.Lock()
+        remaining = iter(range(requests))
+
+        def worker():
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        break
+                start = time.perf_counter()
+                try:
+                    connection.request(method, path, body=payload, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+                    status = 'connection'
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    # A 401/403/405 is a cheap refusal, not the page; timing it would flatter the percentiles
+                    if status == 'connection' or status >= 400:
+                        errors[str(status)] += 1
+                    else:
+                        samples.append(elapsed)
+            connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarize(samples, dict(errors), time.perf_counter() - start)
+
+    def print_table(self, results, baseline):
+        columns = ['rps', 'p50', 'p90', 'p99', 'max']
+        self.stdout.write(f"{'endpoint':<20}{'reqs':>7}{'errors':>8}" + ''.join(f'{c:>10}' for c in columns))
+        for name, result in results.items():
+            row = f"{name:<20}{result['requests']:>7}{sum(result['errors'].values()):>8}"
+            for column in columns:
+                row += f"{result.get(column, 0):>10.1f}"
+            self.stdout.write(row)
+
+            before = baseline.get(name)
+            if before and result['requests'] and before.get('requests'):
+                delta = ''.join(
+                    f"{(result[c] - before[c]) / before[c] * 100:>+9.0f}%" if before[c] else f"{'':>10}"
+                    for c in columns
+                )
+                self.stdout.write(f"{'  vs baseline':<35}{delta}")
+        self.stdout.write('Latencies in ms of 2xx/3xx responses; errors are 4xx/5xx responses and connection failures.')
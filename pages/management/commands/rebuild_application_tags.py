@@ -0,0 +1,23 @@
+"""
+Recreate the skill/language lookup rows from the applications' JSON lists.
+
+    python manage.py rebuild_application_tags
+
+They are kept in sync on every application save; run this after bulk
+imports or updates that skip model signals (``bulk_create``,
+``QuerySet.update()``, raw SQL).
+"""
+from django.core.management.base import BaseCommand
+
+from pages import skills
+
+
+class Command(BaseCommand):
+    help = 'Rebuild ApplicationTag from MembershipApplication.skills and .languages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = skills.rebuild(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{total} skill and language row(s) written'))
@@ -0,0 +1,22 @@
+"""
+Recount the community review summary from the review table.
+
+    python manage.py rebuild_review_summary
+
+The summary is maintained incrementally on every review save and delete;
+run this after bulk edits that skip model signals (``QuerySet.update()``,
+``bulk_create``, raw SQL) or if the totals are ever suspected to drift.
+"""
+from django.core.management.base import BaseCommand
+
+from pages.models import ReviewSummary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild ReviewSummary from the public community reviews'
+
+    def handle(self, *args, **options):
+        summary = ReviewSummary.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Review summary rebuilt: {summary.review_count} public reviews, average {summary.average}'
+        ))
@@ -0,0 +1,35 @@
+"""
+Move archived rows back into their hot table by id.
+
+    python manage.py restore_archived application 1234
+    python manage.py restore_archived booking 6f1c...
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from pages import archive
+from pages.models import ArchivedApplication, ArchivedBooking
+
+RESTORERS = {
+    'application': (ArchivedApplication, archive.restore_application),
+    'booking': (ArchivedBooking, archive.restore_booking),
+}
+
+
+class Command(BaseCommand):
+    help = 'Restore archived applications or bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(RESTORERS))
+        parser.add_argument('ids', nargs='+')
+
+    def handle(self, *args, **options):
+        archive_model, restore = RESTORERS[options['kind']]
+        for pk in options['ids']:
+            try:
+                restored = restore(pk)
+            except archive_model.DoesNotExist:
+                raise CommandError(f"No archived {options['kind']} with id {pk}")
+            except IntegrityError as exc:
+                raise CommandError(f"Could not restore {options['kind']} {pk}: {exc}")
+            self.stdout.write(f'Restored {restored}')
@@ -0,0 +1,40 @@
+"""
+Fill the DailyRollup analytics tables.
+
+    python manage.py rollup_daily                      # new complete days only
+    python manage.py rollup_daily --backfill           # recompute everything
+    python manage.py rollup_daily --backfill --since 2025-01-01 --metric applications
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from pages import rollups
+
+
+def day(value):
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = 'Roll application and booking counts up into daily aggregates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--metric', action='append', choices=sorted(rollups.METRICS),
+                            help='Limit to this metric (repeatable); default all')
+        parser.add_argument('--backfill', action='store_true', help='Recompute days already rolled up')
+        parser.add_argument('--since', type=day, help='First day to backfill (YYYY-MM-DD)')
+        parser.add_argument('--until', type=day, help='Last day to process; default yesterday')
+
+    def handle(self, *args, **options):
+        if options['since'] and not options['backfill']:
+            raise CommandError('--since only applies with --backfill')
+
+        for name in options['metric'] or rollups.METRICS:
+            if options['backfill']:
+                days = rollups.backfill(name, options['since'], options['until'])
+            else:
+                days = rollups.update(name, options['until'])
+            self.stdout.write(f'{name}: {days} day(s) rolled up')
@@ -0,0 +1,269 @@
+"""
+Generate a large, reproducible dataset for performance work.
+
+    python manage.py seed_scale --members 20000 --events 2000 \
+        --bookings 1000000 --applications 1000000 --reviews 5000
+
+The same ``--seed`` always produces the same rows. Seeded users are named
+``seed_member_<n>`` and seeded applicants use ``@seed.example`` addresses,
+which is how ``--clear`` finds them again.
+"""
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from pages import skills
+from pages.models import (
+    CommunityReview,
+    CustomUser,
+    Event,
+    EventBooking,
+    MembershipApplication,
+    ReviewSummary,
+)
+
+USERNAME_PREFIX = 'seed_member_'
+EMAIL_DOMAIN = 'seed.example'
+
+SKILLS = [
+    'Python', 'Django', 'JavaScript', 'Data Analysis', 'Graphic Design', 'Marketing',
+    'Public Speaking', 'Project Management', 'Accounting', 'Teaching', 'Photography', 'Agriculture',
+]
+LANGUAGES = ['Swahili', 'English', 'French', 'Arabic', 'Sukuma', 'Chaga']
+FIRST_NAMES = ['Amani', 'Baraka', 'Neema', 'Imani', 'Juma', 'Rehema', 'Faraji', 'Zawadi', 'Hamisi', 'Upendo']
+LAST_NAMES = ['Mwakyusa', 'Kimaro', 'Mushi', 'Lyimo', 'Massawe', 'Mollel', 'Shirima', 'Ndege', 'Mrema', 'Swai']
+COMMENTS = [
+    'The mentorship sessions changed how I approach my work.',
+    'Great events and a welcoming community.',
+    'I met my co-founder at a networking night here.',
+    'Workshops are practical and well organised.',
+    'Would love more events outside Dar es Salaam.',
+]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def choice_keys(choices):
+    return [key for key, _ in choices]
+
+
+@contextmanager
+def backdating(model, *field_names):
+    """Let bulk_create keep explicit values for auto_now/auto_now_add fields"""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible, large-scale dataset with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=1000)
+        parser.add_argument('--events', type=int, default=200)
+        parser.add_argument('--bookings', type=int, default=10000)
+        parser.add_argument('--applications', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=500)
+        parser.add_argument('--days', type=int, default=730, help='History window for timestamps')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded rows first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = options['days']
+
+        if options['bookings'] > options['members'] * options['events']:
+            raise CommandError('--bookings cannot exceed --members x --events (one booking per member per event)')
+        if options['reviews'] > options['members']:
+            raise CommandError('--reviews cannot exceed --members (one review per member)')
+
+        if options['clear']:
+            self.clear()
+        elif User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError('Seeded data already exists; pass --clear to replace it')
+
+        member_ids = self.create_members(options['members'])
+        event_ids = self.create_events(options['events'])
+        self.create_bookings(options['bookings'], event_ids, member_ids)
+        self.create_reviews(options['reviews'], member_ids)
+        self.create_applications(options['applications'])
+        # bulk_create skips the signals that keep these current
+        ReviewSummary.rebuild()
+        skills.rebuild()
+
+        self.stdout.write(self.style.SUCCESS('Seeding complete'))
+
+    def report(self, label, count):
+        self.stdout.write(f'  {label}: {count}')
+
+    def past(self):
+        return self.now - timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def clear(self):
+        # Bookings and reviews cascade from CustomUser; events are removed by title prefix
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        Event.objects.filter(title__startswith='[seed]').delete()
+        MembershipApplication.objects.filter(email__endswith='@' + EMAIL_DOMAIN).delete()
+        self.stdout.write('Cleared previously seeded rows')
+
+    def create_members(self, count):
+        users = (
+            User(
+                username=f'{USERNAME_PREFIX}{i}',
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'member{i}@{EMAIL_DOMAIN}',
+                password='!',  # unusable
+            )
+            for i in range(count)
+        )
+        self.bulk_create_in_transactions(User, users)
+
+        user_ids = User.objects.filter(username__startswith=USERNAME_PREFIX).values_list('id', flat=True)
+        profiles = (
+            CustomUser(
+                user_id=user_id,
+                is_community_member=self.rng.random() < 0.9,
+                is_admin=self.rng.random() < 0.002,
+                date_joined_community=self.past(),
+            )
+            for user_id in user_ids.order_by('id').iterator()
+        )
+        with backdating(CustomUser, 'date_joined_community'):
+            self.bulk_create_in_transactions(CustomUser, profiles)
+
+        self.report('members', count)
+        return list(
+            CustomUser.objects.filter(user__username__startswith=USERNAME_PREFIX)
+            .order_by('id').values_list('id', flat=True)
+        )
+
+    def create_events(self, count):
+        event_types = choice_keys(Event.EVENT_TYPE)
+        events = []
+        for i in range(count):
+            # Two thirds in the past, the rest spread over the next six months
+            if self.rng.random() < 0.66:
+                starts = self.past()
+            else:
+                starts = self.now + timedelta(hours=self.rng.randrange(1, 180 * 24))
+            created = starts - timedelta(days=self.rng.randrange(7, 90))
+            event_type = self.rng.choice(event_types)
+            events.append(Event(
+                title=f'[seed] {event_type.title()} #{i}',
+                description='Generated by seed_scale for performance testing.',
+                event_type=event_type,
+                date=starts.date(),
+                date_time=starts,
+                deadline=starts - timedelta(days=1),
+                location=self.rng.choice(choice_keys(MembershipApplication.REGION_CHOICES)).replace('-', ' ').title(),
+                is_online=self.rng.random() < 0.3,
+                max_participants=self.rng.choice([None, 30, 50, 100, 250, 1000]),
+                price=self.rng.choice([Decimal('0.00')] * 3 + [Decimal('5000.00'), Decimal('20000.00')]),
+                status='completed' if starts < self.now else 'upcoming',
+                created_at=created,
+                updated_at=created,
+            ))
+        with backdating(Event, 'created_at', 'updated_at'):
+            self.bulk_create_in_transactions(Event, events)
+
+        self.report('events', count)
+        return [event.id for event in events]
+
+    def create_bookings(self, count, event_ids, member_ids):
+        # Walk (event, member) pairs so every booking is unique without a lookup
+        statuses = ['confirmed'] * 7 + ['pending', 'cancelled', 'attended']
+        events = len(event_ids)
+        offset = self.rng.randrange(len(member_ids)) if member_ids else 0
+        bookings = (
+            EventBooking(
+                event_id=event_ids[i % events],
+                user_id=member_ids[(i // events + offset) % len(member_ids)],
+                status=self.rng.choice(statuses),
+                booked_at=self.past(),
+            )
+            for i in range(count)
+        )
+        with backdating(EventBooking, 'booked_at'):
+            self.bulk_create_in_transactions(EventBooking, bookings)
+        self.report('bookings', count)
+
+    def create_reviews(self, count, member_ids):
+        reviews = (
+            CommunityReview(
+                user_id=member_id,
+                rating=self.rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 8, 12])[0],
+                comment=self.rng.choice(COMMENTS),
+                is_public=self.rng.random() < 0.95,
+                created_at=(created := self.past()),
+                updated_at=created,
+            )
+            for member_id in self.rng.sample(member_ids, count)
+        )
+        with backdating(CommunityReview, 'created_at', 'updated_at'):
+            self.bulk_create_in_transactions(CommunityReview, reviews)
+        self.report('reviews', count)
+
+    def create_applications(self, count):
+        regions = choice_keys(MembershipApplication.REGION_CHOICES)
+        education = choice_keys(MembershipApplication.EDUCATION_CHOICES)
+        genders = choice_keys(MembershipApplication.GENDER_CHOICES)
+        referrals = choice_keys(MembershipApplication.REFERRAL_CHOICES)
+        statuses = ['pending'] * 3 + ['approved'] * 5 + ['rejected'] * 2
+
+        def application(i):
+            created = self.past()
+            return MembershipApplication(
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                email=f'applicant{i}@{EMAIL_DOMAIN}',
+                phone=f'+2557{self.rng.randrange(10**8):08d}',
+                date_of_birth=date(1970, 1, 1) + timedelta(days=self.rng.randrange(365 * 35)),
+                gender=self.rng.choice(genders),
+                id_number=f'SEED{i:010d}',
+                current_address='P.O. Box 1000',
+                region=self.rng.choice(regions),
+                district='Central',
+                education=self.rng.choice(education),
+                occupation='Generated applicant',
+                work_experience=[],
+                skills=self.rng.sample(SKILLS, self.rng.randrange(1, 5)),
+                languages=self.rng.sample(LANGUAGES, self.rng.randrange(1, 3)),
+                why_join='Generated by seed_scale.',
+                contribution='Generated by seed_scale.',
+                expectations='Generated by seed_scale.',
+                referral=self.rng.choice(referrals),
+                agree_terms=True,
+                status=self.rng.choice(statuses),
+                created_at=created,
+                updated_at=created,
+            )
+
+        with backdating(MembershipApplication, 'created_at', 'updated_at'):
+            self.bulk_create_in_transactions(MembershipApplication, (application(i) for i in range(count)))
+        self.report('applications', count)
+
+    def bulk_create_in_transactions(self, model, objects):
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
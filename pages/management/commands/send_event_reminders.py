@@ -0,0 +1,19 @@
+"""
+E-mail members about their events a day and an hour before they start.
+
+    python manage.py send_event_reminders    # from cron, every 5-10 minutes
+"""
+from django.core.management.base import BaseCommand
+
+from pages import reminders
+
+
+class Command(BaseCommand):
+    help = 'Send the event reminders that are due, each at most once per booking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=reminders.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        for kind, sent in reminders.send_due(batch_size=options['batch_size']).items():
+            self.stdout.write(f'{kind}: {sent} reminder(s) sent')
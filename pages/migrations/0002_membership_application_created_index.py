@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membershipapplication',
+            index=models.Index(fields=['-created_at'], name='application_created_idx'),
+        ),
+    ]
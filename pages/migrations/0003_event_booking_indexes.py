@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_membership_application_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventbooking',
+            index=models.Index(fields=['event', 'status'], name='booking_event_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventbooking',
+            index=models.Index(fields=['-booked_at'], name='booking_booked_at_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0003_event_booking_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_community_member', '-date_joined_community', '-id'], name='member_joined_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-created_at', '-id'], name='event_created_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membershipapplication',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='application_status_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:07
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_summary(apps, schema_editor):
+    CommunityReview = apps.get_model('pages', 'CommunityReview')
+    ReviewSummary = apps.get_model('pages', 'ReviewSummary')
+    counts = dict(
+        CommunityReview.objects.filter(is_public=True).order_by()
+        .values_list('rating').annotate(total=Count('pk'))
+    )
+    ReviewSummary.objects.create(
+        pk=1,
+        review_count=sum(counts.values()),
+        rating_total=sum(rating * total for rating, total in counts.items()),
+        **{f'stars_{stars}': counts.get(stars, 0) for stars in range(1, 6)},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0005_event_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.PositiveIntegerField(default=0)),
+                ('stars_1', models.PositiveIntegerField(default=0)),
+                ('stars_2', models.PositiveIntegerField(default=0)),
+                ('stars_3', models.PositiveIntegerField(default=0)),
+                ('stars_4', models.PositiveIntegerField(default=0)),
+                ('stars_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Review summary',
+            },
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0006_review_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('payload', models.BinaryField(help_text='zlib-compressed JSON of the serialized row')),
+                ('id', models.BigIntegerField(help_text='Original MembershipApplication id', primary_key=True, serialize=False)),
+                ('email', models.EmailField(db_index=True, max_length=254)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('payload', models.BinaryField(help_text='zlib-compressed JSON of the serialized row')),
+                ('id', models.UUIDField(help_text='Original EventBooking id', primary_key=True, serialize=False)),
+                ('event_id', models.UUIDField(db_index=True)),
+                ('user_id', models.BigIntegerField(db_index=True)),
+                ('status', models.CharField(max_length=20)),
+                ('booked_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-booked_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='membershipapplication',
+            index=models.Index(fields=['status', 'updated_at'], name='application_status_updated_idx'),
+        ),
+    ]
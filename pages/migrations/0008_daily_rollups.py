@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0007_archive_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('metric', models.CharField(max_length=30, primary_key=True, serialize=False)),
+                ('through_day', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('dimension', models.CharField(max_length=30)),
+                ('value', models.CharField(blank=True, max_length=50)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['metric', 'dimension', 'day', 'value'],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'dimension', 'day', 'value'), name='daily_rollup_unique')],
+            },
+        ),
+    ]
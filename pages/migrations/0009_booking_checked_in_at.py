@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0008_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventbooking',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0009_booking_checked_in_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationBlockingKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('phone', 'Phone'), ('name_dob', 'Name and date of birth'), ('id_number', 'ID number')], max_length=10)),
+                ('key', models.BigIntegerField(db_index=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocking_keys', to='pages.membershipapplication')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('application', 'key'), name='blocking_key_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reasons', models.CharField(help_text='Comma-separated blocking key kinds that matched', max_length=50)),
+                ('score', models.PositiveSmallIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending review'), ('duplicate', 'Duplicate'), ('distinct', 'Different people')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('first', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pages.membershipapplication')),
+                ('second', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pages.membershipapplication')),
+            ],
+            options={
+                'ordering': ['-score', '-created_at'],
+                'indexes': [models.Index(fields=['status', '-score', '-created_at'], name='duplicate_review_idx')],
+                'constraints': [models.UniqueConstraint(fields=('first', 'second'), name='duplicate_candidate_unique'), models.CheckConstraint(condition=models.Q(('first__lt', models.F('second'))), name='duplicate_candidate_ordered')],
+            },
+        ),
+    ]
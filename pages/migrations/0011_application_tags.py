@@ -0,0 +1,53 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def entries(value):
+    # As pages.skills.entries: a list as is, a bare string as one entry, anything else as none
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return value
+    return []
+
+
+def backfill_tags(apps, schema_editor):
+    MembershipApplication = apps.get_model('pages', 'MembershipApplication')
+    ApplicationTag = apps.get_model('pages', 'ApplicationTag')
+    tags = []
+    for application in MembershipApplication.objects.only('skills', 'languages').iterator(chunk_size=2000):
+        for kind, stored in (('skill', application.skills), ('language', application.languages)):
+            values = {' '.join(entry.split()).casefold()[:100] for entry in entries(stored) if isinstance(entry, str) and entry.strip()}
+            tags += [ApplicationTag(application_id=application.pk, kind=kind, value=value) for value in values]
+        if len(tags) >= 5000:
+            ApplicationTag.objects.bulk_create(tags)
+            tags = []
+    ApplicationTag.objects.bulk_create(tags)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0010_duplicate_candidates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('skill', 'Skill'), ('language', 'Language')], max_length=10)),
+                ('value', models.CharField(help_text='Lowercased, whitespace-collapsed', max_length=100)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='pages.membershipapplication')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'value', 'application'), name='application_tag_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='membershipapplication',
+            index=models.Index(fields=['status', 'region'], name='application_status_region_idx'),
+        ),
+    ]
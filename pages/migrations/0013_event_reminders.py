@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0012_request_profiles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('day', 'A day before'), ('hour', 'An hour before')], max_length=10)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'date_time'], name='event_status_start_idx'),
+        ),
+        migrations.AddField(
+            model_name='eventreminder',
+            name='booking',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='pages.eventbooking'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventreminder',
+            constraint=models.UniqueConstraint(fields=('booking', 'kind'), name='event_reminder_unique'),
+        ),
+    ]
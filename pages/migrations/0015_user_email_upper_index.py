@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:05
+
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+# The admin's exact e-mail search ('=user__email') is a case-insensitive
+# match, UPPER(email) = UPPER(%s); auth_user.email has no index of its own.
+EMAIL_INDEX = models.Index(Upper('email'), name='auth_user_email_upper_idx')
+
+
+def add_email_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model('auth', 'User'), EMAIL_INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model('auth', 'User'), EMAIL_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('pages', '0014_review_queue_claims'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
@@ -1,10 +1,15 @@
 # models.py
-from django.db import models
+import uuid
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.validators import RegexValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
 from django.utils import timezone
-import json
-from django.conf import settings
+
+from core import metrics
 
 class MembershipApplication(models.Model):
     GENDER_CHOICES = [
@@ -78,6 +83,10 @@ class MembershipApplication(models.Model):
     agree_terms = models.BooleanField(default=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     
+    # Review queue lease (pages/review_queue.py); a lapsed lease is the same as none
+    claimed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    claim_expires_at = models.DateTimeField(null=True, blank=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -85,6 +94,18 @@ class MembershipApplication(models.Model):
     class Meta:
         db_table = 'membership_applications'
         ordering = ['-created_at']
+        indexes = [
+            # Default ordering of the admin changelist
+            models.Index(fields=['-created_at'], name='application_created_idx'),
+            # Keyset pages of pending applications in the admin members view
+            models.Index(fields=['status', '-created_at', '-id'], name='application_status_keyset_idx'),
+            # Processed applications past retention, for pages/archive.py
+            models.Index(fields=['status', 'updated_at'], name='application_status_updated_idx'),
+            # Staff applicant search (pages/api.py) narrows by status and region first
+            models.Index(fields=['status', 'region'], name='application_status_region_idx'),
+            # Review queue: oldest pending first; stays as small as the backlog, not the table
+            models.Index(fields=['created_at'], condition=models.Q(status='pending'), name='application_pending_queue_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.email}"
@@ -113,14 +134,6 @@ class MembershipApplication(models.Model):
         return None
 
 
-# models.py
-from django.db import models
-from django.contrib.auth.models import User
-from django.core.validators import MinValueValidator, MaxValueValidator
-from django.utils import timezone
-from django.db.models import Avg
-import uuid
-
 class Event(models.Model):
     EVENT_STATUS = [
         ('upcoming', 'Upcoming'),
@@ -158,6 +171,15 @@ class Event(models.Model):
     
     class Meta:
         ordering = ['date_time']
+        indexes = [
+            # Keyset pages in the admin events view
+            models.Index(fields=['-created_at', '-id'], name='event_created_keyset_idx'),
+            # Event search: the upcoming set by deadline, and per-type result pages by date
+            models.Index(fields=['status', 'deadline'], name='event_status_deadline_idx'),
+            models.Index(fields=['status', 'event_type', 'date_time', 'id'], name='event_type_date_idx'),
+            # Reminder windows: upcoming events starting soon
+            models.Index(fields=['status', 'date_time'], name='event_status_start_idx'),
+        ]
         
     def __str__(self):
         return self.title
@@ -169,7 +191,10 @@ class Event(models.Model):
     @property
     def spots_remaining(self):
         if self.max_participants:
-            booked = self.bookings.filter(status='confirmed').count()
+            # Listing views annotate confirmed_count to avoid a COUNT per event
+            booked = getattr(self, 'confirmed_count', None)
+            if booked is None:
+                booked = self.bookings.filter(status='confirmed').count()
             return max(0, self.max_participants - booked)
         return None
     
@@ -193,6 +218,15 @@ class CustomUser(models.Model):
     is_community_member = models.BooleanField(default=False)
     is_admin = models.BooleanField(default=False)
     
+    class Meta:
+        indexes = [
+            # Keyset pages of community members in the admin members view
+            models.Index(
+                fields=['is_community_member', '-date_joined_community', '-id'],
+                name='member_joined_keyset_idx',
+            ),
+        ]
+    
     def __str__(self):
         return f"{self.user.first_name} {self.user.last_name}"
     
@@ -213,15 +247,42 @@ class EventBooking(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='bookings')
     status = models.CharField(max_length=20, choices=BOOKING_STATUS, default='confirmed')
     booked_at = models.DateTimeField(auto_now_add=True)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(blank=True, help_text="Additional notes or requirements")
     
     class Meta:
         unique_together = ['event', 'user']
         ordering = ['-booked_at']
+        indexes = [
+            # Per-event capacity counts by status, and the newest-first booking lists
+            models.Index(fields=['event', 'status'], name='booking_event_status_idx'),
+            models.Index(fields=['-booked_at'], name='booking_booked_at_idx'),
+        ]
         
     def __str__(self):
         return f"{self.user.full_name} - {self.event.title}"
 
+class EventReminder(models.Model):
+    """A reminder e-mailed for a booking, so pages/reminders.py never sends one twice"""
+    DAY = 'day'
+    HOUR = 'hour'
+    KIND_CHOICES = [
+        (DAY, 'A day before'),
+        (HOUR, 'An hour before'),
+    ]
+    
+    booking = models.ForeignKey(EventBooking, on_delete=models.CASCADE, related_name='reminders')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    sent_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['booking', 'kind'], name='event_reminder_unique'),
+        ]
+        
+    def __str__(self):
+        return f"{self.get_kind_display()} reminder for booking {self.booking_id}"
+
 class CommunityReview(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='reviews')
@@ -240,6 +301,16 @@ class CommunityReview(models.Model):
         
     def __str__(self):
         return f"{self.user.full_name} - {self.rating} stars"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What ReviewSummary currently counts for this row, so a save can apply the difference
+        if 'rating' in instance.__dict__ and 'is_public' in instance.__dict__:
+            instance._counted_rating = instance.rating if instance.is_public else None
+        else:
+            instance._counted_rating = ReviewSummary.UNKNOWN
+        return instance
 
 class TeamMember(models.Model):
     POSITION_CHOICES = [
@@ -289,15 +360,276 @@ class CommunityStats(models.Model):
         
         # Update stats if they're older than 1 hour
         if (timezone.now() - stats.last_updated).seconds > 3600 or created:
-            stats.active_members = CustomUser.objects.filter(is_community_member=True).count()
-            stats.total_events = Event.objects.filter(
-                created_at__year=timezone.now().year
-            ).count()
-            # You can add logic for mentorship pairs and active projects
-            stats.save()
+            with metrics.STATS_REFRESH_SECONDS.time():
+                stats.active_members = CustomUser.objects.filter(is_community_member=True).count()
+                stats.total_events = Event.objects.filter(
+                    created_at__year=timezone.now().year
+                ).count()
+                # You can add logic for mentorship pairs and active projects
+                stats.save()
             
         return stats
 
+class ArchivedRecord(models.Model):
+    """
+    Cold storage for rows moved out of a hot table by pages/archive.py: a few
+    columns to find the row again, and the full serialized row compressed.
+    """
+    archived_at = models.DateTimeField(auto_now_add=True)
+    payload = models.BinaryField(help_text="zlib-compressed JSON of the serialized row")
+    
+    class Meta:
+        abstract = True
+
+class ArchivedApplication(ArchivedRecord):
+    id = models.BigIntegerField(primary_key=True, help_text="Original MembershipApplication id")
+    email = models.EmailField(db_index=True)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-created_at']
+        
+    def __str__(self):
+        return f"{self.email} ({self.status}, archived)"
+
+class ArchivedBooking(ArchivedRecord):
+    id = models.UUIDField(primary_key=True, help_text="Original EventBooking id")
+    # Plain ids rather than foreign keys: the event or member may be deleted later
+    event_id = models.UUIDField(db_index=True)
+    user_id = models.BigIntegerField(db_index=True)
+    status = models.CharField(max_length=20)
+    booked_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-booked_at']
+        
+    def __str__(self):
+        return f"Booking {self.id} ({self.status}, archived)"
+
+class DailyRollup(models.Model):
+    """
+    Rows per day for one metric broken down by one dimension, e.g.
+    applications on 2025-03-01 with region=arusha. Filled by pages/rollups.py
+    so analytics never group the raw tables.
+    """
+    metric = models.CharField(max_length=30)
+    dimension = models.CharField(max_length=30)
+    value = models.CharField(max_length=50, blank=True)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['metric', 'dimension', 'day', 'value']
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'dimension', 'day', 'value'], name='daily_rollup_unique'),
+        ]
+        
+    def __str__(self):
+        return f"{self.metric} {self.dimension}={self.value} on {self.day}: {self.count}"
+
+class RollupState(models.Model):
+    """Last day each metric has been rolled up through"""
+    metric = models.CharField(max_length=30, primary_key=True)
+    through_day = models.DateField()
+    
+    def __str__(self):
+        return f"{self.metric} through {self.through_day}"
+
+class ReviewSummary(models.Model):
+    """
+    Running totals over public reviews: count, rating sum and a per-star
+    histogram. Kept current by the CommunityReview signals in pages/signals.py,
+    so pages read one row instead of aggregating the review table.
+    """
+    UNKNOWN = object()
+    STARS = range(5, 0, -1)
+    
+    review_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Review summary"
+        
+    def __str__(self):
+        return f"{self.average} from {self.review_count} reviews"
+    
+    @property
+    def average(self):
+        return round(self.rating_total / self.review_count, 1) if self.review_count else None
+    
+    @property
+    def histogram(self):
+        """(stars, count, percent of reviews) from 5 stars down to 1"""
+        return [
+            (stars, getattr(self, f'stars_{stars}'),
+             round(getattr(self, f'stars_{stars}') * 100 / self.review_count) if self.review_count else 0)
+            for stars in self.STARS
+        ]
+    
+    @classmethod
+    def get_current(cls):
+        summary = cls.objects.filter(pk=1).first()
+        return summary or cls.rebuild()
+    
+    @classmethod
+    def rebuild(cls):
+        """Recount every public review from scratch"""
+        counts = dict(
+            CommunityReview.objects.filter(is_public=True).order_by()
+            .values_list('rating').annotate(total=Count('pk'))
+        )
+        summary, _ = cls.objects.update_or_create(pk=1, defaults={
+            'review_count': sum(counts.values()),
+            'rating_total': sum(rating * total for rating, total in counts.items()),
+            **{f'stars_{stars}': counts.get(stars, 0) for stars in cls.STARS},
+        })
+        return summary
+    
+    @classmethod
+    def changes(cls, removed, added):
+        """The UPDATE for ``record_change``; every delta is one integer, since Postgres can't add a boolean"""
+        count = int(added is not None) - int(removed is not None)
+        rating = (added or 0) - (removed or 0)
+        # Clamped: a summary that has drifted to 0 would otherwise fail the unsigned CHECK mid-request
+        changes = {
+            'updated_at': timezone.now(),
+            'review_count': Greatest(F('review_count') + Value(count), Value(0)),
+            'rating_total': Greatest(F('rating_total') + Value(rating), Value(0)),
+        }
+        if removed is not None:
+            changes[f'stars_{removed}'] = Greatest(F(f'stars_{removed}') - Value(1), Value(0))
+        if added is not None:
+            changes[f'stars_{added}'] = F(f'stars_{added}') + Value(1)
+        return changes
+    
+    @classmethod
+    def record_change(cls, removed=None, added=None):
+        """
+        Move one review out of the ``removed`` star bucket and into ``added``;
+        None stands for "not counted" (new, deleted or hidden reviews).
+        """
+        if removed is cls.UNKNOWN:
+            cls.rebuild()
+            return
+        if removed == added:
+            return
+        if not cls.objects.filter(pk=1).update(**cls.changes(removed, added)):
+            # First review ever, or the row was deleted: start from the table
+            cls.rebuild()
+
+class ApplicationTag(models.Model):
+    """
+    One skill or language of an application, normalized, so "speaks Swahili
+    and knows Python" is an index lookup instead of decoding every row's
+    JSON. Kept in sync with the JSON lists by pages/skills.py.
+    """
+    SKILL = 'skill'
+    LANGUAGE = 'language'
+    KIND_CHOICES = [
+        (SKILL, 'Skill'),
+        (LANGUAGE, 'Language'),
+    ]
+    
+    application = models.ForeignKey(MembershipApplication, on_delete=models.CASCADE, related_name='tags')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100, help_text="Lowercased, whitespace-collapsed")
+    
+    class Meta:
+        constraints = [
+            # Also the index for "applications with this skill"
+            models.UniqueConstraint(fields=['kind', 'value', 'application'], name='application_tag_unique'),
+        ]
+        
+    def __str__(self):
+        return f"{self.kind}: {self.value}"
+
+class ApplicationBlockingKey(models.Model):
+    """
+    One blocking key of an application (pages/dedup.py). Applications that
+    share a key are compared; the key is a 64-bit hash of the normalized value.
+    """
+    PHONE = 'phone'
+    NAME_DOB = 'name_dob'
+    ID_NUMBER = 'id_number'
+    KIND_CHOICES = [
+        (PHONE, 'Phone'),
+        (NAME_DOB, 'Name and date of birth'),
+        (ID_NUMBER, 'ID number'),
+    ]
+    # The application fields keys are made from; saving only others never re-keys
+    SOURCE_FIELDS = ('first_name', 'last_name', 'date_of_birth', 'phone', 'id_number')
+    
+    application = models.ForeignKey(MembershipApplication, on_delete=models.CASCADE, related_name='blocking_keys')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.BigIntegerField(db_index=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['application', 'key'], name='blocking_key_unique'),
+        ]
+        
+    def __str__(self):
+        return f"{self.kind} key of application {self.application_id}"
+
+class DuplicateCandidate(models.Model):
+    """A pair of applications that may be the same person, for review in the admin"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending review'),
+        ('duplicate', 'Duplicate'),
+        ('distinct', 'Different people'),
+    ]
+    
+    # first is always the older application
+    first = models.ForeignKey(MembershipApplication, on_delete=models.CASCADE, related_name='+')
+    second = models.ForeignKey(MembershipApplication, on_delete=models.CASCADE, related_name='+')
+    reasons = models.CharField(max_length=50, help_text="Comma-separated blocking key kinds that matched")
+    score = models.PositiveSmallIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-score', '-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['first', 'second'], name='duplicate_candidate_unique'),
+            models.CheckConstraint(condition=models.Q(first__lt=F('second')), name='duplicate_candidate_ordered'),
+        ]
+        indexes = [
+            # The admin review queue: pending pairs, strongest first
+            models.Index(fields=['status', '-score', '-created_at'], name='duplicate_review_idx'),
+        ]
+        
+    def __str__(self):
+        return f"Applications {self.first_id} and {self.second_id} ({self.reasons})"
+
+class RequestProfile(models.Model):
+    """One request sampled by pages/profiling.py at a site admin's request"""
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(User, null=True, on_delete=models.SET_NULL, related_name='+')
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True, help_text="URL name of the view that served it")
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField(default=0)
+    db_ms = models.FloatField(default=0)
+    interval_ms = models.FloatField(help_text="Time between stack samples")
+    sample_count = models.PositiveIntegerField(default=0)
+    stacks = models.BinaryField(help_text="zlib-compressed folded stacks, one 'frame;frame;frame count' per line")
+    
+    class Meta:
+        ordering = ['-created_at']
+        
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
 # Management command to clean expired events
 # Create this in management/commands/clean_expired_events.py
 """
@@ -0,0 +1,266 @@
+"""
+On-demand sampling profiler for single requests, for staff.
+
+A site admin adds ``?_profile=<token>`` or an ``X-Profile-Token`` header to
+any URL. The token comes from the Request profiles page in the admin; it is
+signed for that user and expires after ``PROFILE_TOKEN_MAX_AGE`` seconds.
+That one request then runs with a sampler thread that records the request
+thread's stack every ``PROFILE_SAMPLE_INTERVAL_MS``. Nothing is traced
+between samples, and the samples are wall-clock, so time spent waiting on
+the database shows up too. Under ASGI, a sync view is sampled on the
+thread asgiref runs it on, and async code only while this request's
+coroutine is running on the event loop; time spent awaiting isn't counted.
+
+The stacks are stored as a ``RequestProfile`` in the folded format that
+flamegraph.pl and speedscope read (``frame;frame;frame count``). Only the
+newest ``PROFILE_RETENTION_COUNT`` profiles, none older than
+``PROFILE_RETENTION_DAYS``, are kept. The response's ``X-Profile`` header
+links to the stored profile.
+
+Requests without a token pay for one lookup in the query string and one in
+the headers.
+"""
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+from asgiref.sync import AsyncToSync, SyncToAsync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils import timezone
+
+from core import instrumentation
+
+from .auth import is_site_admin
+from .models import RequestProfile
+
+TOKEN_SALT = 'pages.profiling'
+QUERY_PARAMETER = '_profile'
+HEADER = 'X-Profile-Token'
+
+_LIBRARY_DIRS = ('site-packages/', 'dist-packages/')
+
+
+def profile_token(user):
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def _token(request):
+    return request.GET.get(QUERY_PARAMETER) or request.headers.get(HEADER)
+
+
+def wants_profile(request):
+    """Whether the request carries a current token issued to its own user, who is a site admin"""
+    token = _token(request)
+    if not token or not request.user.is_authenticated:
+        return False
+    try:
+        user_id = signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return user_id == str(request.user.pk) and is_site_admin(request)
+
+
+def _frame_name(code):
+    filename = code.co_filename
+    for marker in _LIBRARY_DIRS:
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    else:
+        path = Path(filename)
+        if path.is_relative_to(settings.BASE_DIR):
+            filename = str(path.relative_to(settings.BASE_DIR))
+    return f'{code.co_qualname} ({filename}:{code.co_firstlineno})'.replace(';', ',')
+
+
+class Sampler:
+    """
+    Record one thread's stack every ``interval`` seconds from a thread of
+    its own, as folded stacks. Frames from ``root`` (a code object) outwards
+    are left out, so stacks start where the profiled call does; with a root,
+    samples taken while it isn't on the stack are dropped. ``watch()`` adds
+    another thread to sample the same way, except that samples caught in
+    ``parked`` (a code object) above the root, waiting on another thread, are
+    dropped too.
+    """
+
+    def __init__(self, thread_id, interval, root=None):
+        self.interval = interval
+        self.threads = {thread_id: (root, None)}
+        self.stacks = Counter()
+        self._names = {}
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._thread.join()
+
+    def watch(self, thread_id, root=None, parked=None):
+        self.threads = {**self.threads, thread_id: (root, parked)}
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, (root, parked) in self.threads.items():
+                frame = frames.get(thread_id)
+                stack = self._stack(frame, root, parked) if frame is not None else None
+                if stack:
+                    self.stacks[stack] += 1
+
+    def _stack(self, frame, root, parked=None):
+        names = []
+        while frame is not None and frame.f_code is not root:
+            code = frame.f_code
+            if code is parked:
+                return None
+            name = self._names.get(code)
+            if name is None:
+                name = self._names[code] = _frame_name(code)
+            names.append(name)
+            frame = frame.f_back
+        if root is not None and frame is None:
+            return None  # the profiled call wasn't running on this thread
+        return ';'.join(reversed(names))
+
+
+def folded(stacks):
+    return '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common())
+
+
+def load_stacks(profile):
+    stacks = Counter()
+    for line in zlib.decompress(bytes(profile.stacks)).decode().splitlines():
+        stack, _, count = line.rpartition(' ')
+        stacks[stack] = int(count)
+    return stacks
+
+
+def hot_functions(stacks, limit=25):
+    """[(frame, self samples, total samples)], the frames most often on top of the stack first"""
+    own, total = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return [(frame, samples, total[frame]) for frame, samples in own.most_common(limit)]
+
+
+def call_tree(stacks):
+    """Nested ``{frame: [samples, children]}`` for drawing a flame graph"""
+    tree = {}
+    for stack, count in stacks.items():
+        level = tree
+        for frame in stack.split(';'):
+            node = level.setdefault(frame, [0, {}])
+            node[0] += count
+            level = node[1]
+    return tree
+
+
+def prune():
+    """Apply the retention limits"""
+    RequestProfile.objects.filter(
+        created_at__lt=timezone.now() - timedelta(days=settings.PROFILE_RETENTION_DAYS)
+    ).delete()
+    keep = settings.PROFILE_RETENTION_COUNT
+    oldest_kept = RequestProfile.objects.order_by('-pk').values_list('pk', flat=True)[keep - 1:keep]
+    RequestProfile.objects.filter(pk__lt=oldest_kept).delete()
+
+
+def _path(request):
+    """The request's path and query string, without the token"""
+    query = request.GET.copy()
+    query.pop(QUERY_PARAMETER, None)
+    return f'{request.path}?{query.urlencode()}' if query else request.path
+
+
+def save_profile(request, response, sampler, counter, duration):
+    match = getattr(request, 'resolver_match', None)
+    profile = RequestProfile.objects.create(
+        user=request.user,
+        method=request.method,
+        path=_path(request)[:500],
+        view=match.view_name if match else '',
+        status_code=response.status_code,
+        duration_ms=duration * 1000,
+        query_count=counter.count,
+        db_ms=counter.duration * 1000,
+        interval_ms=sampler.interval * 1000,
+        sample_count=sum(sampler.stacks.values()),
+        stacks=zlib.compress(folded(sampler.stacks).encode(), 9),
+    )
+    prune()
+    return profile
+
+
+class ProfilerMiddleware:
+    """Profile the requests that ask for it with a valid token; see the module docstring"""
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not _token(request) or not wants_profile(request):
+            return self.get_response(request)
+        sampler, counter, token, start = self._start(self._profiled_call)
+        try:
+            with sampler:
+                response = self._profiled_call(request)
+        finally:
+            instrumentation.stop_recording(token)
+        return self._finish(request, response, sampler, counter, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not _token(request) or not await sync_to_async(wants_profile)(request):
+            return await self.get_response(request)
+        # On the event loop thread, samples only count while this request's coroutine is running.
+        # A sync view runs on the request's thread-sensitive executor thread; find it and sample that
+        # too, except while sync middleware on it is waiting for the coroutine.
+        sampler, counter, token, start = self._start(self.__acall__)
+        sampler.watch(
+            await sync_to_async(threading.get_ident)(),
+            SyncToAsync.thread_handler.__code__,
+            AsyncToSync.__call__.__code__,
+        )
+        try:
+            with sampler:
+                response = await self.get_response(request)
+        finally:
+            instrumentation.stop_recording(token)
+        profile = await sync_to_async(save_profile)(request, response, sampler, counter, time.perf_counter() - start)
+        return self._link(response, profile)
+
+    def _profiled_call(self, request):
+        return self.get_response(request)
+
+    def _start(self, root):
+        instrumentation.install_on_open_connections()
+        counter, token = instrumentation.start_counting()
+        sampler = Sampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_MS / 1000, root.__code__)
+        return sampler, counter, token, time.perf_counter()
+
+    def _finish(self, request, response, sampler, counter, duration):
+        return self._link(response, save_profile(request, response, sampler, counter, duration))
+
+    def _link(self, response, profile):
+        response['X-Profile'] = reverse('admin:pages_requestprofile_change', args=[profile.pk])
+        return response
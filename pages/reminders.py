@@ -0,0 +1,132 @@
+"""
+E-mail reminders before events, for members with a confirmed booking.
+
+Two reminders per booking: ``day`` for events starting in one to 24 hours,
+and ``hour`` for events starting within the hour. A booking made at the last
+minute only gets the hour reminder. Each run finds the due bookings with one
+time-window query per batch (``event_status_start_idx``, then
+``booking_event_status_idx`` per event). Each sent reminder is recorded as
+an ``EventReminder``, and bookings that already have one are left out, so
+reruns never send twice. Overlapping runs skip each other's locked batches.
+
+Each batch is recorded in a short transaction, which only holds the row
+locks for the select and the insert, and is then sent one message at a
+time over a single SMTP connection for the whole run. When a send fails,
+the records of that message and the rest of the batch are deleted before
+the error is raised, so the next run retries exactly the ones that never
+went out; those that did are not sent again. A process killed mid-batch
+leaves the batch's remaining reminders recorded but unsent: delivery is at
+most once. Run ``python manage.py send_event_reminders`` from cron every
+few minutes.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import checkin
+from .models import EventBooking, EventReminder
+
+BATCH_SIZE = 500
+
+# kind -> (start, end): events starting after now + start, up to now + end
+WINDOWS = {
+    EventReminder.HOUR: (timedelta(0), timedelta(hours=1)),
+    EventReminder.DAY: (timedelta(hours=1), timedelta(hours=24)),
+}
+
+SUBJECT = 'Reminder: {title}, {when:%a %d %b at %H:%M}'
+BODY = """Hi {name},
+
+This is a reminder that {title} starts on {when:%A %d %B at %H:%M}.
+
+Where: {where}
+Check-in code: {ticket}
+
+Show this code at the door. See you there!
+Vision Hub Tanzania
+"""
+
+
+def due(kind, now=None):
+    """Confirmed bookings for events in the ``kind`` window that have no ``kind`` reminder yet"""
+    now = now or timezone.now()
+    start, end = WINDOWS[kind]
+    return (
+        EventBooking.objects.filter(
+            status='confirmed',
+            event__status='upcoming',
+            event__date_time__gt=now + start,
+            event__date_time__lte=now + end,
+        )
+        .exclude(user__user__email='')
+        .filter(~Exists(EventReminder.objects.filter(booking=OuterRef('pk'), kind=kind)))
+        .select_related('event', 'user__user')
+        .only(
+            'event__title', 'event__date_time', 'event__location', 'event__is_online',
+            'user__user__email', 'user__user__first_name', 'user__user__username',
+        )
+        .order_by('pk')
+    )
+
+
+def message(booking):
+    event, user = booking.event, booking.user.user
+    when = timezone.localtime(event.date_time)
+    return EmailMessage(
+        subject=SUBJECT.format(title=event.title, when=when),
+        body=BODY.format(
+            name=user.first_name or user.username,
+            title=event.title,
+            when=when,
+            where='Online' if event.is_online else event.location,
+            ticket=checkin.checkin_token(booking),
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+
+
+def send_reminders(kind, connection, now=None, batch_size=BATCH_SIZE):
+    """Send every due ``kind`` reminder over ``connection``; returns how many were sent"""
+    sent, after = 0, None
+    while True:
+        bookings = due(kind, now)
+        if after is not None:
+            # Keyset on pk so each batch starts where the last ended instead of rechecking it
+            bookings = bookings.filter(pk__gt=after)
+        with transaction.atomic():
+            # An overlapping run skips the bookings this one is recording instead of waiting for them
+            batch = list(bookings.select_for_update(skip_locked=True, of=('self',))[:batch_size])
+            if not batch:
+                return sent
+            # Recorded before sending, so once this commits no other run picks them up
+            EventReminder.objects.bulk_create([EventReminder(booking=booking, kind=kind) for booking in batch])
+        # Opens on the first batch and stays open; backends close per call otherwise
+        connection.open()
+        _send(batch, kind, connection)
+        sent += len(batch)
+        after = batch[-1].pk
+
+
+def _send(batch, kind, connection):
+    """Send one message per booking; on a failure, forget the reminders that didn't go out and re-raise"""
+    for index, booking in enumerate(batch):
+        try:
+            connection.send_messages([message(booking)])
+        except Exception:
+            EventReminder.objects.filter(booking__in=[unsent.pk for unsent in batch[index:]], kind=kind).delete()
+            raise
+
+
+def send_due(now=None, batch_size=BATCH_SIZE):
+    """Send every due reminder, the most urgent kind first; returns {kind: sent}"""
+    now = now or timezone.now()
+    connection = get_connection()
+    try:
+        return {kind: send_reminders(kind, connection, now, batch_size) for kind in WINDOWS}
+    finally:
+        connection.close()
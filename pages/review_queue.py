@@ -0,0 +1,151 @@
+"""
+Work queue for staff reviewing membership applications.
+
+Each reviewer claims the oldest pending applications for themselves, with a
+lease of ``REVIEW_LEASE_SECONDS``. Claiming again refreshes the reviewer's
+current leases and tops them up to the count asked for. Claiming locks
+candidate rows with ``SELECT ... FOR UPDATE SKIP LOCKED``, so reviewers
+claiming at the same moment each get different applications instead of
+waiting on one another. The queue is read in ``application_pending_queue_idx``
+order, and the only rows passed over are ones other reviewers hold, so a
+claim costs the same however long the backlog grows.
+
+A lease is just a time: a reviewer who walks away loses their applications
+to the next claim once it passes, and no sweeper job is needed. Deciding is
+one conditional UPDATE that only matches while the reviewer's own lease is
+current, so an application is never decided by two people.
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from core.responses import FastJsonResponse
+
+from .auth import is_site_admin
+from .models import MembershipApplication
+
+DEFAULT_CLAIM = 5
+MAX_CLAIM = 20
+DECISIONS = ('approved', 'rejected')
+
+ROW_FIELDS = ('id', 'first_name', 'last_name', 'email', 'region', 'occupation', 'created_at', 'claim_expires_at')
+
+
+def available(now):
+    """Pending applications nobody holds a current lease on, oldest first"""
+    return (
+        MembershipApplication.objects.filter(status='pending')
+        .filter(Q(claim_expires_at__isnull=True) | Q(claim_expires_at__lte=now))
+        .order_by('created_at', 'pk')
+    )
+
+
+def claimed(user, now=None):
+    """The pending applications ``user`` currently holds, oldest first"""
+    now = now or timezone.now()
+    return MembershipApplication.objects.filter(
+        status='pending', claimed_by=user, claim_expires_at__gt=now,
+    ).order_by('created_at', 'pk')
+
+
+def claim(user, count=DEFAULT_CLAIM, now=None):
+    """
+    Refresh ``user``'s leases and claim more applications until they hold
+    ``count`` (at most ``MAX_CLAIM``); returns what they hold now.
+    """
+    now = now or timezone.now()
+    count = max(1, min(count, MAX_CLAIM))
+    expires = now + timedelta(seconds=settings.REVIEW_LEASE_SECONDS)
+    with transaction.atomic():
+        held = claimed(user, now).update(claim_expires_at=expires)
+        if held < count:
+            # Rows another reviewer is claiming right now are skipped, not waited for
+            ids = list(
+                available(now).select_for_update(skip_locked=True).values_list('pk', flat=True)[:count - held]
+            )
+            MembershipApplication.objects.filter(pk__in=ids).update(claimed_by=user, claim_expires_at=expires)
+    return list(claimed(user, now).only(*ROW_FIELDS))
+
+
+def release(user, ids=None):
+    """Hand ``user``'s applications (all, or those in ``ids``) back to the queue; returns how many"""
+    applications = MembershipApplication.objects.filter(status='pending', claimed_by=user)
+    if ids is not None:
+        applications = applications.filter(pk__in=ids)
+    return applications.update(claimed_by=None, claim_expires_at=None)
+
+
+def decide(user, pk, status, now=None):
+    """Approve or reject an application ``user`` holds; False if their lease has lapsed or it was never theirs"""
+    now = now or timezone.now()
+    return bool(
+        claimed(user, now).filter(pk=pk).update(
+            status=status, updated_at=now, claimed_by=None, claim_expires_at=None,
+        )
+    )
+
+
+def _row(application):
+    return {
+        'id': application.id,
+        'full_name': application.full_name,
+        'email': application.email,
+        'region': application.region,
+        'occupation': application.occupation,
+        'created_at': application.created_at,
+        'claim_expires_at': application.claim_expires_at,
+    }
+
+
+def reviewer_api(view_func):
+    """POST-only JSON endpoint for site admins; session authenticated, so CSRF applies"""
+    def wrapper(request, *args, **kwargs):
+        if not is_site_admin(request):
+            return FastJsonResponse({'error': 'Admin privileges required'}, status=403)
+        try:
+            data = json.loads(request.body or b'{}')
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return FastJsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(data, dict):
+            return FastJsonResponse({'error': 'Expected a JSON object'}, status=400)
+        return view_func(request, data, *args, **kwargs)
+    return require_POST(wrapper)
+
+
+@reviewer_api
+def claim_view(request, data):
+    """Claim up to ``{"count": n}`` applications (default 5) and list every one held"""
+    try:
+        count = int(data.get('count', DEFAULT_CLAIM))
+    except (TypeError, ValueError):
+        return FastJsonResponse({'error': 'count must be an integer'}, status=400)
+    applications = claim(request.user, count)
+    return FastJsonResponse({'applications': [_row(application) for application in applications]})
+
+
+@reviewer_api
+def release_view(request, data):
+    """Give back ``{"ids": [...]}``, or every held application when ids is left out"""
+    ids = data.get('ids')
+    if ids is not None and not (isinstance(ids, list) and all(isinstance(pk, int) for pk in ids)):
+        return FastJsonResponse({'error': 'ids must be a list of integers'}, status=400)
+    return FastJsonResponse({'released': release(request.user, ids)})
+
+
+@reviewer_api
+def decide_view(request, data, pk):
+    """``{"status": "approved" | "rejected"}`` for an application the reviewer holds"""
+    status = data.get('status')
+    if status not in DECISIONS:
+        return FastJsonResponse({'error': f"status must be one of {', '.join(DECISIONS)}"}, status=400)
+    if not decide(request.user, pk, status):
+        return FastJsonResponse(
+            {'success': False, 'message': 'This application is no longer yours to review; claim again.'},
+            status=409,
+        )
+    return FastJsonResponse({'success': True, 'id': pk, 'status': status})
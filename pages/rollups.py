@@ -0,0 +1,122 @@
+"""
+Daily rollups for the analytics charts.
+
+Each metric counts one table per day, broken down by each of its dimensions,
+into ``DailyRollup`` rows: a year of applications by region is a few
+thousand rows at most, whatever the size of the raw table. ``update()``
+only processes whole days after ``RollupState.through_day``; ``backfill()``
+recomputes a range. Run ``manage.py rollup_daily`` nightly, and before
+``archive_cold_rows`` moves the raw rows away.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyRollup, EventBooking, MembershipApplication, RollupState
+
+# Days grouped per query when catching up or backfilling
+CHUNK_DAYS = 31
+
+
+@dataclass(frozen=True)
+class Metric:
+    model: type
+    timestamp: str
+    # dimension name -> lookup path on the model
+    dimensions: dict = field(default_factory=dict)
+
+
+METRICS = {
+    'applications': Metric(MembershipApplication, 'created_at', {
+        'region': 'region',
+        'education': 'education',
+        'referral': 'referral',
+        'gender': 'gender',
+    }),
+    'bookings': Metric(EventBooking, 'booked_at', {
+        'event_type': 'event__event_type',
+        'status': 'status',
+    }),
+}
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def yesterday():
+    return timezone.localdate() - timedelta(days=1)
+
+
+def earliest_day(name):
+    metric = METRICS[name]
+    first = metric.model.objects.aggregate(first=Min(metric.timestamp))['first']
+    return timezone.localdate(first) if first else None
+
+
+def rollup_range(name, start, end):
+    """Replace the rollups of ``name`` for the days ``start``..``end`` inclusive"""
+    metric = METRICS[name]
+    rows = metric.model.objects.filter(**{
+        f'{metric.timestamp}__gte': _start_of(start),
+        f'{metric.timestamp}__lt': _start_of(end + timedelta(days=1)),
+    }).annotate(day=TruncDate(metric.timestamp)).order_by()
+
+    rollups = []
+    for dimension, path in metric.dimensions.items():
+        for group in rows.values('day', path).annotate(total=Count('pk')):
+            rollups.append(DailyRollup(
+                metric=name, dimension=dimension, value=group[path] or '', day=group['day'], count=group['total'],
+            ))
+
+    with transaction.atomic():
+        DailyRollup.objects.filter(metric=name, day__range=(start, end)).delete()
+        DailyRollup.objects.bulk_create(rollups)
+        state, _ = RollupState.objects.get_or_create(metric=name, defaults={'through_day': end})
+        if state.through_day < end:
+            state.through_day = end
+            state.save(update_fields=['through_day'])
+    return len(rollups)
+
+
+def _in_chunks(name, start, end):
+    days = 0
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=CHUNK_DAYS - 1))
+        rollup_range(name, start, chunk_end)
+        days += (chunk_end - start).days + 1
+        start = chunk_end + timedelta(days=1)
+    return days
+
+
+def update(name, until=None):
+    """Roll up the complete days not processed yet; returns how many"""
+    state = RollupState.objects.filter(metric=name).first()
+    start = state.through_day + timedelta(days=1) if state else earliest_day(name)
+    if start is None:
+        return 0
+    return _in_chunks(name, start, until or yesterday())
+
+
+def backfill(name, start=None, end=None):
+    """Recompute every day from ``start`` (default: the oldest row) to ``end``"""
+    start = start or earliest_day(name)
+    if start is None:
+        return 0
+    return _in_chunks(name, start, end or yesterday())
+
+
+def chart(name, dimension, start, end):
+    """Per-day counts for each value of ``dimension``, aligned to every day in the range"""
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    position = {day: index for index, day in enumerate(days)}
+    series = {}
+    for value, day, count in DailyRollup.objects.filter(
+        metric=name, dimension=dimension, day__range=(start, end)
+    ).values_list('value', 'day', 'count'):
+        series.setdefault(value, [0] * len(days))[position[day]] = count
+    return {'days': days, 'series': series}
@@ -0,0 +1,149 @@
+"""
+Faceted search over upcoming events.
+
+``EventFilters`` parses and validates the query string. ``search_events``
+applies every filter; ``facet_counts`` counts matches per event type and
+per online/in-person from one grouped query. Each facet ignores its own
+filter, so the counts show what picking a different value would return.
+Facet counts are cached per filter combination under the events table's
+version (``feeds.feed_version``), so a change made in any worker moves every
+worker on to fresh counts at the cost of one aggregate query.
+"""
+import hashlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import BadRequest
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core import metrics
+
+from .feeds import feed_version
+from .models import Event
+
+EVENT_TYPES = dict(Event.EVENT_TYPE)
+
+
+@dataclass(frozen=True)
+class EventFilters:
+    event_types: tuple = ()
+    is_online: bool | None = None
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    price_min: Decimal | None = None
+    price_max: Decimal | None = None
+    q: str = ''
+
+    @classmethod
+    def from_query(cls, params):
+        """Build filters from request.GET; raises BadRequest on invalid values"""
+        event_types = tuple(sorted({
+            value for raw in params.getlist('event_type') for value in raw.split(',') if value
+        }))
+        unknown = [value for value in event_types if value not in EVENT_TYPES]
+        if unknown:
+            raise BadRequest(f"Unknown event_type: {', '.join(unknown)}")
+
+        is_online = params.get('is_online')
+        if is_online not in (None, '', 'true', 'false'):
+            raise BadRequest('is_online must be true or false')
+
+        return cls(
+            event_types=event_types,
+            is_online=None if not is_online else is_online == 'true',
+            date_from=_parse_day(params, 'date_from', time.min),
+            date_to=_parse_day(params, 'date_to', time.max),
+            price_min=_parse_price(params, 'price_min'),
+            price_max=_parse_price(params, 'price_max'),
+            q=params.get('q', '').strip(),
+        )
+
+    def cache_key(self):
+        raw = repr(sorted(asdict(self).items())).encode()
+        return hashlib.md5(raw, usedforsecurity=False).hexdigest()
+
+
+def _parse_day(params, name, at):
+    if not params.get(name):
+        return None
+    try:
+        day = parse_date(params[name])
+    except ValueError:
+        day = None
+    if day is None:
+        raise BadRequest(f'{name} must be a date (YYYY-MM-DD)')
+    return timezone.make_aware(datetime.combine(day, at))
+
+
+def _parse_price(params, name):
+    if not params.get(name):
+        return None
+    try:
+        return Decimal(params[name])
+    except InvalidOperation:
+        raise BadRequest(f'{name} must be a number')
+
+
+def upcoming_events():
+    """Bookable events with a date, the set the search covers"""
+    return Event.objects.filter(status='upcoming', deadline__gte=timezone.now(), date_time__isnull=False)
+
+
+def _apply(queryset, filters, facets=True):
+    """Apply ``filters``; with ``facets=False`` the faceted fields are left unfiltered"""
+    if facets and filters.event_types:
+        queryset = queryset.filter(event_type__in=filters.event_types)
+    if facets and filters.is_online is not None:
+        queryset = queryset.filter(is_online=filters.is_online)
+    if filters.date_from:
+        queryset = queryset.filter(date_time__gte=filters.date_from)
+    if filters.date_to:
+        queryset = queryset.filter(date_time__lte=filters.date_to)
+    if filters.price_min is not None:
+        queryset = queryset.filter(price__gte=filters.price_min)
+    if filters.price_max is not None:
+        queryset = queryset.filter(price__lte=filters.price_max)
+    if filters.q:
+        queryset = queryset.filter(Q(title__icontains=filters.q) | Q(location__icontains=filters.q))
+    return queryset
+
+
+def search_events(filters):
+    return _apply(upcoming_events(), filters)
+
+
+def _count_facets(filters):
+    rows = (
+        _apply(upcoming_events(), filters, facets=False)
+        .order_by()
+        .values('event_type', 'is_online')
+        .annotate(total=Count('pk'))
+    )
+    by_type = dict.fromkeys(EVENT_TYPES, 0)
+    by_mode = {'online': 0, 'in_person': 0}
+    total = 0
+    for row in rows:
+        type_matches = not filters.event_types or row['event_type'] in filters.event_types
+        mode_matches = filters.is_online is None or row['is_online'] == filters.is_online
+        if mode_matches:
+            by_type[row['event_type']] = by_type.get(row['event_type'], 0) + row['total']
+        if type_matches:
+            by_mode['online' if row['is_online'] else 'in_person'] += row['total']
+        if type_matches and mode_matches:
+            total += row['total']
+    return {'total': total, 'event_type': by_type, 'is_online': by_mode}
+
+
+def facet_counts(filters):
+    key = f'event-search:facets:{feed_version()}:{filters.cache_key()}'
+    facets = cache.get(key)
+    metrics.count_cache('event_facets', facets is not None)
+    if facets is None:
+        facets = _count_facets(filters)
+        cache.set(key, facets, settings.EVENT_FACET_CACHE_SECONDS)
+    return facets
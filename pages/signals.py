@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import skills
+from .models import ApplicationBlockingKey, CommunityReview, MembershipApplication, ReviewSummary
+
+
+def _counted(review):
+    return review.rating if review.is_public else None
+
+
+@receiver(post_save, sender=CommunityReview)
+def review_saved(sender, instance, created, **kwargs):
+    # Rows that didn't come from the database (new, or built by hand) weren't counted yet
+    previous = None if created else getattr(instance, '_counted_rating', ReviewSummary.UNKNOWN)
+    ReviewSummary.record_change(previous, _counted(instance))
+    instance._counted_rating = _counted(instance)
+
+
+@receiver(post_delete, sender=CommunityReview)
+def review_deleted(sender, instance, **kwargs):
+    ReviewSummary.record_change(getattr(instance, '_counted_rating', ReviewSummary.UNKNOWN), None)
+
+
+@receiver(post_save, sender=MembershipApplication)
+def application_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {'skills', 'languages'} & set(update_fields):
+        return
+    skills.sync(instance, created)
+
+
+@receiver(post_save, sender=MembershipApplication)
+def application_rekeyed(sender, instance, created, update_fields=None, **kwargs):
+    # New applications wait for the next find_duplicates run, which keys them in order
+    if created or (update_fields is not None and not set(ApplicationBlockingKey.SOURCE_FIELDS) & set(update_fields)):
+        return
+    from . import dedup  # signals load at boot, dedup stays off it (core/startup.py)
+
+    dedup.rekey(instance.pk)
@@ -0,0 +1,119 @@
+"""
+Skill and language lookups over membership applications.
+
+``MembershipApplication.skills`` and ``.languages`` are JSON lists, which no
+portable index can search. Each entry is mirrored into ``ApplicationTag``
+(kind, normalized value, application), maintained on every save by
+pages/signals.py, so filtering by skills and languages is a few index
+lookups and the top-skill facets are one grouped query on a narrow table.
+
+Run ``manage.py rebuild_application_tags`` after writes that skip model
+signals (``bulk_create``, ``QuerySet.update()``, raw SQL).
+"""
+from functools import reduce
+from operator import or_
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from core import metrics
+
+from .models import ApplicationTag, MembershipApplication
+
+SOURCES = {ApplicationTag.SKILL: 'skills', ApplicationTag.LANGUAGE: 'languages'}
+VALUE_LENGTH = ApplicationTag._meta.get_field('value').max_length
+
+# Values offered by the admin filters, recounted at most this often
+CHOICES_CACHE_SECONDS = 600
+
+
+def normalize(value):
+    return ' '.join(value.split()).casefold()[:VALUE_LENGTH]
+
+
+def entries(value):
+    """The entries of a stored JSON value: a list as is, a bare string as one entry, anything else as none"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return value
+    return []
+
+
+def tags_of(application):
+    """{(kind, value)} for an application's JSON lists; non-string entries are ignored"""
+    tags = set()
+    for kind, field in SOURCES.items():
+        for entry in entries(getattr(application, field)):
+            if isinstance(entry, str) and entry.strip():
+                tags.add((kind, normalize(entry)))
+    return tags
+
+
+def sync(application, created=False):
+    """Make the application's ApplicationTag rows match its lists"""
+    wanted = tags_of(application)
+    existing = set() if created else set(application.tags.values_list('kind', 'value'))
+    stale = existing - wanted
+    if stale:
+        application.tags.filter(reduce(or_, (Q(kind=kind, value=value) for kind, value in stale))).delete()
+    if wanted - existing:
+        ApplicationTag.objects.bulk_create(
+            [ApplicationTag(application=application, kind=kind, value=value) for kind, value in wanted - existing],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild(batch_size=2000):
+    """Recreate every ApplicationTag from the JSON lists; returns the number of rows"""
+    total = last = 0
+    ApplicationTag.objects.all().delete()
+    while True:
+        batch = list(
+            MembershipApplication.objects.filter(pk__gt=last).order_by('pk').only('skills', 'languages')[:batch_size]
+        )
+        if not batch:
+            return total
+        with transaction.atomic():
+            created = ApplicationTag.objects.bulk_create([
+                ApplicationTag(application=application, kind=kind, value=value)
+                for application in batch
+                for kind, value in tags_of(application)
+            ])
+        total += len(created)
+        last = batch[-1].pk
+
+
+def applications_with(kind, value):
+    """Subquery of the ids of applications having ``value`` as a ``kind``"""
+    return ApplicationTag.objects.filter(kind=kind, value=normalize(value)).values('application')
+
+
+def with_tags(queryset, skills=(), languages=()):
+    """Narrow ``queryset`` to applications having every one of ``skills`` and ``languages``"""
+    for kind, values in ((ApplicationTag.SKILL, skills), (ApplicationTag.LANGUAGE, languages)):
+        for value in values:
+            queryset = queryset.filter(pk__in=applications_with(kind, value))
+    return queryset
+
+
+def top_values(kind, queryset=None, limit=10):
+    """[(value, applications)] most common first, among ``queryset`` if given"""
+    tags = ApplicationTag.objects.filter(kind=kind)
+    if queryset is not None:
+        tags = tags.filter(application__in=queryset.order_by().values('pk'))
+    return list(
+        tags.order_by().values_list('value').annotate(total=Count('pk')).order_by('-total', 'value')[:limit]
+    )
+
+
+def choices(kind, limit=50):
+    """The most common values of ``kind``, cached for the admin filters"""
+    key = f'application-tags:{kind}'
+    values = cache.get(key)
+    metrics.count_cache('tag_choices', values is not None)
+    if values is None:
+        values = top_values(kind, limit=limit)
+        cache.set(key, values, CHOICES_CACHE_SECONDS)
+    return values
@@ -1,3 +1,1657 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time as clock
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.apps import apps as django_apps
+from django.contrib.admin import site
+from django.contrib.auth import get_user
+from django.contrib.auth.models import AnonymousUser, User
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models.sql import UpdateQuery
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
-# Create your tests here.
+from core import metrics, routers, startup
+from core.middleware import CompressionMiddleware, QueryInstrumentationMiddleware, ReplicaPinMiddleware
+from core.responses import FastJsonResponse
+from . import archive, checkin, dedup, profiling, reminders, review_queue, warmup
+from .auth import get_profile
+from .management.commands.seed_scale import backdating
+from .paginators import EstimatedCountPaginator
+from .views import concurrency, events, home
+from .models import (
+    ApplicationBlockingKey,
+    ApplicationTag,
+    ArchivedApplication,
+    CommunityReview,
+    CommunityStats,
+    CustomUser,
+    DailyRollup,
+    DuplicateCandidate,
+    Event,
+    EventBooking,
+    EventReminder,
+    MembershipApplication,
+    RequestProfile,
+    ReviewSummary,
+    TeamMember,
+)
+
+
+@override_settings(REPLICA_DATABASES=['replica_1'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+        self.token = routers.pin_to_primary(False)
+
+    def tearDown(self):
+        routers.reset_pin(self.token)
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.router.db_for_read(Event), 'replica_1')
+
+    def test_write_pins_following_reads(self):
+        self.assertEqual(self.router.db_for_write(Event), 'default')
+        self.assertEqual(self.router.db_for_read(Event), 'default')
+
+    def test_pin_ends_with_its_scope(self):
+        with routers.primary_pin_scope():
+            self.router.db_for_write(Event)
+            self.assertEqual(self.router.db_for_read(Event), 'default')
+        self.assertEqual(self.router.db_for_read(Event), 'replica_1')
+
+    def test_writes_outside_a_scope_pin_nothing(self):
+        routers.reset_pin(self.token)
+        try:
+            self.router.db_for_write(Event)
+            self.assertFalse(routers.is_pinned())
+            self.assertEqual(self.router.db_for_read(Event), 'replica_1')
+        finally:
+            self.token = routers.pin_to_primary(False)
+
+    def test_write_in_a_worker_thread_pins_the_request(self):
+        async_to_sync(sync_to_async(self.router.db_for_write, thread_sensitive=False))(Event)
+        self.assertTrue(routers.is_pinned())
+
+    def test_related_reads_follow_the_instance(self):
+        event = Event(title='Meetup')
+        event._state.db = 'default'
+        self.assertEqual(self.router.db_for_read(EventBooking, instance=event), 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica_1', 'pages'))
+        self.assertIsNone(self.router.allow_migrate('default', 'pages'))
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_no_replicas_reads_primary(self):
+        self.assertEqual(self.router.db_for_read(Event), 'default')
+
+
+@override_settings(REPLICA_DATABASES=['replica_1'])
+class ReplicaPinMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.seen = []
+
+        def view(request):
+            self.seen.append(routers.PrimaryReplicaRouter().db_for_read(Event))
+            return HttpResponse()
+
+        self.middleware = ReplicaPinMiddleware(view)
+        self.token = routers.pin_to_primary(False)
+
+    def tearDown(self):
+        routers.reset_pin(self.token)
+
+    def test_post_sets_pin_cookie(self):
+        response = self.middleware(self.factory.post('/join/'))
+        self.assertIn('primary_pin', response.cookies)
+
+    def test_get_without_cookie_reads_replica(self):
+        response = self.middleware(self.factory.get('/community/'))
+        self.assertNotIn('primary_pin', response.cookies)
+        self.assertEqual(self.seen, ['replica_1'])
+
+    def test_pin_cookie_reads_primary(self):
+        request = self.factory.get('/community/')
+        request.COOKIES['primary_pin'] = '1'
+        self.middleware(request)
+        self.assertEqual(self.seen, ['default'])
+        self.assertFalse(routers.is_pinned())
+
+
+class AsyncViewTests(TransactionTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        Event.objects.create(
+            title='Python Meetup',
+            description='Monthly meetup',
+            location='Dar es Salaam',
+            date_time=timezone.now() + timedelta(days=7),
+            deadline=timezone.now() + timedelta(days=5),
+        )
+
+    def tearDown(self):
+        connections.close_all()
+
+    def _request(self, path):
+        request = self.factory.get(path)
+        request.user = AnonymousUser()
+
+        async def auser():
+            return request.user
+
+        request.auser = auser
+        return request
+
+    async def test_community_async_renders_events(self):
+        response = await events.community_async(self._request('/community/'))
+        self.assertContains(response, 'Python Meetup')
+
+    async def test_about_async_renders(self):
+        response = await home.about_async(self._request('/about/'))
+        self.assertEqual(response.status_code, 200)
+
+
+class WarmupTests(SimpleTestCase):
+    def test_warm_up_without_database(self):
+        # SimpleTestCase rejects queries, so this also guards the no-DB-before-fork rule
+        warmup.warm_up()
+
+
+@override_settings(SQL_SAMPLE_RATE=1.0, SQL_REPEAT_THRESHOLD=3)
+class QueryInstrumentationMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(4):
+            Event.objects.create(
+                title=f'Workshop {i}',
+                description='Hands-on session',
+                location='Arusha',
+                max_participants=20,
+                date_time=timezone.now() + timedelta(days=7),
+                deadline=timezone.now() + timedelta(days=5),
+            )
+
+    def test_server_timing_header(self):
+        response = self.client.get('/about/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+    @override_settings(SQL_SAMPLE_RATE=0.0)
+    def test_unsampled_request_has_no_header(self):
+        response = self.client.get('/about/')
+        self.assertNotIn('Server-Timing', response)
+
+    def test_repeated_query_is_reported_with_origin(self):
+        template = Template('{% for event in events %}{{ event.spots_remaining }}{% endfor %}')
+
+        def view(request):
+            # Unannotated events fall back to one COUNT per event
+            return HttpResponse(template.render(Context({'events': Event.objects.all()})))
+
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            QueryInstrumentationMiddleware(view)(RequestFactory().get('/community/'))
+        report = next(line for line in logs.output if 'Likely N+1' in line)
+        self.assertIn('ran 4 times from template <unknown source>:1', report)
+        self.assertIn('pages/models.py', report)
+        self.assertIn('in spots_remaining', report)
+
+    @override_settings(SQL_QUERY_BUDGET=1)
+    def test_query_budget_is_logged(self):
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            self.client.get('/about/')
+        self.assertTrue(any('Query budget exceeded on GET /about/' in line for line in logs.output))
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Exact query counts for every page against a representative dataset.
+
+    The counts must not depend on how many events, members, bookings or
+    reviews exist: a change that adds a query per row fails here first.
+    """
+
+    EVENTS = 50
+    MEMBERS = 500
+    REVIEWS = 120
+    APPLICATIONS = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        users = User.objects.bulk_create(
+            User(username=f'member{i}', first_name='Member', last_name=str(i))
+            for i in range(cls.MEMBERS)
+        )
+        members = CustomUser.objects.bulk_create(
+            CustomUser(user=user, is_community_member=True) for user in users
+        )
+        events = Event.objects.bulk_create(
+            Event(
+                title=f'Event {i}',
+                description='Community event',
+                location='Mwanza',
+                max_participants=100,
+                date_time=now + timedelta(days=10 + i),
+                deadline=now + timedelta(days=5 + i),
+            )
+            for i in range(cls.EVENTS)
+        )
+        EventBooking.objects.bulk_create(
+            EventBooking(event=event, user=members[(e * 10 + b) % cls.MEMBERS])
+            for e, event in enumerate(events)
+            for b in range(10)
+        )
+        CommunityReview.objects.bulk_create(
+            CommunityReview(user=member, rating=1 + i % 5, comment='Great community')
+            for i, member in enumerate(members[:cls.REVIEWS])
+        )
+        ReviewSummary.rebuild()
+        MembershipApplication.objects.bulk_create(
+            MembershipApplication(
+                first_name='Applicant',
+                last_name=str(i),
+                email=f'applicant{i}@example.com',
+                phone='0700000000',
+                date_of_birth='1995-01-01',
+                gender='female',
+                id_number=f'ID{i}',
+                current_address='Dodoma',
+                region='dodoma',
+                district='Dodoma Urban',
+                education='bachelor',
+                occupation='Engineer',
+                why_join='To learn',
+                contribution='Mentoring',
+                expectations='Growth',
+            )
+            for i in range(cls.APPLICATIONS)
+        )
+        TeamMember.objects.bulk_create(
+            TeamMember(name=f'Team {i}', position='mentor', bio='Bio', quote='Quote', order=i)
+            for i in range(5)
+        )
+        CommunityStats.get_current_stats()
+
+        cls.event = events[0]
+        cls.member = users[-1]
+        cls.admin = User.objects.create(username='staff')
+        CustomUser.objects.create(user=cls.admin, is_admin=True, is_community_member=True)
+
+    def assertQueries(self, count, method, path, **kwargs):
+        with self.assertNumQueries(count):
+            response = getattr(self.client, method)(path, **kwargs)
+        self.assertLess(response.status_code, 400)
+        return response
+
+    def application_payload(self):
+        return {
+            'first_name': 'New',
+            'last_name': 'Applicant',
+            'email': 'new.applicant@example.com',
+            'phone': '0711111111',
+            'date_of_birth': '1998-05-05',
+            'gender': 'male',
+            'id_number': 'NEW-ID',
+            'current_address': 'Arusha',
+            'region': 'arusha',
+            'district': 'Arusha City',
+            'education': 'diploma',
+            'occupation': 'Designer',
+            'why_join': 'Community',
+            'contribution': 'Design',
+            'expectations': 'Network',
+            'agree_terms': 'on',
+        }
+
+    # Anonymous visitors
+
+    def test_index_anonymous(self):
+        self.assertQueries(0, 'get', '/')
+
+    def test_about_anonymous(self):
+        self.assertQueries(3, 'get', '/about/')
+
+    def test_community_anonymous(self):
+        response = self.assertQueries(4, 'get', '/community/')
+        self.assertContains(response, 'Event 49')
+
+    def test_join_get_anonymous(self):
+        self.assertQueries(0, 'get', '/join/')
+
+    def test_join_post_anonymous(self):
+        self.assertQueries(1, 'post', '/join/', data=self.application_payload())
+
+    def test_join_post_json_anonymous(self):
+        self.assertQueries(1, 'post', '/join/', data=self.application_payload(), content_type='application/json')
+
+    def test_dashboard_anonymous_redirects_to_login(self):
+        self.assertQueries(0, 'get', '/dashboard/')
+
+    def test_api_events_anonymous(self):
+        self.assertQueries(1, 'get', '/api/events/', query_params={'per_page': 100})
+
+    def test_api_reviews_anonymous(self):
+        self.assertQueries(1, 'get', '/api/reviews/', query_params={'per_page': 100})
+
+    # Logged-in members
+
+    def test_index_member(self):
+        self.client.force_login(self.member)
+        self.assertQueries(0, 'get', '/')
+
+    def test_about_member(self):
+        self.client.force_login(self.member)
+        self.assertQueries(3, 'get', '/about/')
+
+    def test_community_member(self):
+        self.client.force_login(self.member)
+        self.assertQueries(6, 'get', '/community/')
+
+    def test_join_get_member(self):
+        self.client.force_login(self.member)
+        self.assertQueries(0, 'get', '/join/')
+
+    def test_dashboard_member_is_redirected(self):
+        self.client.force_login(self.member)
+        self.assertQueries(1, 'get', '/dashboard/')
+
+    def test_dashboard_admin(self):
+        self.client.force_login(self.admin)
+        self.assertQueries(9, 'get', '/dashboard/')
+
+    def test_admin_team(self):
+        self.client.force_login(self.admin)
+        response = self.assertQueries(2, 'get', '/dashboard/team/')
+        self.assertContains(response, 'Team 4')
+
+    def test_create_event_form(self):
+        self.client.force_login(self.admin)
+        response = self.assertQueries(1, 'get', '/dashboard/events/create/')
+        self.assertContains(response, '<option value="meetup">')
+
+    def test_create_event(self):
+        self.client.force_login(self.admin)
+        response = self.assertQueries(2, 'post', '/dashboard/events/create/', data={
+            'title': 'Launch', 'description': 'New hub', 'event_type': 'meetup', 'location': 'Arusha',
+            'date_time': '2030-01-01T18:00', 'deadline': '2029-12-31T18:00', 'price': '0',
+        })
+        self.assertRedirects(response, '/dashboard/events/', fetch_redirect_response=False)
+        self.assertTrue(Event.objects.filter(title='Launch').exists())
+
+    def test_book_event(self):
+        self.client.force_login(self.member)
+        response = self.assertQueries(
+            5, 'post', '/book-event/', data={'event_id': str(self.event.id)}, content_type='application/json'
+        )
+        self.assertTrue(response.json()['success'])
+
+    def test_submit_review_creates(self):
+        self.client.force_login(self.member)
+        response = self.assertQueries(8, 'post', '/submit-review/', data={'rating': 5, 'comment': 'Inspiring'})
+        self.assertTrue(response.json()['success'])
+
+    def test_submit_review_updates(self):
+        reviewer = User.objects.get(username='member0')
+        self.client.force_login(reviewer)
+        response = self.assertQueries(6, 'post', '/submit-review/', data={'rating': 4, 'comment': 'Still great'})
+        self.assertEqual(response.json()['message'], 'Review updated successfully!')
+
+
+class AdminAccessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create(username='member')
+        CustomUser.objects.create(user=cls.member, is_community_member=True)
+        cls.superuser = User.objects.create(username='root', is_superuser=True)
+
+    def test_member_is_sent_home(self):
+        self.client.force_login(self.member)
+        self.assertRedirects(self.client.get('/dashboard/'), '/')
+
+    def test_login_page_returns_to_dashboard(self):
+        self.member.set_password('secret')
+        self.member.save()
+        login = self.client.get('/dashboard/', follow=True)
+        self.assertContains(login, 'name="next" value="/dashboard/"')
+        response = self.client.post('/accounts/login/', {'username': 'member', 'password': 'secret', 'next': '/dashboard/'})
+        self.assertRedirects(response, '/dashboard/', fetch_redirect_response=False)
+        self.assertContains(self.client.post('/accounts/login/', {'username': 'member', 'password': 'wrong'}),
+                            "didn't match")
+
+    def test_superuser_without_profile_is_allowed(self):
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.client.get('/dashboard/').status_code, 200)
+
+    def test_profile_loads_with_user(self):
+        self.client.force_login(self.member)
+        request = RequestFactory().get('/')
+        request.session = self.client.session
+        with self.assertNumQueries(1):
+            request.user = get_user(request)
+            self.assertTrue(get_profile(request).is_community_member)
+            self.assertIs(get_profile(request), request.user.customuser)
+
+
+class SeedScaleCommandTests(TestCase):
+    def seed(self, *extra):
+        call_command(
+            'seed_scale', '--members', '20', '--events', '5', '--bookings', '60',
+            '--applications', '30', '--reviews', '10', *extra, stdout=StringIO(),
+        )
+
+    def test_seeds_requested_sizes(self):
+        self.seed()
+        self.assertEqual(CustomUser.objects.count(), 20)
+        self.assertEqual(Event.objects.count(), 5)
+        self.assertEqual(EventBooking.objects.count(), 60)
+        self.assertEqual(CommunityReview.objects.count(), 10)
+        self.assertEqual(MembershipApplication.objects.count(), 30)
+        # Timestamps are spread over the history window, not all "now"
+        self.assertGreater(MembershipApplication.objects.dates('created_at', 'day').count(), 1)
+
+    def test_same_seed_is_reproducible(self):
+        self.seed()
+        first = list(MembershipApplication.objects.order_by('email').values_list('region', 'skills'))
+        self.seed('--clear')
+        second = list(MembershipApplication.objects.order_by('email').values_list('region', 'skills'))
+        self.assertEqual(first, second)
+
+    def test_refuses_to_duplicate_without_clear(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Event.objects.bulk_create(
+            Event(title=f'Event {i}', description='', location='Online') for i in range(3)
+        )
+
+    def test_falls_back_to_exact_count_without_estimate(self):
+        # SQLite has no planner estimate
+        self.assertEqual(EstimatedCountPaginator(Event.objects.all(), 2).count, 3)
+
+    def test_uses_estimate_above_threshold(self):
+        with mock.patch('pages.paginators.estimate_count', return_value=250000), self.assertNumQueries(0):
+            self.assertEqual(EstimatedCountPaginator(Event.objects.all(), 100).count, 250000)
+
+    def test_small_estimate_counts_exactly(self):
+        with mock.patch('pages.paginators.estimate_count', return_value=40):
+            self.assertEqual(EstimatedCountPaginator(Event.objects.all(), 100).count, 3)
+
+    def test_registered_admins_use_it(self):
+        for model_admin in site._registry.values():
+            if model_admin.opts.app_label == 'pages':
+                self.assertIs(model_admin.paginator, EstimatedCountPaginator)
+                self.assertFalse(model_admin.show_full_result_count)
+
+
+class BookingAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create(username='staff', is_staff=True, is_superuser=True)
+        users = User.objects.bulk_create(User(username=f'user{i}', email=f'user{i}@example.com') for i in range(30))
+        members = CustomUser.objects.bulk_create(CustomUser(user=user) for user in users)
+        events = Event.objects.bulk_create(
+            Event(title=f'Event {i}', description='', location='Dodoma') for i in range(3)
+        )
+        statuses = ['confirmed', 'confirmed', 'pending', 'attended', 'cancelled']
+        EventBooking.objects.bulk_create(
+            EventBooking(event=events[0], user=member, status=statuses[i % 5])
+            for i, member in enumerate(members)
+        )
+        cls.event = events[0]
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_event_changelist_counts_from_annotations(self):
+        # session user, COUNT for the paginator, one page of events with counts
+        with self.assertNumQueries(3):
+            response = self.client.get('/admin/pages/event/')
+        event = next(obj for obj in response.context['cl'].result_list if obj.pk == self.event.pk)
+        self.assertEqual((event.confirmed_count, event.pending_count, event.attended_count), (12, 6, 6))
+
+    def test_booking_changelist_joins_event_and_member(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/admin/pages/eventbooking/')
+        self.assertContains(response, 'Event 0')
+
+    def test_booking_search_is_an_exact_email_match(self):
+        member = EventBooking.objects.filter(event=self.event).select_related('user__user').first().user.user
+        response = self.client.get('/admin/pages/eventbooking/', {'q': member.email.upper()})
+        self.assertEqual([obj.user.user for obj in response.context['cl'].result_list], [member])
+        response = self.client.get('/admin/pages/eventbooking/', {'q': member.email[:5]})
+        self.assertEqual(list(response.context['cl'].result_list), [])
+        response = self.client.get('/admin/pages/eventbooking/', {'event': self.event.pk})
+        self.assertEqual(len(response.context['cl'].result_list), 30)
+
+    def test_member_changelist(self):
+        with self.assertNumQueries(3):
+            self.client.get('/admin/pages/customuser/')
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='staff', is_superuser=True)
+        # Shared timestamps force the id tie-breaker to do its job
+        created = timezone.now()
+        with backdating(Event, 'created_at'):
+            Event.objects.bulk_create(
+                Event(title=f'Event {i}', description='', location='Mbeya',
+                      event_type='workshop' if i % 2 else 'meetup',
+                      created_at=created - timedelta(hours=i // 3))
+                for i in range(23)
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def walk(self, **params):
+        seen, cursor, pages = [], None, 0
+        while True:
+            query = {'format': 'json', 'per_page': 5, **params}
+            if cursor:
+                query['cursor'] = cursor
+            data = self.client.get('/dashboard/events/', query).json()
+            seen += [row['id'] for row in data['results']]
+            pages += 1
+            cursor = data['next_cursor']
+            if not cursor:
+                return seen, pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        seen, pages = self.walk()
+        expected = [str(pk) for pk in Event.objects.order_by('-created_at', '-pk').values_list('pk', flat=True)]
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 5)
+
+    def test_filters_apply_server_side(self):
+        seen, _ = self.walk(event_type='workshop')
+        self.assertEqual(len(seen), 11)
+
+    def test_later_pages_cost_the_same_as_the_first(self):
+        # The session user plus one range scan, on page 1 and page N alike
+        with self.assertNumQueries(2):
+            first = self.client.get('/dashboard/events/', {'format': 'json', 'per_page': 5}).json()
+        with self.assertNumQueries(2):
+            self.client.get('/dashboard/events/', {'format': 'json', 'per_page': 5, 'cursor': first['next_cursor']})
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/dashboard/events/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_html_pages_render(self):
+        self.assertContains(self.client.get('/dashboard/events/', {'per_page': 5}), 'Load More')
+        self.assertEqual(self.client.get('/dashboard/members/').status_code, 200)
+        data = self.client.get('/dashboard/members/', {'format': 'json', 'list': 'applications'}).json()
+        self.assertEqual(data, {'results': [], 'next_cursor': None})
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='amani', first_name='Amani', last_name='Mushi')
+        member = CustomUser.objects.create(user=user, is_community_member=True)
+        cls.event = Event.objects.create(title='Hackathon', description='Long description', location='Arusha',
+                                         max_participants=2)
+        Event.objects.create(title='Old meetup', description='', location='Moshi', status='completed')
+        EventBooking.objects.create(event=cls.event, user=member)
+        CommunityReview.objects.create(user=member, rating=5, comment='Loved it')
+        other = CustomUser.objects.create(user=User.objects.create(username='neema'))
+        CommunityReview.objects.create(user=other, rating=1, comment='Hidden', is_public=False)
+
+    def test_events_default_fields_include_availability(self):
+        response = self.client.get('/api/events/')
+        [event] = response.json()['results']
+        self.assertEqual(event['title'], 'Hackathon')
+        self.assertEqual(event['spots_remaining'], 1)
+        self.assertNotIn('description', event)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_sparse_fields_only_select_requested_columns(self):
+        with self.assertNumQueries(1) as ctx:
+            response = self.client.get('/api/events/', {'fields': 'title,is_full'})
+        self.assertEqual(response.json()['results'], [{'title': 'Hackathon', 'is_full': False}])
+        sql = ctx.captured_queries[0]['sql']
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"location"', sql)
+
+    def test_unknown_field_is_a_400(self):
+        response = self.client.get('/api/events/', {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', response.json()['error'])
+
+    def test_reviews_are_public_only_with_author(self):
+        results = self.client.get('/api/reviews/', {'fields': 'rating,author'}).json()['results']
+        self.assertEqual(results, [{'rating': 5, 'author': 'Amani Mushi'}])
+
+    def test_etag_revalidation_returns_304(self):
+        etag = self.client.get('/api/reviews/')['ETag']
+        response = self.client.get('/api/reviews/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_cursor_pagination(self):
+        Event.objects.create(title='Workshop', description='', location='Dodoma')
+        first = self.client.get('/api/events/', {'per_page': 1, 'fields': 'title'}).json()
+        second = self.client.get('/api/events/', {'per_page': 1, 'fields': 'title', 'cursor': first['next_cursor']}).json()
+        self.assertEqual([first['results'], second['results']], [[{'title': 'Workshop'}], [{'title': 'Hackathon'}]])
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual(self.client.get('/api/events/', {'cursor': '!!'}).status_code, 400)
+
+
+class EventSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for i, (event_type, is_online, price) in enumerate([
+            ('workshop', False, 0), ('workshop', True, 10), ('meetup', False, 0),
+            ('meetup', True, 5), ('seminar', False, 50),
+        ]):
+            Event.objects.create(
+                title=f'{event_type.title()} {i}', description='', location='Online' if is_online else 'Dar es Salaam',
+                event_type=event_type, is_online=is_online, price=price,
+                date_time=now + timedelta(days=10 + i), deadline=now + timedelta(days=5 + i),
+            )
+        Event.objects.create(title='Past workshop', description='', location='Dodoma', event_type='workshop',
+                             date_time=now - timedelta(days=3), deadline=now - timedelta(days=5))
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, **params):
+        response = self.client.get('/api/events/search/', {'fields': 'title', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_filters_combine(self):
+        data = self.search(event_type='workshop,meetup', price_max='5', q='shop')
+        self.assertEqual(data['results'], [{'title': 'Workshop 0'}])
+
+    def test_each_facet_ignores_its_own_filter(self):
+        facets = self.search(event_type='workshop', is_online='true')['facets']
+        self.assertEqual(facets['total'], 1)
+        self.assertEqual(facets['event_type']['workshop'], 1)
+        self.assertEqual(facets['event_type']['meetup'], 1)
+        self.assertEqual(facets['event_type']['seminar'], 0)
+        self.assertEqual(facets['is_online'], {'online': 1, 'in_person': 1})
+
+    def test_facets_are_cached_until_an_event_changes(self):
+        with self.assertNumQueries(3):  # page, events version, facets
+            self.search(is_online='false')
+        with self.assertNumQueries(2):
+            cached = self.search(is_online='false')
+        self.assertEqual(cached['facets']['total'], 3)
+
+        Event.objects.filter(title='Seminar 4').get().delete()
+        self.assertEqual(self.search(is_online='false')['facets']['total'], 2)
+        # Changed by a bulk update in another worker: no signal, but a new version
+        Event.objects.filter(title='Meetup 2').update(is_online=True, updated_at=timezone.now())
+        self.assertEqual(self.search(is_online='false')['facets']['total'], 1)
+
+    def test_results_page_soonest_first(self):
+        first = self.search(per_page=3)
+        second = self.search(per_page=3, cursor=first['next_cursor'])
+        titles = [row['title'] for row in first['results'] + second['results']]
+        self.assertEqual(titles, ['Workshop 0', 'Workshop 1', 'Meetup 2', 'Meetup 3', 'Seminar 4'])
+        self.assertNotIn('facets', second)
+
+    def test_invalid_filters_are_400(self):
+        for params in ({'event_type': 'party'}, {'is_online': 'maybe'}, {'date_from': '2025-13-01'}, {'price_min': 'free'}):
+            self.assertEqual(self.client.get('/api/events/search/', params).status_code, 400, params)
+
+
+class ReviewSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.members = []
+        for i in range(3):
+            user = User.objects.create(username=f'reviewer{i}')
+            cls.members.append(CustomUser.objects.create(user=user, is_community_member=True))
+
+    def review(self, member, rating, **kwargs):
+        return CommunityReview.objects.create(user=member, rating=rating, comment='Nice', **kwargs)
+
+    def assertSummary(self, count, total, histogram):
+        summary = ReviewSummary.get_current()
+        self.assertEqual((summary.review_count, summary.rating_total), (count, total))
+        self.assertEqual([count for _, count, _ in summary.histogram], histogram)
+        # The running totals always match a full recount
+        rebuilt = ReviewSummary.rebuild()
+        self.assertEqual((rebuilt.review_count, rebuilt.rating_total), (count, total))
+
+    def test_creating_and_hiding_reviews(self):
+        self.review(self.members[0], 5)
+        self.review(self.members[1], 3)
+        self.review(self.members[2], 4, is_public=False)
+        self.assertSummary(2, 8, [1, 0, 1, 0, 0])
+        self.assertEqual(ReviewSummary.get_current().average, 4.0)
+
+        review = CommunityReview.objects.get(user=self.members[0])
+        review.is_public = False
+        review.save()
+        self.assertSummary(1, 3, [0, 0, 1, 0, 0])
+
+        hidden = CommunityReview.objects.get(user=self.members[2])
+        hidden.is_public = True
+        hidden.save()
+        self.assertSummary(2, 7, [0, 1, 1, 0, 0])
+
+    def test_update_or_create_moves_the_rating(self):
+        self.review(self.members[0], 2)
+        CommunityReview.objects.update_or_create(user=self.members[0], defaults={'rating': 5, 'comment': 'Better'})
+        self.assertSummary(1, 5, [1, 0, 0, 0, 0])
+
+    def test_deleting_a_review_or_its_author(self):
+        self.review(self.members[0], 5)
+        self.review(self.members[1], 1)
+        CommunityReview.objects.get(user=self.members[0]).delete()
+        self.assertSummary(1, 1, [0, 0, 0, 0, 1])
+        self.members[1].user.delete()
+        self.assertSummary(0, 0, [0, 0, 0, 0, 0])
+        self.assertIsNone(ReviewSummary.get_current().average)
+
+    def test_deferred_rating_falls_back_to_a_recount(self):
+        self.review(self.members[0], 4)
+        review = CommunityReview.objects.only('id', 'comment').get()
+        review.comment = 'Edited'
+        review.save(update_fields=['comment'])
+        self.assertSummary(1, 4, [0, 1, 0, 0, 0])
+
+    def test_rebuild_command_repairs_drift(self):
+        self.review(self.members[0], 5)
+        CommunityReview.objects.update(rating=1)  # skips signals
+        out = StringIO()
+        call_command('rebuild_review_summary', stdout=out)
+        self.assertIn('1 public reviews, average 1.0', out.getvalue())
+
+    def test_update_parameters_are_integers(self):
+        # SQLite adds booleans as 0/1; Postgres has no integer + boolean operator
+        for removed, added in [(None, 5), (5, None), (2, 4)]:
+            query = ReviewSummary.objects.filter(pk=1).query.chain(UpdateQuery)
+            query.add_update_values(ReviewSummary.changes(removed, added))
+            _, params = query.get_compiler('default').as_sql()
+            self.assertFalse([param for param in params if isinstance(param, bool)], (removed, added))
+
+    def test_drifted_counters_never_go_negative(self):
+        self.review(self.members[0], 5)
+        ReviewSummary.objects.update(review_count=0, rating_total=0, stars_5=0)  # drifted, e.g. a bulk delete
+        CommunityReview.objects.get().delete()
+        summary = ReviewSummary.get_current()
+        self.assertEqual((summary.review_count, summary.rating_total, summary.stars_5), (0, 0, 0))
+
+    def test_community_page_shows_the_summary(self):
+        self.review(self.members[0], 5)
+        self.review(self.members[1], 4)
+        response = self.client.get('/community/')
+        self.assertContains(response, '4.5')
+        self.assertContains(response, '2 reviews')
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        user = User.objects.create(username='archived_member')
+        cls.member = CustomUser.objects.create(user=user, is_community_member=True)
+        cls.old_event = Event.objects.create(title='Old', description='', location='Tanga', date_time=now - timedelta(days=400))
+        cls.new_event = Event.objects.create(title='New', description='', location='Tanga', date_time=now + timedelta(days=4))
+        cls.old_booking = EventBooking.objects.create(event=cls.old_event, user=cls.member, status='attended', notes='Vegetarian')
+        EventBooking.objects.create(event=cls.new_event, user=cls.member)
+
+        with backdating(MembershipApplication, 'updated_at'):
+            for i, (status, age) in enumerate([('rejected', 500), ('approved', 400), ('pending', 900), ('rejected', 10)]):
+                MembershipApplication.objects.create(
+                    first_name='Old', last_name=str(i), email=f'old{i}@example.com', phone='0700000000',
+                    date_of_birth='1990-01-01', gender='male', id_number=f'OLD{i}', current_address='Tanga',
+                    region='other', district='Tanga', education='diploma', occupation='Farmer',
+                    skills=['Agriculture'], why_join='A long essay ' * 50, contribution='Time', expectations='Growth',
+                    status=status, updated_at=now - timedelta(days=age),
+                )
+
+    def test_moves_only_cold_rows_in_batches(self):
+        out = StringIO()
+        call_command('archive_cold_rows', '--batch-size', '1', stdout=out)
+        self.assertIn('applications: 2 archived', out.getvalue())
+        self.assertIn('bookings: 1 archived', out.getvalue())
+        self.assertEqual(set(MembershipApplication.objects.values_list('status', flat=True)), {'pending', 'rejected'})
+        self.assertEqual(list(EventBooking.objects.values_list('event__title', flat=True)), ['New'])
+        self.assertEqual(ArchivedApplication.objects.count(), 2)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command('archive_cold_rows', '--dry-run', stdout=out)
+        self.assertIn('applications: 2 would be archived', out.getvalue())
+        self.assertEqual(MembershipApplication.objects.count(), 4)
+
+    def test_restore_by_id_round_trips_every_field(self):
+        before = MembershipApplication.objects.filter(email='old0@example.com').values().get()
+        call_command('archive_cold_rows', stdout=StringIO())
+
+        call_command('restore_archived', 'application', str(before['id']), stdout=StringIO())
+        self.assertEqual(MembershipApplication.objects.filter(email='old0@example.com').values().get(), before)
+        self.assertFalse(ArchivedApplication.objects.filter(pk=before['id']).exists())
+
+        call_command('restore_archived', 'booking', str(self.old_booking.pk), stdout=StringIO())
+        restored = EventBooking.objects.get(pk=self.old_booking.pk)
+        self.assertEqual((restored.status, restored.notes, restored.booked_at),
+                         ('attended', 'Vegetarian', self.old_booking.booked_at))
+
+    def test_review_decisions_and_reminders_survive_archival(self):
+        # The four applications share a phone number, so every pair is a candidate
+        dedup.find_duplicates()
+        old0, old1 = (MembershipApplication.objects.get(email=f'old{i}@example.com') for i in (0, 1))
+        DuplicateCandidate.objects.filter(first=old0).update(status='distinct')
+        decided = set(DuplicateCandidate.objects.filter(status='distinct').values_list('pk', 'second'))
+        EventReminder.objects.create(booking=self.old_booking, kind=EventReminder.DAY)
+        call_command('archive_cold_rows', stdout=StringIO())
+        self.assertEqual(DuplicateCandidate.objects.count(), 1)
+
+        archive.restore_application(old0.pk)
+        # The decision on the pair with old1 waits until old1 is restored too
+        self.assertEqual(
+            set(DuplicateCandidate.objects.filter(status='distinct').values_list('pk', 'second')),
+            {(pk, second) for pk, second in decided if second != old1.pk},
+        )
+        self.assertTrue(ApplicationBlockingKey.objects.filter(application=old0).exists())
+
+        archive.restore_application(old1.pk)
+        self.assertEqual(set(DuplicateCandidate.objects.filter(status='distinct').values_list('pk', 'second')), decided)
+        self.assertEqual(DuplicateCandidate.objects.count(), 6)
+
+        archive.restore_booking(self.old_booking.pk)
+        self.assertEqual(list(self.old_booking.reminders.values_list('kind', flat=True)), [EventReminder.DAY])
+
+    def test_restore_of_unknown_id_fails_cleanly(self):
+        with self.assertRaises(CommandError):
+            call_command('restore_archived', 'application', '999999', stdout=StringIO())
+
+
+class DailyRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        # Two applications three days ago, then one per day
+        ages = [(3, 'arusha'), (3, 'arusha'), (2, 'mbeya'), (1, 'arusha')]
+        with backdating(MembershipApplication, 'created_at'):
+            for i, (age, region) in enumerate(ages):
+                MembershipApplication.objects.create(
+                    first_name='A', last_name=str(i), email=f'rollup{i}@example.com', phone='0700000000',
+                    date_of_birth='1990-01-01', gender='female', id_number=f'R{i}', current_address='X',
+                    region=region, district='X', education='bachelor', occupation='X', why_join='X',
+                    contribution='X', expectations='X', created_at=timezone.now() - timedelta(days=age),
+                )
+        cls.admin = User.objects.create(username='analyst', is_superuser=True)
+
+    def counts(self, dimension='region'):
+        return {
+            (row.day, row.value): row.count
+            for row in DailyRollup.objects.filter(metric='applications', dimension=dimension)
+        }
+
+    def test_incremental_run_only_processes_new_days(self):
+        out = StringIO()
+        call_command('rollup_daily', '--metric', 'applications', stdout=out)
+        self.assertIn('applications: 3 day(s)', out.getvalue())
+        days_ago = lambda n: self.today - timedelta(days=n)
+        self.assertEqual(self.counts(), {
+            (days_ago(3), 'arusha'): 2, (days_ago(2), 'mbeya'): 1, (days_ago(1), 'arusha'): 1,
+        })
+
+        out = StringIO()
+        call_command('rollup_daily', '--metric', 'applications', stdout=out)
+        self.assertIn('applications: 0 day(s)', out.getvalue())
+
+    def test_backfill_recomputes_days_already_done(self):
+        call_command('rollup_daily', stdout=StringIO())
+        MembershipApplication.objects.filter(region='mbeya').update(region='arusha')
+        call_command('rollup_daily', '--backfill', stdout=StringIO())
+        self.assertNotIn('mbeya', {value for _, value in self.counts()})
+        self.assertEqual(sum(self.counts('gender').values()), 4)
+
+    def test_dashboard_endpoint_reads_only_rollups(self):
+        call_command('rollup_daily', stdout=StringIO())
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(2):  # the session user, then the rollup rows
+            data = self.client.get('/dashboard/analytics/', {'dimension': 'region', 'days': 7}).json()
+        self.assertEqual(len(data['days']), 7)
+        self.assertEqual(data['series']['arusha'][-3:], [2, 0, 1])
+        self.assertEqual(self.client.get('/dashboard/analytics/', {'dimension': 'shoe_size'}).status_code, 400)
+
+
+class RunConcurrentlyTests(SimpleTestCase):
+    def test_each_thread_releases_its_connections(self):
+        def fail():
+            raise ValueError
+
+        with mock.patch('pages.views.concurrency.close_old_connections') as close_old_connections:
+            self.assertEqual(async_to_sync(concurrency.run_concurrently)(lambda: 1, lambda: 2), [1, 2])
+            with self.assertRaises(ValueError):
+                async_to_sync(concurrency.run_concurrently)(fail)
+        self.assertEqual(close_old_connections.call_count, 3)
+
+
+class FastJsonResponseTests(SimpleTestCase):
+    def test_encodes_uuid_decimal_and_datetimes(self):
+        when = timezone.now()
+        event_id = uuid.uuid4()
+        response = FastJsonResponse({'id': event_id, 'price': Decimal('12.50'), 'when': when, 'day': when.date()})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = json.loads(response.content)
+        self.assertEqual(data['id'], str(event_id))
+        self.assertEqual(data['price'], '12.50')
+        self.assertEqual(parse_datetime(data['when']).replace(microsecond=0), when.replace(microsecond=0))
+        self.assertEqual(data['day'], when.date().isoformat())
+
+    def test_stdlib_fallback_matches(self):
+        payload = {'id': uuid.UUID(int=1), 'price': Decimal('3.00'), 'items': [1, 'two', None]}
+        with mock.patch('core.responses.dumps', lambda data: json.dumps(data, cls=DjangoJSONEncoder).encode()):
+            fallback = json.loads(FastJsonResponse(payload).content)
+        self.assertEqual(json.loads(FastJsonResponse(payload).content), fallback)
+
+    def test_refuses_non_dict_unless_unsafe(self):
+        with self.assertRaises(TypeError):
+            FastJsonResponse([1, 2])
+        self.assertEqual(json.loads(FastJsonResponse([1, 2], safe=False).content), [1, 2])
+
+
+@override_settings(COMPRESS_MIN_SIZE=200)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def respond(self, body, accept='gzip, deflate', content_type='application/json'):
+        request = RequestFactory().get('/', headers={'Accept-Encoding': accept})
+        middleware = CompressionMiddleware(lambda request: HttpResponse(body, content_type=content_type))
+        return middleware(request)
+
+    def test_large_json_is_gzipped(self):
+        body = json.dumps([{'title': 'Event', 'n': i} for i in range(100)])
+        response = self.respond(body)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content).decode(), body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_or_unaccepted_bodies_are_left_alone(self):
+        self.assertFalse(self.respond('{"ok": true}').has_header('Content-Encoding'))
+        self.assertFalse(self.respond('x' * 500, accept='gzip;q=0').has_header('Content-Encoding'))
+        self.assertFalse(self.respond('x' * 500, content_type='image/png').has_header('Content-Encoding'))
+
+    def test_brotli_preferred_when_available(self):
+        fake = mock.Mock(compress=lambda data, quality: b'br:' + data[:10])
+        with mock.patch('core.middleware.brotli', fake):
+            self.assertEqual(self.respond('x' * 500, accept='gzip, br')['Content-Encoding'], 'br')
+            self.assertEqual(self.respond('x' * 500, accept='gzip')['Content-Encoding'], 'gzip')
+
+
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        user = User.objects.create(username='subscriber', first_name='Zawadi')
+        cls.member = CustomUser.objects.create(user=user, is_community_member=True)
+        cls.booked = Event.objects.create(
+            title='Data, Science; and more', description='Line one\nLine two ' + 'long ' * 30,
+            location='Dar es Salaam', date_time=now + timedelta(days=3),
+        )
+        cls.other = Event.objects.create(title='Meetup', description='', location='Arusha', date_time=now + timedelta(days=9))
+        Event.objects.create(title='Ancient', description='', location='Tanga', date_time=now - timedelta(days=90))
+        EventBooking.objects.create(event=cls.booked, user=cls.member)
+        EventBooking.objects.create(event=cls.other, user=cls.member, status='cancelled')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_site_feed_is_valid_ical(self):
+        response = self.client.get('/calendar/events.ics')
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+        self.assertIn('SUMMARY:Data\\, Science\; and more', body)
+        self.assertNotIn('Ancient', body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+
+    def test_site_feed_is_cached_and_revalidated_until_an_event_changes(self):
+        etag = self.client.get('/calendar/events.ics')['ETag']
+        # One aggregate for the version; the feed itself comes from the cache, built once per request
+        with self.assertNumQueries(1):
+            response = self.client.get('/calendar/events.ics', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        event = Event.objects.get(pk=self.other.pk)
+        event.location = 'Moshi'
+        event.save()
+        response = self.client.get('/calendar/events.ics', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_site_feed_notices_changes_made_elsewhere(self):
+        etag = self.client.get('/calendar/events.ics')['ETag']
+        # No signal fires for these, as for a save in another worker with its own cache
+        Event.objects.filter(pk=self.other.pk).update(title='Renamed', updated_at=timezone.now())
+        self.assertIn('SUMMARY:Renamed', self.client.get('/calendar/events.ics').content.decode())
+        Event.objects.filter(pk=self.other.pk).delete()
+        response = self.client.get('/calendar/events.ics')
+        self.assertNotIn('Renamed', response.content.decode())
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_member_feed_lists_confirmed_bookings_in_one_query(self):
+        self.client.force_login(self.member.user)
+        url = self.client.get('/community/').context['member_calendar_url']
+        self.client.logout()
+        with self.assertNumQueries(1):
+            body = self.client.get(url).content.decode()
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        self.assertIn(f'UID:{self.booked.id}@visionhub', body)
+
+    def test_member_feed_rejects_forged_tokens(self):
+        self.assertEqual(self.client.get(f'/calendar/member/{self.member.pk}:forged.ics').status_code, 404)
+
+
+@override_settings(CHECKIN_DEVICE_KEYS=['door-key'])
+class CheckInTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = Event.objects.create(title='Demo day', description='', location='Dodoma', date_time=timezone.now())
+        cls.other_event = Event.objects.create(title='Hack night', description='', location='Dodoma')
+        cls.bookings = []
+        for index in range(3):
+            user = User.objects.create(username=f'guest{index}')
+            member = CustomUser.objects.create(user=user, is_community_member=True)
+            cls.bookings.append(EventBooking.objects.create(event=cls.event, user=member))
+        cls.cancelled = EventBooking.objects.create(
+            event=cls.other_event, user=cls.bookings[0].user, status='cancelled'
+        )
+
+    def scan(self, path, payload, key='door-key'):
+        return self.client.post(
+            path, data=payload, content_type='application/json', headers={'Authorization': f'Bearer {key}'}
+        )
+
+    def test_member_can_fetch_their_own_ticket_again(self):
+        booking = self.bookings[0]
+        self.client.force_login(booking.user.user)
+        response = self.client.get(f'/api/events/{self.event.id}/ticket/')
+        self.assertEqual(response.json()['checkin_token'], checkin.checkin_token(booking))
+        self.assertEqual(checkin.booking_id(response.json()['checkin_token']), str(booking.pk))
+        # A cancelled booking has no ticket
+        self.assertEqual(self.client.get(f'/api/events/{self.other_event.id}/ticket/').status_code, 404)
+
+        self.client.force_login(User.objects.create(username='stranger'))
+        self.assertEqual(self.client.get(f'/api/events/{self.event.id}/ticket/').status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(f'/api/events/{self.event.id}/ticket/').status_code, 302)
+
+    def test_check_in_is_a_single_query(self):
+        token = checkin.checkin_token(self.bookings[0])
+        with self.assertNumQueries(1):
+            response = self.scan('/api/checkin/', {'token': token, 'event_id': str(self.event.id)})
+        self.assertEqual(response.json()['result'], checkin.CHECKED_IN)
+        booking = EventBooking.objects.get(pk=self.bookings[0].pk)
+        self.assertEqual(booking.status, 'attended')
+        self.assertIsNotNone(booking.checked_in_at)
+
+        response = self.scan('/api/checkin/', {'token': token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['result'], checkin.ALREADY_CHECKED_IN)
+
+    def test_rejected_scans(self):
+        response = self.scan('/api/checkin/', {'token': f'{self.bookings[0].pk}:forged'})
+        self.assertEqual(response.status_code, 400)
+        response = self.scan('/api/checkin/', {'token': checkin.checkin_token(self.cancelled)})
+        self.assertEqual((response.status_code, response.json()['result']), (409, checkin.NOT_CONFIRMED))
+        response = self.scan(
+            '/api/checkin/', {'token': checkin.checkin_token(self.bookings[1]), 'event_id': str(self.other_event.id)}
+        )
+        self.assertEqual(response.json()['result'], checkin.WRONG_EVENT)
+        self.assertEqual(self.scan('/api/checkin/', {}, key='stolen').status_code, 401)
+
+    def test_event_id_is_parsed_as_a_uuid(self):
+        token = checkin.checkin_token(self.bookings[2])
+        for event_id in ('not-a-uuid', ['a'], {'id': 1}):
+            self.assertEqual(self.scan('/api/checkin/', {'token': token, 'event_id': event_id}).status_code, 400)
+            self.assertEqual(
+                self.scan('/api/checkin/batch/', {'event_id': event_id, 'scans': [{'token': token}]}).status_code, 400
+            )
+        # The same event written without dashes is the same event, on the first scan and on a rescan
+        for result in (checkin.CHECKED_IN, checkin.ALREADY_CHECKED_IN):
+            response = self.scan('/api/checkin/', {'token': token, 'event_id': self.event.id.hex})
+            self.assertEqual((response.status_code, response.json()['result']), (200, result))
+
+    def test_batch_sync_is_idempotent(self):
+        scanned_at = timezone.now() - timedelta(minutes=20)
+        first, second, _ = (checkin.checkin_token(booking) for booking in self.bookings)
+        payload = {'event_id': str(self.event.id), 'scans': [
+            {'token': first, 'scanned_at': scanned_at.isoformat()},
+            {'token': second},
+            {'token': first},
+            {'token': 'garbage'},
+        ]}
+        response = self.scan('/api/checkin/batch/', payload)
+        self.assertEqual(response.json()['checked_in'], 2)
+        self.assertEqual([item['result'] for item in response.json()['results']], [
+            checkin.CHECKED_IN, checkin.CHECKED_IN, checkin.ALREADY_CHECKED_IN, checkin.INVALID_TOKEN,
+        ])
+        self.assertEqual(EventBooking.objects.get(pk=self.bookings[0].pk).checked_in_at, scanned_at)
+        self.assertEqual(EventBooking.objects.get(pk=self.bookings[2].pk).status, 'confirmed')
+
+        # A device that never saw the response resends the same batch
+        response = self.scan('/api/checkin/batch/', payload)
+        self.assertEqual(response.json()['checked_in'], 0)
+        self.assertEqual(response.json()['results'][1]['result'], checkin.ALREADY_CHECKED_IN)
+        self.assertEqual(EventBooking.objects.get(pk=self.bookings[0].pk).checked_in_at, scanned_at)
+
+
+class DuplicateDetectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create(username='reviewer', is_staff=True, is_superuser=True)
+        cls.original = cls.apply('juma@example.com', 'Juma', 'Mwinyi', '0712 345 678', '19900102-12345-00001-23')
+        # Reapplied with a new address, names swapped, phone in international form, one ID digit wrong
+        cls.reapplied = cls.apply('juma.m@example.com', 'MWINYI', 'Juma', '+255712345678', '19900102-12345-00007-23')
+        # Same birthday, nothing else in common
+        cls.apply('asha@example.com', 'Asha', 'Said', '0755 000 111', '19900102-99999-00001-55')
+
+    @staticmethod
+    def apply(email, first_name, last_name, phone, id_number, date_of_birth='1990-01-02'):
+        return MembershipApplication.objects.create(
+            first_name=first_name, last_name=last_name, email=email, phone=phone,
+            date_of_birth=date_of_birth, gender='male', id_number=id_number, current_address='Moshi',
+            region='other', district='Moshi', education='diploma', occupation='Driver',
+            why_join='Learn', contribution='Time', expectations='Growth',
+        )
+
+    def test_within_one_edit(self):
+        self.assertTrue(dedup.within_one_edit('ABC123', 'ABC124'))
+        self.assertTrue(dedup.within_one_edit('ABC123', 'ABC1234'))
+        self.assertTrue(dedup.within_one_edit('ABC123', 'ABC213'))
+        self.assertFalse(dedup.within_one_edit('ABC123', 'ABC456'))
+
+    def test_finds_reapplicants_incrementally(self):
+        self.assertEqual(dedup.find_duplicates(batch_size=2), (3, 1))
+        candidate = DuplicateCandidate.objects.get()
+        self.assertEqual((candidate.first_id, candidate.second_id), (self.original.pk, self.reapplied.pk))
+        self.assertEqual(candidate.reasons, 'id_number,name_dob,phone')
+
+        self.assertEqual(dedup.find_duplicates(), (0, 0))
+        typo = self.apply('asha.s@example.com', 'Asha', 'Saidi', '0766 222 333', '1990010299999000015')
+        self.assertEqual(dedup.find_duplicates(), (1, 1))
+        self.assertEqual(DuplicateCandidate.objects.get(second=typo).reasons, 'id_number')
+
+        # One digit off someone else's ID but nothing else in common: a neighbour, not a typo
+        self.apply('neema@example.com', 'Neema', 'Kweka', '0788 444 555', '19900102-12345-00001-24', '1985-06-30')
+        self.assertEqual(dedup.find_duplicates(), (1, 0))
+
+    def test_rekey_pairs_with_newer_applications(self):
+        dedup.find_duplicates()
+        # As when it comes back from the archive
+        ApplicationBlockingKey.objects.filter(application=self.original).delete()
+        DuplicateCandidate.objects.all().delete()
+        self.assertEqual(dedup.rekey(self.original.pk), 1)
+        self.assertEqual(DuplicateCandidate.objects.get().second_id, self.reapplied.pk)
+        # Not reached by find_duplicates yet: left for it
+        later = self.apply('later@example.com', 'Juma', 'Mwinyi', '0712 345 678', '19900102-12345-00001-23x')
+        self.assertEqual(dedup.rekey(later.pk), 0)
+        self.assertFalse(ApplicationBlockingKey.objects.filter(application=later).exists())
+
+    def test_edits_to_keyed_fields_rekey(self):
+        dedup.find_duplicates()
+        asha = MembershipApplication.objects.get(email='asha@example.com')
+        asha.phone = '+255 712 345 678'
+        asha.save()
+        self.assertEqual(
+            set(DuplicateCandidate.objects.filter(second=asha).values_list('first_id', 'reasons')),
+            {(self.original.pk, 'phone'), (self.reapplied.pk, 'phone')},
+        )
+        # Reverted: the pending pair goes, the reviewed one stays
+        DuplicateCandidate.objects.filter(first=self.original, second=asha).update(status='distinct')
+        asha.phone = '0755 000 111'
+        asha.save()
+        self.assertEqual(list(DuplicateCandidate.objects.filter(second=asha).values_list('first_id', 'status')),
+                         [(self.original.pk, 'distinct')])
+
+        # The update, then last keyed, the row and its keys; unchanged, so nothing is written
+        with self.assertNumQueries(4):
+            asha.save(update_fields=['occupation', 'phone'])
+        with self.assertNumQueries(1):
+            asha.save(update_fields=['status'])
+
+    def test_rebuild_keeps_review_decisions(self):
+        dedup.find_duplicates()
+        DuplicateCandidate.objects.update(status='distinct')
+        out = StringIO()
+        call_command('find_duplicate_applications', '--rebuild', stdout=out)
+        self.assertIn('3 application(s) checked', out.getvalue())
+        self.assertEqual(DuplicateCandidate.objects.get().status, 'distinct')
+
+    def test_admin_review_queue(self):
+        dedup.find_duplicates()
+        self.client.force_login(self.staff)
+        with self.assertNumQueries(3):
+            response = self.client.get('/admin/pages/duplicatecandidate/')
+        self.assertContains(response, 'juma.m@example.com')
+        pk = DuplicateCandidate.objects.get().pk
+        self.client.post('/admin/pages/duplicatecandidate/', {'action': 'mark_duplicate', '_selected_action': [pk]})
+        candidate = DuplicateCandidate.objects.get()
+        self.assertEqual(candidate.status, 'duplicate')
+        self.assertIsNotNone(candidate.reviewed_at)
+        self.assertContains(self.client.get(f'/admin/pages/duplicatecandidate/{pk}/change/'), '<th>Id number</th>')
+
+
+class ApplicationSkillTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='staffer', is_superuser=True, is_staff=True)
+        cls.swahili_python = cls.apply('a@example.com', 'mwanza', 'approved', [' Python', 'SQL'], ['Swahili'])
+        cls.apply('b@example.com', 'mwanza', 'approved', ['python'], ['English'])
+        cls.apply('c@example.com', 'arusha', 'approved', ['Python'], ['swahili'])
+        cls.apply('d@example.com', 'mwanza', 'pending', ['Python'], ['Swahili'])
+
+    @staticmethod
+    def apply(email, region, status, skill_list, language_list):
+        return MembershipApplication.objects.create(
+            first_name='Volunteer', last_name=email[0], email=email, phone='0700000000',
+            date_of_birth='1995-05-05', gender='female', id_number=email, current_address='Mwanza',
+            region=region, district='Nyamagana', education='bachelor', occupation='Teacher',
+            skills=skill_list, languages=language_list, why_join='Help', contribution='Time',
+            expectations='Growth', status=status,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tags_follow_the_json_lists(self):
+        self.assertEqual(
+            set(self.swahili_python.tags.values_list('kind', 'value')),
+            {('skill', 'python'), ('skill', 'sql'), ('language', 'swahili')},
+        )
+        self.swahili_python.skills = ['Python', 'Data  Analysis']
+        self.swahili_python.save()
+        self.assertEqual(
+            set(self.swahili_python.tags.filter(kind='skill').values_list('value', flat=True)), {'python', 'data analysis'}
+        )
+        with self.assertNumQueries(1):
+            self.swahili_python.save(update_fields=['status'])
+
+    def test_non_list_values_are_tagged_sensibly(self):
+        bare = self.apply('e@example.com', 'mwanza', 'pending', 'Python', {'Swahili': True})
+        self.assertEqual(set(bare.tags.values_list('kind', 'value')), {('skill', 'python')})
+        numeric = self.apply('f@example.com', 'mwanza', 'pending', 5, 7)
+        self.assertFalse(numeric.tags.exists())
+
+    def test_migration_backfill_reads_non_list_values_like_sync(self):
+        backfill_tags = import_module('pages.migrations.0011_application_tags').backfill_tags
+        bare = self.apply('e@example.com', 'mwanza', 'pending', 'Python', 5)
+        ApplicationTag.objects.all().delete()
+        backfill_tags(django_apps, None)
+        self.assertEqual(set(bare.tags.values_list('kind', 'value')), {('skill', 'python')})
+        self.assertEqual(ApplicationTag.objects.count(), 10)
+
+    def test_join_normalizes_skills(self):
+        payload = {
+            'first_name': 'New', 'last_name': 'Volunteer', 'phone': '0711111111', 'date_of_birth': '1998-05-05',
+            'gender': 'male', 'current_address': 'Arusha', 'region': 'arusha', 'district': 'Arusha City',
+            'education': 'diploma', 'occupation': 'Designer', 'why_join': 'Community', 'contribution': 'Design',
+            'expectations': 'Network', 'agree_terms': True,
+        }
+        for email, skills_field, tags in [
+            ('one@example.com', 5, set()),
+            ('two@example.com', '"python"', {'python'}),
+            ('three@example.com', '["Python", 7, "SQL"]', {'python', 'sql'}),
+            ('four@example.com', 'Data analysis', {'data analysis'}),
+        ]:
+            response = self.client.post('/join/', {**payload, 'email': email, 'id_number': email, 'skills': skills_field},
+                                        content_type='application/json')
+            self.assertTrue(response.json()['success'])
+            application = MembershipApplication.objects.get(email=email)
+            self.assertEqual(set(application.tags.values_list('value', flat=True)), tags)
+
+    def test_rebuild(self):
+        ApplicationTag.objects.all().delete()
+        call_command('rebuild_application_tags', stdout=StringIO())
+        self.assertEqual(ApplicationTag.objects.count(), 9)
+
+    def test_staff_search_matches_every_filter(self):
+        self.client.force_login(self.admin)
+        with self.assertNumQueries(4):  # session user, page, skill and language facets
+            response = self.client.get(
+                '/api/applicants/search/', {'status': 'approved', 'region': 'mwanza', 'skill': 'PYTHON', 'language': 'Swahili'}
+            )
+        body = response.json()
+        self.assertEqual([row['email'] for row in body['results']], ['a@example.com'])
+        self.assertEqual(body['facets']['skills'], [{'value': 'python', 'count': 1}, {'value': 'sql', 'count': 1}])
+
+        facets = self.client.get('/api/applicants/search/', {'language': 'swahili'}).json()['facets']
+        self.assertEqual(facets['skills'][0], {'value': 'python', 'count': 3})
+        self.assertEqual(response['Cache-Control'], 'max-age=0, no-cache, no-store, must-revalidate, private')
+        self.assertEqual(self.client.get('/api/applicants/search/', {'region': 'nowhere'}).status_code, 400)
+
+    def test_staff_search_is_admin_only(self):
+        self.assertEqual(self.client.get('/api/applicants/search/').status_code, 302)
+
+    def test_admin_filters(self):
+        self.client.force_login(self.admin)
+        response = self.client.get('/admin/pages/membershipapplication/', {'skill': 'sql'})
+        self.assertEqual([obj.email for obj in response.context['cl'].result_list], ['a@example.com'])
+        self.assertContains(response, '?language=english')
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create(username='root', is_superuser=True)
+
+    def _value(self, metric, *labels):
+        return metrics.snapshot().get((metric.name, labels), 0)
+
+    def test_requests_and_queries_are_counted_per_view(self):
+        responses = self._value(metrics.RESPONSES, 'about', 'GET', '200')
+        queries = self._value(metrics.DB_QUERIES, 'about')
+        self.client.get('/about/')
+        self.assertEqual(self._value(metrics.RESPONSES, 'about', 'GET', '200'), responses + 1)
+        self.assertGreater(self._value(metrics.DB_QUERIES, 'about'), queries)
+        self.client.get('/no-such-page/')
+        self.assertGreaterEqual(self._value(metrics.RESPONSES, 'unmatched', 'GET', '404'), 1)
+
+    def test_endpoint_requires_token_or_admin(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+
+        with override_settings(METRICS_TOKEN='scrape-me'):
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-me')
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn('# TYPE visionhub_http_request_duration_seconds histogram', body)
+        self.assertRegex(body, r'visionhub_http_request_duration_seconds_bucket\{view="metrics",le="\+Inf"\} \d+')
+        self.assertIn('visionhub_community_stats_age_seconds', body)
+
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_workers_are_summed_and_exited_ones_retired(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        chat = [metrics.CHAT_MESSAGES.name, [], 2]
+        lookups = [metrics.CACHE_LOOKUPS.name, ['ical_feed', 'hit'], 3]
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            # A live worker (this test's parent process) and one that has exited
+            Path(directory, f'{os.getppid()}.json').write_text(json.dumps([chat, lookups]))
+            Path(directory, f'{exited.pid}.json').write_text(json.dumps([chat]))
+            own = self._value(metrics.CHAT_MESSAGES)
+
+            body = metrics.render()
+            self.assertIn(f'visionhub_chat_messages_total {own + 4}', body)
+            self.assertIn('visionhub_metrics_processes 2', body)
+            self.assertIn('visionhub_cache_hit_ratio{cache="ical_feed"}', body)
+            self.assertFalse(Path(directory, f'{exited.pid}.json').exists())
+            self.assertIn(f'visionhub_chat_messages_total {own + 4}', metrics.render())
+
+            metrics.flush()
+            self.assertTrue(Path(directory, f'{os.getpid()}.json').exists())
+
+
+class ProfilerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='root', is_superuser=True, is_staff=True)
+        cls.member = User.objects.create(username='member')
+        CustomUser.objects.create(user=cls.member, is_community_member=True)
+
+    def test_admin_token_profiles_one_request(self):
+        self.client.force_login(self.admin)
+        token = profiling.profile_token(self.admin)
+        response = self.client.get('/about/', {'_profile': token})
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile'], f'/admin/pages/requestprofile/{profile.pk}/change/')
+        self.assertEqual((profile.path, profile.view, profile.status_code, profile.user), ('/about/', 'about', 200, self.admin))
+        self.assertGreater(profile.query_count, 0)
+
+        self.client.get('/about/', HTTP_X_PROFILE_TOKEN=token)
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        self.assertNotIn('X-Profile', self.client.get('/about/'))
+
+    def test_token_only_works_for_its_admin(self):
+        self.client.force_login(self.member)
+        self.client.get('/about/', {'_profile': profiling.profile_token(self.member)})
+        self.client.get('/about/', {'_profile': profiling.profile_token(self.admin)})
+        self.client.force_login(self.admin)
+        self.client.get('/about/', {'_profile': profiling.profile_token(self.member)})
+        self.client.get('/about/', {'_profile': 'forged'})
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_sampler_records_folded_stacks(self):
+        def busy_wait():
+            deadline = clock.perf_counter() + 0.05
+            while clock.perf_counter() < deadline:
+                pass
+
+        with profiling.Sampler(threading.get_ident(), 0.001) as sampler:
+            busy_wait()
+        self.assertTrue(any(stack.endswith('busy_wait (pages/tests.py:%d)' % busy_wait.__code__.co_firstlineno)
+                            for stack in sampler.stacks))
+        tree = profiling.call_tree(sampler.stacks)
+        self.assertEqual(sum(node[0] for node in tree.values()), sum(sampler.stacks.values()))
+
+    async def test_asgi_samples_the_thread_running_the_view(self):
+        def busy_count():
+            deadline = clock.perf_counter() + 0.05
+            while clock.perf_counter() < deadline:
+                pass
+            return 0
+
+        await self.async_client.aforce_login(self.admin)
+        with mock.patch('pages.views.home._community_member_count', busy_count):
+            response = await self.async_client.get('/about/', {'_profile': profiling.profile_token(self.admin)})
+        profile = await RequestProfile.objects.aget()
+        self.assertEqual(response['X-Profile'], f'/admin/pages/requestprofile/{profile.pk}/change/')
+        stacks = await sync_to_async(profiling.load_stacks)(profile)
+        self.assertTrue(any('about (pages/views/home.py' in stack and 'busy_count' in stack for stack in stacks))
+        # Nothing from the event loop waiting for the view
+        self.assertFalse(any('base_events.py' in stack or 'selectors.py' in stack for stack in stacks))
+
+    @override_settings(PROFILE_RETENTION_COUNT=2)
+    def test_retention_and_admin_view(self):
+        self.client.force_login(self.admin)
+        token = profiling.profile_token(self.admin)
+        for _ in range(3):
+            self.client.get('/about/', {'_profile': token})
+        self.assertEqual(RequestProfile.objects.count(), 2)
+
+        profile = RequestProfile.objects.first()
+        self.assertContains(self.client.get(f'/admin/pages/requestprofile/{profile.pk}/change/'), 'Hot frames')
+        folded = self.client.get(f'/admin/pages/requestprofile/{profile.pk}/folded/')
+        self.assertEqual(folded['Content-Disposition'], f'attachment; filename="profile-{profile.pk}.folded"')
+        self.assertContains(self.client.get('/admin/pages/requestprofile/'), '<code>?_profile=1:')
+
+
+class EventReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.soon = Event.objects.create(title='Pitch night', description='', location='Arusha',
+                                        date_time=now + timedelta(minutes=30))
+        cls.tomorrow = Event.objects.create(title='Demo day', description='', location='Dodoma', is_online=True,
+                                            date_time=now + timedelta(hours=20))
+        later = Event.objects.create(title='Retreat', description='', location='Moshi', date_time=now + timedelta(days=3))
+        cancelled = Event.objects.create(title='Cancelled', description='', location='Moshi', status='cancelled',
+                                         date_time=now + timedelta(minutes=30))
+        cls.members = []
+        for index in range(3):
+            user = User.objects.create(username=f'member{index}', first_name=f'Member{index}',
+                                       email=f'member{index}@example.com')
+            cls.members.append(CustomUser.objects.create(user=user, is_community_member=True))
+        for member in cls.members:
+            for event in (cls.soon, later, cancelled):
+                EventBooking.objects.create(event=event, user=member)
+        EventBooking.objects.create(event=cls.tomorrow, user=cls.members[0])
+        EventBooking.objects.create(event=cls.tomorrow, user=cls.members[1], status='cancelled')
+        no_email = CustomUser.objects.create(user=User.objects.create(username='no-email'))
+        EventBooking.objects.create(event=cls.soon, user=no_email)
+
+    def test_each_due_reminder_is_sent_once(self):
+        self.assertEqual(reminders.send_due(), {'hour': 3, 'day': 1})
+        self.assertEqual(len(mail.outbox), 4)
+        day = next(message for message in mail.outbox if 'Demo day' in message.subject)
+        self.assertEqual(day.to, ['member0@example.com'])
+        self.assertIn('Hi Member0,', day.body)
+        self.assertIn('Where: Online', day.body)
+        booking = EventBooking.objects.get(event=self.tomorrow, user=self.members[0])
+        self.assertIn(f'Check-in code: {checkin.checkin_token(booking)}', day.body)
+
+        self.assertEqual(reminders.send_due(), {'hour': 0, 'day': 0})
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(EventReminder.objects.filter(kind=EventReminder.HOUR).count(), 3)
+
+    def test_day_reminder_becomes_hour_reminder(self):
+        reminders.send_due()
+        # 19.5 hours on, Demo day starts within the hour and only the hour reminder is new
+        self.assertEqual(reminders.send_due(now=timezone.now() + timedelta(hours=19, minutes=30)), {'hour': 1, 'day': 0})
+
+    def test_queries_per_batch_not_per_attendee(self):
+        # 4 per batch (savepoint, select, insert, release): two hour batches, one day batch,
+        # and 3 per kind for the final empty batch
+        with self.assertNumQueries(3 * 4 + 2 * 3):
+            reminders.send_due(batch_size=2)
+
+    def test_failed_send_keeps_only_delivered_records(self):
+        connection = mail.get_connection()
+        delivered = []
+
+        def send_messages(messages):
+            if delivered:
+                raise OSError('SMTP connection lost')
+            delivered.extend(messages)
+            return len(messages)
+
+        with mock.patch.object(connection, 'send_messages', side_effect=send_messages):
+            with self.assertRaises(OSError):
+                reminders.send_reminders(EventReminder.HOUR, connection)
+        self.assertEqual(EventReminder.objects.filter(kind=EventReminder.HOUR).count(), 1)
+
+        # The rerun sends the two that failed, and not the one that went out
+        self.assertEqual(reminders.send_due(), {'hour': 2, 'day': 1})
+        self.assertNotIn((delivered[0].to, delivered[0].subject), [(message.to, message.subject) for message in mail.outbox])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('send_event_reminders', stdout=out)
+        self.assertEqual(out.getvalue(), 'hour: 3 reminder(s) sent\nday: 1 reminder(s) sent\n')
+
+
+class ReviewQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create(username='alice', is_staff=True, is_superuser=True)
+        cls.bob = User.objects.create(username='bob', is_staff=True, is_superuser=True)
+        cls.applications = [
+            MembershipApplication.objects.create(
+                first_name='Applicant', last_name=str(i), email=f'applicant{i}@example.com', phone='0700',
+                date_of_birth='1995-05-05', gender='female', id_number=f'REVIEW-{i}', current_address='Mwanza',
+                region='mwanza', district='Ilemela', education='degree', occupation='Nurse',
+                why_join='Serve', contribution='Time', expectations='Growth',
+            )
+            for i in range(7)
+        ]
+
+    def ids(self, applications):
+        return [application.pk for application in applications]
+
+    def test_reviewers_never_share_applications(self):
+        first = review_queue.claim(self.alice, 3)
+        second = review_queue.claim(self.bob, 3)
+        self.assertEqual(self.ids(first), self.ids(self.applications[:3]))
+        self.assertEqual(self.ids(second), self.ids(self.applications[3:6]))
+
+        # Claiming again keeps what is held and tops it up
+        self.assertEqual(self.ids(review_queue.claim(self.alice, 5)), self.ids(self.applications[:3] + self.applications[6:]))
+        self.assertEqual(review_queue.release(self.bob), 3)
+        self.assertEqual(self.ids(review_queue.claim(self.alice, 5)), self.ids(self.applications[:4] + self.applications[6:]))
+
+    @override_settings(REVIEW_LEASE_SECONDS=60)
+    def test_lapsed_leases_return_to_the_queue(self):
+        earlier = timezone.now() - timedelta(seconds=61)
+        review_queue.claim(self.alice, 2, now=earlier)
+        self.assertFalse(review_queue.claimed(self.alice).exists())
+        self.assertEqual(self.ids(review_queue.claim(self.bob, 2)), self.ids(self.applications[:2]))
+        self.assertFalse(review_queue.decide(self.alice, self.applications[0].pk, 'approved'))
+        self.assertTrue(review_queue.decide(self.bob, self.applications[0].pk, 'approved'))
+
+    def test_views(self):
+        self.client.force_login(self.alice)
+        # Session user, then the claim: savepoint, refresh, select, update, release, and the list
+        with self.assertNumQueries(7):
+            response = self.client.post('/api/review-queue/claim/', {'count': 2}, content_type='application/json')
+        self.assertEqual([row['id'] for row in response.json()['applications']], self.ids(self.applications[:2]))
+        self.assertContains(self.client.get('/dashboard/'), 'applicant1@example.com')
+
+        decide = f'/api/review-queue/{self.applications[0].pk}/decide/'
+        self.assertEqual(self.client.post(decide, {'status': 'maybe'}, content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.post(decide, {'status': 'rejected'}, content_type='application/json').json(),
+                         {'success': True, 'id': self.applications[0].pk, 'status': 'rejected'})
+        self.assertEqual(MembershipApplication.objects.get(pk=self.applications[0].pk).status, 'rejected')
+
+        # Bob never claimed it, and nobody can decide it twice
+        self.client.force_login(self.bob)
+        for pk in (self.applications[1].pk, self.applications[0].pk):
+            response = self.client.post(f'/api/review-queue/{pk}/decide/', {'status': 'approved'}, content_type='application/json')
+            self.assertEqual(response.status_code, 409)
+
+        self.client.logout()
+        self.assertEqual(self.client.post('/api/review-queue/claim/', content_type='application/json').status_code, 403)
+
+
+class StartupTests(SimpleTestCase):
+    """Cold-start regressions, measured in fresh interpreters (see core/startup.py)"""
+    # Generous multiples of what a laptop measures; these catch regressions, not noise
+    CHECK_BUDGET_SECONDS = 5
+    WSGI_LOAD_BUDGET_SECONDS = 4
+    # Served from the URLconf, which a worker loads on its first request, not at boot
+    NOT_AT_BOOT = ('pages.urls', 'pages.views', 'pages.api', 'pages.checkin', 'pages.rollups', 'pages.dedup')
+    ENV = {'WARMUP_ON_READY': ''}
+
+    def test_check_and_wsgi_load_times(self):
+        self.assertLess(startup.check_seconds(repeat=1, env=self.ENV), self.CHECK_BUDGET_SECONDS)
+        self.assertLess(startup.wsgi_load_seconds(repeat=1, env=self.ENV), self.WSGI_LOAD_BUDGET_SECONDS)
+
+    def test_boot_imports_no_views(self):
+        modules = {row.module for row in startup.import_times(env=self.ENV)}
+        self.assertIn('pages.models', modules)
+        self.assertEqual(sorted(m for m in modules if m.startswith(self.NOT_AT_BOOT)), [])
+
+    def test_view_modules_import_only_their_area(self):
+        env = {**self.ENV, 'DJANGO_SETTINGS_MODULE': 'core.settings'}
+        modules = {row.module for row in startup.import_times('import django; django.setup(); import pages.views.chat', env)}
+        self.assertIn('pages.views.chat', modules)
+        self.assertFalse({'pages.views.events', 'pages.views.dashboard', 'pages.rollups', 'pages.checkin'} & modules)
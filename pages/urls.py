@@ -1,13 +1,41 @@
 # urls.py (app-level)
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, checkin, feeds, review_queue
+from .views import chat, dashboard, events, home, membership, monitoring
+
+# Under ASGI (see core/asgi.py) the read-heavy pages use their async variants
+if settings.ASYNC_VIEWS:
+    about_view, community_view = home.about_async, events.community_async
+else:
+    about_view, community_view = home.about, events.community
 
 urlpatterns = [
-    path('', views.index, name='index'),
-    path('about/', views.about, name='about'),
-    path('join/', views.join, name='join'),
-    path('join_success/', views.join_success, name='join_success'),
-    path('community/', views.community, name='community'),
-    path('api/chat/', views.api_chat_message, name='api_chat_message'),
-    path('dashboard/',views.dashboard, name='dashboard'),
+    path('', home.index, name='index'),
+    path('about/', about_view, name='about'),
+    path('join/', membership.join, name='join'),
+    path('join_success/', membership.join_success, name='join_success'),
+    path('community/', community_view, name='community'),
+    path('book-event/', events.book_event_view, name='book_event'),
+    path('submit-review/', events.submit_review_view, name='submit_review'),
+    path('calendar/events.ics', feeds.events_calendar, name='events_calendar'),
+    path('calendar/member/<str:token>.ics', feeds.member_calendar, name='member_calendar'),
+    path('api/applicants/search/', api.applicant_search, name='api_applicant_search'),
+    path('api/checkin/', checkin.check_in, name='api_checkin'),
+    path('api/checkin/batch/', checkin.check_in_batch, name='api_checkin_batch'),
+    path('api/chat/', chat.api_chat_message, name='api_chat_message'),
+    path('api/events/', api.events, name='api_events'),
+    path('api/events/search/', api.event_search, name='api_event_search'),
+    path('api/events/<uuid:event_id>/ticket/', checkin.ticket, name='api_event_ticket'),
+    path('api/reviews/', api.reviews, name='api_reviews'),
+    path('api/review-queue/claim/', review_queue.claim_view, name='api_review_claim'),
+    path('api/review-queue/release/', review_queue.release_view, name='api_review_release'),
+    path('api/review-queue/<int:pk>/decide/', review_queue.decide_view, name='api_review_decide'),
+    path('dashboard/',dashboard.dashboard, name='dashboard'),
+    path('dashboard/analytics/', dashboard.analytics_view, name='admin_analytics'),
+    path('dashboard/events/', dashboard.admin_events_view, name='admin_events'),
+    path('dashboard/events/create/', dashboard.create_event_view, name='create_event'),
+    path('dashboard/members/', dashboard.admin_members_view, name='admin_members'),
+    path('dashboard/team/', dashboard.admin_team_view, name='admin_team'),
+    path('metrics', monitoring.metrics_view, name='metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""
+Views, one module per area of the site:
+
+* ``home``: home and about pages, error handlers
+* ``events``: the community hub, event booking and reviews
+* ``membership``: the membership application form
+* ``dashboard``: the staff dashboard and its management pages
+* ``chat``: the chat widget's endpoint
+* ``monitoring``: the Prometheus scrape endpoint
+
+pages/urls.py imports the modules it routes to. Nothing is re-exported
+here, so importing one area never pulls in the others' dependencies.
+"""
@@ -0,0 +1,54 @@
+import json
+import logging
+
+from django.views.decorators.csrf import csrf_exempt
+
+from core import metrics
+from core.responses import FastJsonResponse
+
+logger = logging.getLogger(__name__)
+
+@csrf_exempt
+def api_chat_message(request):
+    """API endpoint for chat messages (if you want to implement real-time chat)"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            message = data.get('message', '').strip()
+            
+            if not message:
+                return FastJsonResponse({'error': 'Message is required'}, status=400)
+            
+            # Here you would typically save the message and broadcast it
+            # For now, we'll just return a simple response
+            
+            response_message = generate_chat_response(message)
+            metrics.CHAT_MESSAGES.inc()
+            
+            return FastJsonResponse({
+                'success': True,
+                'response': response_message
+            })
+            
+        except json.JSONDecodeError:
+            return FastJsonResponse({'error': 'Invalid JSON'}, status=400)
+        except Exception as e:
+            logger.error(f"Error processing chat message: {str(e)}")
+            return FastJsonResponse({'error': 'Internal server error'}, status=500)
+    
+    return FastJsonResponse({'error': 'Method not allowed'}, status=405)
+
+def generate_chat_response(message):
+    """Generate a simple chat response (you could make this more sophisticated)"""
+    message_lower = message.lower()
+    
+    if any(word in message_lower for word in ['hello', 'hi', 'hey']):
+        return "Hello! Welcome to Vision Hub Tanzania. How can we help you today?"
+    elif any(word in message_lower for word in ['event', 'events']):
+        return "We have several upcoming events! Check out our events section for more details and booking information."
+    elif any(word in message_lower for word in ['join', 'membership']):
+        return "Great to hear you're interested in joining us! Please fill out our membership application form to get started."
+    elif any(word in message_lower for word in ['help', 'support']):
+        return "Our community moderators are here to help! You can also reach out to us directly via email."
+    else:
+        return "Thanks for your message! A community moderator will respond to you soon."
@@ -0,0 +1,27 @@
+"""Helpers for the async views: run independent ORM work in parallel"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def in_own_connection(func):
+    """Wrap an ORM callable to run on a worker thread with its own DB connection"""
+    def run():
+        try:
+            return func()
+        finally:
+            # As at the end of a request: a pooled connection goes back to the pool, a persistent one
+            # stays open for this thread's next call until CONN_MAX_AGE, a broken one is closed
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+async def run_concurrently(*funcs):
+    """Run independent ORM callables at the same time and return their results in order.
+
+    Django's async ORM funnels every query through one thread, so queries
+    awaited together still run one after another; giving each callable its own
+    thread (and therefore its own connection) lets the database overlap them.
+    """
+    return await asyncio.gather(*(in_own_connection(func)() for func in funcs))
@@ -0,0 +1,227 @@
+from datetime import timedelta
+
+from django.contrib import messages
+from django.db.models import Q
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from core.responses import FastJsonResponse
+
+from .. import review_queue, rollups
+from ..auth import admin_required
+from ..models import CommunityReview, CustomUser, Event, EventBooking, MembershipApplication, TeamMember
+from ..paginators import keyset_page
+
+@admin_required
+def dashboard(request):
+    """Admin panel dashboard - only for admins"""
+    # Get dashboard statistics
+    total_members = CustomUser.objects.filter(is_community_member=True).count()
+    pending_applications = MembershipApplication.objects.filter(status='pending').count()
+    total_events = Event.objects.count()
+    upcoming_events = Event.objects.filter(deadline__gte=timezone.now()).count()
+    total_bookings = EventBooking.objects.filter(status='confirmed').count()
+    total_reviews = CommunityReview.objects.count()
+    
+    # The applications this admin holds in the review queue; more are claimed from the page
+    claimed_applications = review_queue.claimed(request.user).only(*review_queue.ROW_FIELDS)
+    
+    recent_bookings = EventBooking.objects.filter(
+        status='confirmed'
+    ).select_related('user__user', 'event').order_by('-booked_at')[:5]
+    
+    context = {
+        'total_members': total_members,
+        'pending_applications': pending_applications,
+        'total_events': total_events,
+        'upcoming_events': upcoming_events,
+        'total_bookings': total_bookings,
+        'total_reviews': total_reviews,
+        'claimed_applications': claimed_applications,
+        'review_batch': review_queue.DEFAULT_CLAIM,
+        'recent_bookings': recent_bookings,
+    }
+    
+    return render(request, 'pages/dashboard.html', context)
+
+@admin_required
+def analytics_view(request):
+    """Chart data for the dashboard, read from the daily rollups"""
+    metric = request.GET.get('metric', 'applications')
+    dimension = request.GET.get('dimension', 'region')
+    if metric not in rollups.METRICS or dimension not in rollups.METRICS[metric].dimensions:
+        return FastJsonResponse({'error': 'Unknown metric or dimension'}, status=400)
+    try:
+        days = max(1, min(int(request.GET.get('days', 90)), 730))
+    except ValueError:
+        return FastJsonResponse({'error': 'days must be an integer'}, status=400)
+    
+    end = rollups.yesterday()
+    data = rollups.chart(metric, dimension, end - timedelta(days=days - 1), end)
+    
+    return FastJsonResponse({'metric': metric, 'dimension': dimension, **data})
+
+def _per_page(request, default=25, maximum=100):
+    try:
+        return max(1, min(int(request.GET.get('per_page', default)), maximum))
+    except ValueError:
+        return default
+
+def _event_row(event):
+    return {
+        'id': str(event.id),
+        'title': event.title,
+        'event_type': event.event_type,
+        'status': event.status,
+        'location': event.location,
+        'date_time': event.date_time,
+        'created_at': event.created_at,
+    }
+
+def _member_row(member):
+    return {
+        'id': member.id,
+        'full_name': member.full_name,
+        'username': member.user.username,
+        'email': member.user.email,
+        'phone': member.phone,
+        'is_admin': member.is_admin,
+        'date_joined_community': member.date_joined_community,
+    }
+
+def _application_row(application):
+    return {
+        'id': application.id,
+        'full_name': application.full_name,
+        'email': application.email,
+        'region': application.region,
+        'created_at': application.created_at,
+    }
+
+def _filtered_events(request):
+    events = Event.objects.all()
+    if request.GET.get('status'):
+        events = events.filter(status=request.GET['status'])
+    if request.GET.get('event_type'):
+        events = events.filter(event_type=request.GET['event_type'])
+    if request.GET.get('q'):
+        events = events.filter(Q(title__icontains=request.GET['q']) | Q(location__icontains=request.GET['q']))
+    return events
+
+def _filtered_members(request):
+    members = CustomUser.objects.filter(is_community_member=True).select_related('user')
+    if request.GET.get('q'):
+        q = request.GET['q']
+        members = members.filter(
+            Q(user__first_name__icontains=q) | Q(user__last_name__icontains=q) |
+            Q(user__username__icontains=q) | Q(user__email__iexact=q)
+        )
+    return members
+
+def _filtered_applications(request):
+    applications = MembershipApplication.objects.filter(status='pending')
+    if request.GET.get('region'):
+        applications = applications.filter(region=request.GET['region'])
+    if request.GET.get('q'):
+        q = request.GET['q']
+        applications = applications.filter(
+            Q(first_name__icontains=q) | Q(last_name__icontains=q) | Q(email__iexact=q)
+        )
+    return applications
+
+def _keyset_json(page, row):
+    return FastJsonResponse({
+        'results': [row(item) for item in page.items],
+        'next_cursor': page.next_cursor,
+    })
+
+@admin_required
+def admin_events_view(request):
+    """Admin events management, newest first, one keyset page at a time"""
+    page = keyset_page(_filtered_events(request), request.GET.get('cursor'), _per_page(request))
+    
+    if request.GET.get('format') == 'json':
+        return _keyset_json(page, _event_row)
+    
+    context = {
+        'events': page.items,
+        'next_cursor': page.next_cursor,
+        'filters': request.GET,
+        'event_types': Event.EVENT_TYPE,
+        'event_statuses': Event.EVENT_STATUS,
+    }
+    
+    return render(request, 'admin/events.html', context)
+
+@admin_required
+def admin_members_view(request):
+    """Admin members management: community members and pending applications, keyset paginated"""
+    per_page = _per_page(request)
+    
+    # JSON: one list at a time, for the "Load more" buttons
+    if request.GET.get('format') == 'json':
+        if request.GET.get('list') == 'applications':
+            page = keyset_page(_filtered_applications(request), request.GET.get('cursor'), per_page)
+            return _keyset_json(page, _application_row)
+        page = keyset_page(
+            _filtered_members(request), request.GET.get('cursor'), per_page, field='date_joined_community'
+        )
+        return _keyset_json(page, _member_row)
+    
+    members = keyset_page(
+        _filtered_members(request), request.GET.get('members_cursor'), per_page, field='date_joined_community'
+    )
+    applications = keyset_page(_filtered_applications(request), request.GET.get('applications_cursor'), per_page)
+    
+    context = {
+        'members': members.items,
+        'members_cursor': members.next_cursor,
+        'pending_applications': applications.items,
+        'applications_cursor': applications.next_cursor,
+        'filters': request.GET,
+        'regions': MembershipApplication.REGION_CHOICES,
+    }
+    
+    return render(request, 'admin/members.html', context)
+
+@admin_required
+def admin_team_view(request):
+    """Admin team management"""
+    team_members = TeamMember.objects.all().order_by('order', 'name')
+    
+    context = {
+        'team_members': team_members,
+    }
+    
+    return render(request, 'admin/team.html', context)
+
+@admin_required
+def create_event_view(request):
+    """Create new event"""
+    if request.method == 'POST':
+        try:
+            event = Event.objects.create(
+                title=request.POST.get('title'),
+                description=request.POST.get('description'),
+                event_type=request.POST.get('event_type'),
+                date_time=request.POST.get('date_time'),
+                deadline=request.POST.get('deadline'),
+                location=request.POST.get('location'),
+                is_online=request.POST.get('is_online') == 'on',
+                max_participants=int(request.POST.get('max_participants') or 0) or None,
+                price=float(request.POST.get('price') or 0),
+                requirements=request.POST.get('requirements', ''),
+                created_by=request.user
+            )
+            
+            messages.success(request, 'Event created successfully!')
+            return redirect('admin_events')
+            
+        except Exception as e:
+            messages.error(request, f'Error creating event: {str(e)}')
+    
+    context = {
+        'event_types': Event.EVENT_TYPE,
+    }
+    
+    return render(request, 'admin/create_event.html', context)
@@ -0,0 +1,220 @@
+import json
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Q
+from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+
+from core import metrics
+from core.responses import FastJsonResponse
+
+from .. import checkin, feeds
+from ..models import CommunityReview, CommunityStats, CustomUser, Event, EventBooking, ReviewSummary
+from .concurrency import run_concurrently
+
+def _upcoming_events():
+    """Upcoming events (not expired)"""
+    return list(Event.objects.filter(
+        deadline__gte=timezone.now(),
+        status='upcoming'
+    ).annotate(
+        confirmed_count=Count('bookings', filter=Q(bookings__status='confirmed'))
+    ).order_by('date_time'))
+
+def _public_reviews():
+    """Recent reviews (public only)"""
+    return list(CommunityReview.objects.filter(
+        is_public=True
+    ).select_related('user__user')[:6])
+
+def _booked_event_ids(user):
+    """IDs of events the user has a confirmed booking for (empty without a profile)"""
+    return list(EventBooking.objects.filter(
+        user__user=user,
+        status='confirmed'
+    ).values_list('event_id', flat=True))
+
+def _member_calendar_url(request, user):
+    """Subscription URL of the member's own booking calendar (no query: the profile is preloaded)"""
+    if not user.is_authenticated:
+        return None
+    try:
+        return feeds.member_feed_url(request, user.customuser)
+    except CustomUser.DoesNotExist:
+        return None
+
+def community(request):
+    """Community hub view with events, stats, and reviews"""
+    user_bookings = []
+    if request.user.is_authenticated:
+        user_bookings = _booked_event_ids(request.user)
+    
+    context = {
+        'events': _upcoming_events(),
+        'stats': CommunityStats.get_current_stats(),
+        'reviews': _public_reviews(),
+        'review_summary': ReviewSummary.get_current(),
+        'user_bookings': user_bookings,
+        'member_calendar_url': _member_calendar_url(request, request.user),
+    }
+    
+    return render(request, 'pages/community.html', context)
+
+async def community_async(request):
+    """Async community hub: events, stats, reviews and bookings are queried concurrently"""
+    user = await request.auser()
+    queries = [_upcoming_events, CommunityStats.get_current_stats, _public_reviews, ReviewSummary.get_current]
+    if user.is_authenticated:
+        queries.append(partial(_booked_event_ids, user))
+    
+    events, stats, reviews, review_summary, *bookings = await run_concurrently(*queries)
+    
+    context = {
+        'events': events,
+        'stats': stats,
+        'reviews': reviews,
+        'review_summary': review_summary,
+        'user_bookings': bookings[0] if bookings else [],
+        'member_calendar_url': _member_calendar_url(request, user),
+    }
+    
+    return await sync_to_async(render)(request, 'pages/community.html', context)
+
+@login_required
+def book_event_view(request):
+    """Handle event booking"""
+    if request.method != 'POST':
+        return FastJsonResponse({'success': False, 'message': 'Invalid request method'})
+    
+    try:
+        # Check if user is a community member
+        custom_user = request.user.customuser
+        if not custom_user.is_community_member:
+            return FastJsonResponse({
+                'success': False, 
+                'message': 'You must be a community member to book events'
+            })
+        
+        data = json.loads(request.body)
+        event_id = data.get('event_id')
+        
+        event = get_object_or_404(Event, id=event_id)
+        
+        # Check if event can be booked
+        if not event.can_book():
+            return FastJsonResponse({
+                'success': False,
+                'message': 'This event cannot be booked (expired, full, or cancelled)'
+            })
+        
+        # Check if user already booked this event
+        existing_booking = EventBooking.objects.filter(
+            event=event,
+            user=custom_user
+        ).first()
+        
+        if existing_booking:
+            return FastJsonResponse({
+                'success': False,
+                'message': 'You have already booked this event'
+            })
+        
+        # Create booking
+        booking = EventBooking.objects.create(
+            event=event,
+            user=custom_user,
+            status='confirmed'
+        )
+        metrics.BOOKINGS.inc()
+        
+        return FastJsonResponse({
+            'success': True,
+            'message': 'Event booked successfully!',
+            'booking_id': str(booking.id),
+            'checkin_token': checkin.checkin_token(booking),
+        })
+        
+    except CustomUser.DoesNotExist:
+        return FastJsonResponse({
+            'success': False,
+            'message': 'User profile not found. Please complete your profile.'
+        })
+    except Exception as e:
+        return FastJsonResponse({
+            'success': False,
+            'message': 'An error occurred while booking the event'
+        })
+
+@login_required
+def submit_review_view(request):
+    """Handle community review submission"""
+    if request.method != 'POST':
+        return FastJsonResponse({'success': False, 'message': 'Invalid request method'})
+    
+    try:
+        # Check if user is a community member
+        custom_user = request.user.customuser
+        if not custom_user.is_community_member:
+            return FastJsonResponse({
+                'success': False,
+                'message': 'You must be a community member to submit reviews'
+            })
+        
+        rating = int(request.POST.get('rating', 0))
+        comment = request.POST.get('comment', '').strip()
+        
+        if rating < 1 or rating > 5:
+            return FastJsonResponse({
+                'success': False,
+                'message': 'Rating must be between 1 and 5 stars'
+            })
+        
+        if not comment:
+            return FastJsonResponse({
+                'success': False,
+                'message': 'Comment is required'
+            })
+        
+        # Check if user already has a review (update if exists)
+        review, created = CommunityReview.objects.update_or_create(
+            user=custom_user,
+            defaults={
+                'rating': rating,
+                'comment': comment,
+                'is_public': True
+            }
+        )
+        
+        return FastJsonResponse({
+            'success': True,
+            'message': 'Review submitted successfully!' if created else 'Review updated successfully!'
+        })
+        
+    except CustomUser.DoesNotExist:
+        return FastJsonResponse({
+            'success': False,
+            'message': 'User profile not found'
+        })
+    except ValueError:
+        return FastJsonResponse({
+            'success': False,
+            'message': 'Invalid rating value'
+        })
+    except Exception as e:
+        return FastJsonResponse({
+            'success': False,
+            'message': 'An error occurred while submitting your review'
+        })
+
+# Utility function to clean expired events (can be called via cron job)
+def clean_expired_events():
+    """Remove expired events"""
+    expired_events = Event.objects.filter(
+        deadline__lt=timezone.now(),
+        status='upcoming'
+    )
+    count = expired_events.count()
+    expired_events.delete()
+    return count
@@ -0,0 +1,57 @@
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+from django.utils import timezone
+
+from ..models import CommunityStats, CustomUser, Event, TeamMember
+
+def index(request):
+    """Home page with latest upcoming events"""
+    # Get next 3 upcoming events
+    upcoming_events = Event.objects.filter(
+        deadline__gte=timezone.now(),
+        status='upcoming'
+    ).order_by('date_time')[:3]
+    
+    context = {
+        'upcoming_events': upcoming_events,
+    }
+    
+    return render(request, 'pages/index.html', context)
+
+def _active_team_members():
+    return list(TeamMember.objects.filter(is_active=True).order_by('order', 'name'))
+
+def _community_member_count():
+    return CustomUser.objects.filter(is_community_member=True).count()
+
+def _about_context(team_members, stats, total_members):
+    return {
+        'team_members': team_members,
+        'total_members': total_members,
+        'mentorship_count': 85,  # You can implement actual mentorship tracking
+        'projects_count': 32,    # You can implement actual project tracking
+        'events_this_year': stats.total_events,
+    }
+
+def about(request):
+    """Dynamic about page"""
+    context = _about_context(
+        _active_team_members(),
+        CommunityStats.get_current_stats(),
+        _community_member_count(),
+    )
+    
+    return render(request, 'pages/about.html', context)
+
+async def about_async(request):
+    """Async about page; its queries take well under a millisecond, so one thread hop beats one per query"""
+    return await sync_to_async(about)(request)
+
+# Error handlers
+def handler404(request, exception):
+    """Custom 404 error handler"""
+    return render(request, '404.html', status=404)
+
+def handler500(request):
+    """Custom 500 error handler"""
+    return render(request, '500.html', status=500)
@@ -0,0 +1,106 @@
+import json
+
+from django.contrib import messages
+from django.shortcuts import redirect, render
+
+from core import metrics
+from core.responses import FastJsonResponse
+
+from ..models import MembershipApplication
+from ..skills import entries
+
+def join(request):
+    """Render the membership form"""
+    if request.method == 'GET':
+        return render(request, 'pages/join.html')
+    
+    elif request.method == 'POST':
+        try:
+            # Handle JSON data from AJAX request
+            if request.content_type == 'application/json':
+                data = json.loads(request.body)
+            else:
+                # Handle regular form submission
+                data = request.POST.dict()
+            
+            # Process work experience data
+            work_experiences = []
+            experience_count = 1
+            
+            while f'job_title_{experience_count}' in data:
+                if data.get(f'job_title_{experience_count}'):
+                    work_exp = {
+                        'job_title': data.get(f'job_title_{experience_count}', ''),
+                        'company': data.get(f'company_{experience_count}', ''),
+                        'start_date': data.get(f'start_date_{experience_count}', ''),
+                        'end_date': data.get(f'end_date_{experience_count}', ''),
+                        'responsibilities': data.get(f'responsibilities_{experience_count}', ''),
+                    }
+                    work_experiences.append(work_exp)
+                experience_count += 1
+            
+            # Process skills: a list, or a form field holding a JSON list or a single skill
+            skills = data.get('skills') or []
+            if isinstance(skills, str):
+                try:
+                    skills = json.loads(skills)
+                except json.JSONDecodeError:
+                    pass
+                if not isinstance(skills, (list, str)):
+                    skills = data['skills']
+            skills = [entry for entry in entries(skills) if isinstance(entry, str)]
+            
+            # Process languages
+            languages = [entry for entry in entries(data.get('languages') or []) if isinstance(entry, str)]
+            
+            # Create membership application
+            application = MembershipApplication.objects.create(
+                first_name=data.get('first_name', ''),
+                last_name=data.get('last_name', ''),
+                email=data.get('email', ''),
+                phone=data.get('phone', ''),
+                date_of_birth=data.get('date_of_birth'),
+                gender=data.get('gender', ''),
+                id_number=data.get('id_number', ''),
+                current_address=data.get('current_address', ''),
+                region=data.get('region', ''),
+                district=data.get('district', ''),
+                education=data.get('education', ''),
+                occupation=data.get('occupation', ''),
+                work_experience=work_experiences,
+                skills=skills,
+                languages=languages,
+                why_join=data.get('why_join', ''),
+                contribution=data.get('contribution', ''),
+                expectations=data.get('expectations', ''),
+                referral=data.get('referral', ''),
+                agree_terms=data.get('agree_terms') == 'on' or data.get('agree_terms') is True,
+            )
+            metrics.APPLICATIONS.inc()
+            
+            # Return success response
+            if request.content_type == 'application/json':
+                return FastJsonResponse({
+                    'success': True,
+                    'message': 'Application submitted successfully!',
+                    'application_id': application.id
+                })
+            else:
+                messages.success(request, 'Your application has been submitted successfully!')
+                return redirect('join_success')
+                
+        except Exception as e:
+            print(f"Error processing membership application: {str(e)}")
+            
+            if request.content_type == 'application/json':
+                return FastJsonResponse({
+                    'success': False,
+                    'message': 'There was an error submitting your application. Please try again.'
+                }, status=400)
+            else:
+                messages.error(request, 'There was an error submitting your application. Please try again.')
+                return render(request, 'pages/join.html')
+
+def join_success(request):
+    """Thank you page after successful submission"""
+    return render(request, 'pages/join_success.html')
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from core import metrics
+
+from ..auth import is_site_admin
+from ..models import CommunityStats
+
+
+def _scraper_authorized(request):
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme == 'Bearer' and settings.METRICS_TOKEN:
+        return constant_time_compare(token, settings.METRICS_TOKEN)
+    return is_site_admin(request)
+
+
+def _stats_age():
+    last_updated = CommunityStats.objects.filter(pk=1).values_list('last_updated', flat=True).first()
+    return None if last_updated is None else round((timezone.now() - last_updated).total_seconds(), 3)
+
+
+@require_GET
+@never_cache
+def metrics_view(request):
+    """Prometheus scrape endpoint, summed over every gunicorn worker"""
+    if not _scraper_authorized(request):
+        response = HttpResponse('Authentication required\n', status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    gauges = [('community_stats_age_seconds', 'Seconds since CommunityStats was last recomputed', _stats_age())]
+    return HttpResponse(metrics.render(gauges), content_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,56 @@
+"""
+Warm per-process caches before a worker accepts traffic.
+
+Called from ``PagesConfig.ready()`` when ``WARMUP_ON_READY`` is set. With
+gunicorn's ``preload_app`` this runs once in the master, so the compiled
+URL resolver and templates are shared by every forked worker. Nothing here
+touches the database: connections must not be opened before the fork.
+"""
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+# Named routes without arguments that the templates reverse on every page
+WARM_URL_NAMES = ['index', 'about', 'join', 'join_success', 'community', 'dashboard', 'login']
+
+
+def _template_names():
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        directory = Path(directory)
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_url_resolver():
+    resolver = get_resolver()
+    resolver.reverse_dict  # builds the reverse lookup tables
+    for name in WARM_URL_NAMES:
+        reverse(name)
+
+
+def warm_templates():
+    for name in _template_names():
+        get_template(name)
+
+
+def warm_caches():
+    for alias in settings.CACHES:
+        caches[alias]
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+
+
+def warm_up():
+    start = time.perf_counter()
+    warm_url_resolver()
+    warm_templates()
+    warm_caches()
+    logger.info('Warmup finished in %.1f ms', (time.perf_counter() - start) * 1000)